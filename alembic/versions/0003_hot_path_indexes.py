@@ -0,0 +1,67 @@
+"""hot path indexes
+
+Composite indexes matching the filter + keyset order of the crud_* list
+queries, and (task_id|subtask_id, created_at DESC, id DESC) for activity feeds.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 15:43:45.786312
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_activities_subtask_id_created_at', 'activities', ['subtask_id', sa.literal_column('created_at DESC'), sa.literal_column('id DESC')], unique=False)
+    op.create_index('ix_activities_task_id_created_at', 'activities', ['task_id', sa.literal_column('created_at DESC'), sa.literal_column('id DESC')], unique=False)
+    op.create_index('ix_attachments_subtask_id_id', 'attachments', ['subtask_id', 'id'], unique=False)
+    op.create_index('ix_attachments_task_id_id', 'attachments', ['task_id', 'id'], unique=False)
+    op.create_index('ix_comments_task_id_id', 'comments', ['task_id', 'id'], unique=False)
+    op.create_index('ix_comments_ticket_id_id', 'comments', ['ticket_id', 'id'], unique=False)
+    op.create_index('ix_project_members_project_id_id', 'project_members', ['project_id', 'id'], unique=False)
+    op.create_index('ix_projects_created_by_id_id', 'projects', ['created_by_id', 'id'], unique=False)
+    op.create_index('ix_subtask_assignees_user_id_subtask_id', 'subtask_assignees', ['user_id', 'subtask_id'], unique=False)
+    op.create_index('ix_subtasks_parent_id', 'subtasks', ['parent_id'], unique=False)
+    op.create_index('ix_subtasks_task_id_id', 'subtasks', ['task_id', 'id'], unique=False)
+    op.create_index('ix_task_assignees_user_id_task_id', 'task_assignees', ['user_id', 'task_id'], unique=False)
+    op.create_index('ix_tasks_project_id_id', 'tasks', ['project_id', 'id'], unique=False)
+    op.create_index('ix_tasks_status_id', 'tasks', ['status', 'id'], unique=False)
+    op.create_index('ix_tickets_assigned_to_id_id', 'tickets', ['assigned_to_id', 'id'], unique=False)
+    op.create_index('ix_tickets_created_by_id_id', 'tickets', ['created_by_id', 'id'], unique=False)
+    op.create_index('ix_tickets_status_id', 'tickets', ['status', 'id'], unique=False)
+    op.create_index('ix_time_logs_subtask_id_id', 'time_logs', ['subtask_id', 'id'], unique=False)
+    op.create_index('ix_time_logs_task_id_id', 'time_logs', ['task_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_time_logs_task_id_id', table_name='time_logs')
+    op.drop_index('ix_time_logs_subtask_id_id', table_name='time_logs')
+    op.drop_index('ix_tickets_status_id', table_name='tickets')
+    op.drop_index('ix_tickets_created_by_id_id', table_name='tickets')
+    op.drop_index('ix_tickets_assigned_to_id_id', table_name='tickets')
+    op.drop_index('ix_tasks_status_id', table_name='tasks')
+    op.drop_index('ix_tasks_project_id_id', table_name='tasks')
+    op.drop_index('ix_task_assignees_user_id_task_id', table_name='task_assignees')
+    op.drop_index('ix_subtasks_task_id_id', table_name='subtasks')
+    op.drop_index('ix_subtasks_parent_id', table_name='subtasks')
+    op.drop_index('ix_subtask_assignees_user_id_subtask_id', table_name='subtask_assignees')
+    op.drop_index('ix_projects_created_by_id_id', table_name='projects')
+    op.drop_index('ix_project_members_project_id_id', table_name='project_members')
+    op.drop_index('ix_comments_ticket_id_id', table_name='comments')
+    op.drop_index('ix_comments_task_id_id', table_name='comments')
+    op.drop_index('ix_attachments_task_id_id', table_name='attachments')
+    op.drop_index('ix_attachments_subtask_id_id', table_name='attachments')
+    op.drop_index('ix_activities_task_id_created_at', table_name='activities')
+    op.drop_index('ix_activities_subtask_id_created_at', table_name='activities')
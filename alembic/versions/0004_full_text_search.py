@@ -0,0 +1,34 @@
+"""full text search
+
+FTS5 tables kept in sync by triggers on SQLite, generated tsvector columns
+with GIN indexes on PostgreSQL, for tasks, tickets and comments.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 16:02:37.118406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from app.db.full_text import create_full_text_search, drop_full_text_search
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("tasks", "tickets", "comments")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    create_full_text_search(op.get_bind(), TABLES)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    drop_full_text_search(op.get_bind(), TABLES)
@@ -0,0 +1,34 @@
+"""search subtasks and attachments
+
+Full-text indexes for subtask title/description and attachment filenames,
+used by the unified /search endpoint.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 16:21:09.530164
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from app.db.full_text import create_full_text_search, drop_full_text_search
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, Sequence[str], None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("subtasks", "attachments")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    create_full_text_search(op.get_bind(), TABLES)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    drop_full_text_search(op.get_bind(), TABLES)
@@ -0,0 +1,49 @@
+"""activity archive
+
+Compressed monthly chunks of activity entries moved out of the hot
+activities table by CRUDActivity.archive.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 15:57:51.190077
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, Sequence[str], None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('activity_archive',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('period', sa.String(length=7), nullable=False),
+    sa.Column('task_id', sa.Integer(), nullable=True),
+    sa.Column('subtask_id', sa.Integer(), nullable=True),
+    sa.Column('row_count', sa.Integer(), nullable=False),
+    sa.Column('first_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('last_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('payload', sa.LargeBinary(), nullable=False),
+    sa.ForeignKeyConstraint(['subtask_id'], ['subtasks.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_activity_archive_id'), 'activity_archive', ['id'], unique=False)
+    op.create_index('ix_activity_archive_subtask_id_period', 'activity_archive', ['subtask_id', 'period'], unique=False)
+    op.create_index('ix_activity_archive_task_id_period', 'activity_archive', ['task_id', 'period'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_activity_archive_task_id_period', table_name='activity_archive')
+    op.drop_index('ix_activity_archive_subtask_id_period', table_name='activity_archive')
+    op.drop_index(op.f('ix_activity_archive_id'), table_name='activity_archive')
+    op.drop_table('activity_archive')
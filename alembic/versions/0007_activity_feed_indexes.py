@@ -0,0 +1,30 @@
+"""activity feed indexes
+
+(user_id, created_at DESC, id DESC) for the per-user activity feed.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 16:00:34.764720
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, Sequence[str], None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_activities_user_id_created_at', 'activities', ['user_id', sa.literal_column('created_at DESC'), sa.literal_column('id DESC')], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_activities_user_id_created_at', table_name='activities')
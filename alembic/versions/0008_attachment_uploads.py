@@ -0,0 +1,47 @@
+"""attachment uploads
+
+Size, SHA-256 digest and MIME type of uploaded attachment files; file_url
+becomes optional since uploaded files live in the attachment storage.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 16:27:05.962423
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.full_text import create_full_text_search
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, Sequence[str], None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('attachments', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('size', sa.BigInteger(), nullable=True))
+        batch_op.add_column(sa.Column('sha256', sa.String(length=64), nullable=True))
+        batch_op.add_column(sa.Column('content_type', sa.String(length=255), nullable=True))
+        batch_op.alter_column('file_url', existing_type=sa.Text(), nullable=True)
+        batch_op.create_index('ix_attachments_sha256', ['sha256'], unique=False)
+    # The SQLite batch rebuild drops the table's search triggers
+    create_full_text_search(op.get_bind(), ['attachments'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("UPDATE attachments SET file_url = '' WHERE file_url IS NULL")
+    with op.batch_alter_table('attachments', schema=None) as batch_op:
+        batch_op.drop_index('ix_attachments_sha256')
+        batch_op.alter_column('file_url', existing_type=sa.Text(), nullable=False)
+        batch_op.drop_column('content_type')
+        batch_op.drop_column('sha256')
+        batch_op.drop_column('size')
+    create_full_text_search(op.get_bind(), ['attachments'])
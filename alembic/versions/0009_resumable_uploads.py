@@ -0,0 +1,62 @@
+"""resumable uploads
+
+Uploads in progress and the byte ranges received for each; a completed
+upload becomes an attachment.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 16:34:10.488504
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, Sequence[str], None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('uploads',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('filename', sa.String(length=255), nullable=False),
+    sa.Column('content_type', sa.String(length=255), nullable=False),
+    sa.Column('size', sa.BigInteger(), nullable=False),
+    sa.Column('sha256', sa.String(length=64), nullable=True),
+    sa.Column('task_id', sa.Integer(), nullable=True),
+    sa.Column('subtask_id', sa.Integer(), nullable=True),
+    sa.Column('created_by_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['created_by_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['subtask_id'], ['subtasks.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_uploads_id'), 'uploads', ['id'], unique=False)
+    op.create_index('ix_uploads_expires_at', 'uploads', ['expires_at'], unique=False)
+
+    op.create_table('upload_chunks',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('upload_id', sa.Integer(), nullable=False),
+    sa.Column('offset', sa.BigInteger(), nullable=False),
+    sa.Column('length', sa.BigInteger(), nullable=False),
+    sa.ForeignKeyConstraint(['upload_id'], ['uploads.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_upload_chunks_upload_id', 'upload_chunks', ['upload_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_upload_chunks_upload_id', table_name='upload_chunks')
+    op.drop_table('upload_chunks')
+    op.drop_index('ix_uploads_expires_at', table_name='uploads')
+    op.drop_index(op.f('ix_uploads_id'), table_name='uploads')
+    op.drop_table('uploads')
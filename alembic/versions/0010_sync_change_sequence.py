@@ -0,0 +1,105 @@
+"""sync change sequence
+
+Change sequence numbers for GET /sync: a change_seq column on the synced
+tables, tombstones for deleted rows and the counter handing both their
+numbers out. Existing rows are numbered table by table in id order.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18 16:56:18.506596
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.full_text import create_full_text_search
+
+SYNCED_TABLES = ['tasks', 'subtasks', 'tickets', 'comments', 'projects']
+SEARCHED_TABLES = ['tasks', 'subtasks', 'tickets', 'comments']
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0010'
+down_revision: Union[str, Sequence[str], None] = '0009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('change_counter',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('value', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('tombstones',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('entity', sa.String(length=32), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=False),
+    sa.Column('change_seq', sa.BigInteger(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('tombstones', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_tombstones_change_seq'), ['change_seq'], unique=False)
+
+    with op.batch_alter_table('comments', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('change_seq', sa.BigInteger(), nullable=True))
+        batch_op.create_index('ix_comments_change_seq', ['change_seq'], unique=False)
+
+    with op.batch_alter_table('projects', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('change_seq', sa.BigInteger(), nullable=True))
+        batch_op.create_index('ix_projects_change_seq', ['change_seq'], unique=False)
+
+    with op.batch_alter_table('subtasks', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('change_seq', sa.BigInteger(), nullable=True))
+        batch_op.create_index('ix_subtasks_change_seq', ['change_seq'], unique=False)
+
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('change_seq', sa.BigInteger(), nullable=True))
+        batch_op.create_index('ix_tasks_change_seq', ['change_seq'], unique=False)
+
+    with op.batch_alter_table('tickets', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('change_seq', sa.BigInteger(), nullable=True))
+        batch_op.create_index('ix_tickets_change_seq', ['change_seq'], unique=False)
+    # The SQLite batch rebuild drops the tables' search triggers
+    create_full_text_search(op.get_bind(), SEARCHED_TABLES)
+
+    bind = op.get_bind()
+    last = 0
+    for table in SYNCED_TABLES:
+        bind.execute(sa.text(f"UPDATE {table} SET change_seq = id + :last"), {"last": last})
+        last += bind.execute(sa.text(f"SELECT COALESCE(MAX(id), 0) FROM {table}")).scalar()
+    bind.execute(sa.text("INSERT INTO change_counter (id, value) VALUES (1, :last)"), {"last": last})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('tickets', schema=None) as batch_op:
+        batch_op.drop_index('ix_tickets_change_seq')
+        batch_op.drop_column('change_seq')
+
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.drop_index('ix_tasks_change_seq')
+        batch_op.drop_column('change_seq')
+
+    with op.batch_alter_table('subtasks', schema=None) as batch_op:
+        batch_op.drop_index('ix_subtasks_change_seq')
+        batch_op.drop_column('change_seq')
+
+    with op.batch_alter_table('projects', schema=None) as batch_op:
+        batch_op.drop_index('ix_projects_change_seq')
+        batch_op.drop_column('change_seq')
+
+    with op.batch_alter_table('comments', schema=None) as batch_op:
+        batch_op.drop_index('ix_comments_change_seq')
+        batch_op.drop_column('change_seq')
+    create_full_text_search(op.get_bind(), SEARCHED_TABLES)
+
+    with op.batch_alter_table('tombstones', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_tombstones_change_seq'))
+
+    op.drop_table('tombstones')
+    op.drop_table('change_counter')
@@ -0,0 +1,36 @@
+"""deleted users
+
+Token versions of deleted users, so every process rejects their tokens
+on its next revocation list reload.
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-18 17:41:05.118324
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0011'
+down_revision: Union[str, Sequence[str], None] = '0010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('deleted_users',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('token_version', sa.Integer(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('deleted_users')
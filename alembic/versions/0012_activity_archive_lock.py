@@ -0,0 +1,37 @@
+"""activity archive lock
+
+One-row table every activity archive batch locks first, so archivers
+running in several workers take turns instead of archiving the same
+entries twice.
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-18 18:22:47.630915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0012'
+down_revision: Union[str, Sequence[str], None] = '0011'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('activity_archive_lock',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('locked_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.execute("INSERT INTO activity_archive_lock (id) VALUES (1)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('activity_archive_lock')
@@ -1,7 +1,7 @@
 from fastapi import APIRouter
 
 # Import routers from endpoints
-from app.api.api_v1.endpoints import auth, users, tickets, tasks, comments, projects, project_members, subtasks, attachments, time_logs, activities
+from app.api.api_v1.endpoints import auth, users, tickets, tasks, comments, projects, project_members, subtasks, attachments, uploads, time_logs, activities, search, export, imports, batch, changes, sync
 
 api_router = APIRouter()
 
@@ -17,5 +17,12 @@ api_router.include_router(project_members.router, prefix="/project_members", tag
 api_router.include_router(subtasks.router, prefix="/subtasks", tags=["subtasks"])
 
 api_router.include_router(attachments.router, prefix="/attachments", tags=["attachments"])
+api_router.include_router(uploads.router, prefix="/attachments/uploads", tags=["attachments"])
 api_router.include_router(time_logs.router, prefix="/time_logs", tags=["time_logs"])
-api_router.include_router(activities.router, prefix="/activities", tags=["activities"])
\ No newline at end of file
+api_router.include_router(activities.router, prefix="/activities", tags=["activities"])
+api_router.include_router(search.router, prefix="/search", tags=["search"])
+api_router.include_router(export.router, prefix="/export", tags=["export"])
+api_router.include_router(imports.router, prefix="/import", tags=["import"])
+api_router.include_router(batch.router, prefix="/batch", tags=["batch"])
+api_router.include_router(changes.router, prefix="/changes", tags=["changes"])
+api_router.include_router(sync.router, prefix="/sync", tags=["sync"])
\ No newline at end of file
@@ -1,20 +1,144 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.orm import Session
-from app.api.deps import get_db, get_current_active_user_dep
-from app.crud.crud_attachment import attachment
+from app.api.deps import get_db, get_active_token_user_dep
+from app.api.pagination import page_response
+from app.crud.crud_activity import activity
+from app.models.activity import ActivityType
 from app.schemas.activity import ActivityRead
-from app.models.user import User
-from app.models.activity import Activity
+from app.schemas.token import TokenUser
 
 router = APIRouter()
 
 
+def feed_filters(
+    action_type: Optional[List[ActivityType]] = Query(None),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Query parameters shared by the activity feeds, newest entry first."""
+    return {
+        "action_types": action_type,
+        "since": since,
+        "until": until,
+        "skip": skip,
+        "limit": limit,
+        "cursor": cursor,
+    }
+
+
+def archive_filters(
+    action_type: Optional[List[ActivityType]] = Query(None),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    """Query parameters shared by the archive reads, which aren't paged."""
+    return {"action_types": action_type, "since": since, "until": until}
+
+
 @router.get("/task/{task_id}", response_model=List[ActivityRead])
 async def get_task_activities(
     *,
+    response: Response,
     db: Session = Depends(get_db),
     task_id: int,
-    current_user: User = get_current_active_user_dep,
+    filters: Dict[str, Any] = Depends(feed_filters),
+    current_user: TokenUser = get_active_token_user_dep,
 ):
-    return db.query(Activity).filter(Activity.task_id == task_id).order_by(Activity.created_at.desc()).all()
\ No newline at end of file
+    page = await activity.aget_multi_by_task(db, task_id=task_id, schema=ActivityRead, **filters)
+    return page_response(response, page, ActivityRead)
+
+
+@router.get("/task/{task_id}/archive", response_model=List[ActivityRead])
+async def get_task_archived_activities(
+    *,
+    db: Session = Depends(get_db),
+    task_id: int,
+    filters: Dict[str, Any] = Depends(archive_filters),
+    current_user: TokenUser = get_active_token_user_dep,
+):
+    """Entries moved to the archive, all older than the task's live feed."""
+    return await activity.aget_archived(db, task_id=task_id, **filters)
+
+
+@router.get("/subtask/{subtask_id}", response_model=List[ActivityRead])
+async def get_subtask_activities(
+    *,
+    response: Response,
+    db: Session = Depends(get_db),
+    subtask_id: int,
+    filters: Dict[str, Any] = Depends(feed_filters),
+    current_user: TokenUser = get_active_token_user_dep,
+):
+    page = await activity.aget_multi_by_subtask(db, subtask_id=subtask_id, schema=ActivityRead, **filters)
+    return page_response(response, page, ActivityRead)
+
+
+@router.get("/subtask/{subtask_id}/archive", response_model=List[ActivityRead])
+async def get_subtask_archived_activities(
+    *,
+    db: Session = Depends(get_db),
+    subtask_id: int,
+    filters: Dict[str, Any] = Depends(archive_filters),
+    current_user: TokenUser = get_active_token_user_dep,
+):
+    """Entries moved to the archive, all older than the subtask's live feed."""
+    return await activity.aget_archived(db, subtask_id=subtask_id, **filters)
+
+
+@router.get("/project/{project_id}", response_model=List[ActivityRead])
+async def get_project_activities(
+    *,
+    response: Response,
+    db: Session = Depends(get_db),
+    project_id: int,
+    filters: Dict[str, Any] = Depends(feed_filters),
+    current_user: TokenUser = get_active_token_user_dep,
+):
+    page = await activity.aget_multi_by_project(db, project_id=project_id, schema=ActivityRead, **filters)
+    return page_response(response, page, ActivityRead)
+
+
+@router.get("/project/{project_id}/archive", response_model=List[ActivityRead])
+async def get_project_archived_activities(
+    *,
+    db: Session = Depends(get_db),
+    project_id: int,
+    filters: Dict[str, Any] = Depends(archive_filters),
+    current_user: TokenUser = get_active_token_user_dep,
+):
+    """Entries moved to the archive, all older than the project's live feed."""
+    return await activity.aget_archived(db, project_id=project_id, **filters)
+
+
+@router.get("/user/{user_id}", response_model=List[ActivityRead])
+async def get_user_activities(
+    *,
+    response: Response,
+    db: Session = Depends(get_db),
+    user_id: int,
+    filters: Dict[str, Any] = Depends(feed_filters),
+    current_user: TokenUser = get_active_token_user_dep,
+):
+    page = await activity.aget_multi_by_user(db, user_id=user_id, schema=ActivityRead, **filters)
+    return page_response(response, page, ActivityRead)
+
+
+@router.get("/user/{user_id}/archive", response_model=List[ActivityRead])
+async def get_user_archived_activities(
+    *,
+    db: Session = Depends(get_db),
+    user_id: int,
+    filters: Dict[str, Any] = Depends(archive_filters),
+    current_user: TokenUser = get_active_token_user_dep,
+):
+    """Entries moved to the archive, all older than the user's live feed.
+
+    They are spread over the whole archive: pass ``since``/``until`` to
+    read only the months of interest.
+    """
+    return await activity.aget_archived(db, user_id=user_id, **filters)
@@ -1,36 +1,189 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends
+import os
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from app.api.deps import get_db, get_current_active_user_dep
+from app.api.conditional import if_none_match
+from app.api.downloads import RangeFileResponse
+from app.api.deps import get_db, get_active_token_user_dep
+from app.api.pagination import page_response
+from app.api.uploads import MultipartFile, check_content_length, check_targets, clean_filename, content_type_of
+from app.core.errors import NotFoundError
+from app.core.storage import storage
+from app.crud.base import run_in_session
 from app.crud.crud_attachment import attachment
-from app.schemas.attachment import AttachmentRead, AttachmentCreate
-from app.models.user import User
+from app.schemas.attachment import AttachmentBase, AttachmentRead, AttachmentCreate
+from app.schemas.token import TokenUser
 
 router = APIRouter()
 
+MULTIPART_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "properties": {"file": {"type": "string", "format": "binary"}},
+                    "required": ["file"],
+                }
+            }
+        },
+    }
+}
+RAW_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {"*/*": {"schema": {"type": "string", "format": "binary"}}},
+    }
+}
+
+# A stored attachment's bytes never change, so clients may keep them for good
+CONTENT_CACHE_CONTROL = "private, max-age=31536000, immutable"
+# The content type is whatever the uploader declared: only types that can't
+# run script are ever displayed inline, anything else is downloaded
+INLINE_CONTENT_TYPES = frozenset({"image/png", "image/jpeg", "image/gif", "image/webp", "application/pdf"})
+# Sent with every file, so that neither sniffing nor an HTML or SVG file
+# opened directly can run script on the API's origin
+CONTENT_SECURITY_HEADERS = {"X-Content-Type-Options": "nosniff", "Content-Security-Policy": "sandbox"}
+
+
+def can_inline(content_type: str) -> bool:
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return media_type in INLINE_CONTENT_TYPES or media_type.startswith("video/")
+
+
 @router.post("/", response_model=AttachmentRead)
-def create_attachment(
+async def create_attachment(
     *,
     db: Session = Depends(get_db),
     attachment_in: AttachmentCreate,
-    current_user: User = get_current_active_user_dep,
+    current_user: TokenUser = get_active_token_user_dep,
+) -> Any:
+    return await attachment.acreate_with_owner(db, obj_in=attachment_in, uploaded_by_id=current_user.id)
+
+@router.post("/upload", response_model=AttachmentRead, openapi_extra=MULTIPART_BODY)
+async def upload_attachment(
+    *,
+    request: Request,
+    db: Session = Depends(get_db),
+    task_id: Optional[int] = None,
+    subtask_id: Optional[int] = None,
+    current_user: TokenUser = get_active_token_user_dep,
+) -> Any:
+    """Upload the file of a multipart/form-data body.
+
+    The file is written to the attachment storage as it arrives, never held
+    in memory whole, and stored once per SHA-256 digest.
+    """
+    check_content_length(request)
+    upload = MultipartFile(request)
+    await check_targets(db, task_id, subtask_id)
+    # No pool connection is held while the body streams in
+    await run_in_session(db, Session.rollback)
+    stored = await storage.save(upload.chunks())
+    filename = clean_filename(upload.filename)
+    attachment_in = AttachmentBase(filename=filename, task_id=task_id, subtask_id=subtask_id)
+    return await attachment.acreate_with_owner(
+        db, obj_in=attachment_in, uploaded_by_id=current_user.id,
+        stored=stored, content_type=content_type_of(upload.content_type, filename),
+    )
+
+@router.post("/upload/raw", response_model=AttachmentRead, openapi_extra=RAW_BODY)
+async def upload_attachment_raw(
+    *,
+    request: Request,
+    db: Session = Depends(get_db),
+    filename: str,
+    task_id: Optional[int] = None,
+    subtask_id: Optional[int] = None,
+    current_user: TokenUser = get_active_token_user_dep,
 ) -> Any:
-    return attachment.create_with_owner(db, obj_in=attachment_in, uploaded_by_id=current_user.id)
+    """Upload the request body as a file; its Content-Type is recorded as the file's."""
+    check_content_length(request)
+    filename = clean_filename(filename)
+    await check_targets(db, task_id, subtask_id)
+    # No pool connection is held while the body streams in
+    await run_in_session(db, Session.rollback)
+    stored = await storage.save(request.stream())
+    attachment_in = AttachmentBase(filename=filename, task_id=task_id, subtask_id=subtask_id)
+    return await attachment.acreate_with_owner(
+        db, obj_in=attachment_in, uploaded_by_id=current_user.id,
+        stored=stored, content_type=content_type_of(request.headers.get("content-type"), filename),
+    )
 
 @router.get("/task/{task_id}", response_model=List[AttachmentRead])
-def read_attachments_by_task(
+async def read_attachments_by_task(
     *,
+    response: Response,
     db: Session = Depends(get_db),
     task_id: int,
-    current_user: User = get_current_active_user_dep,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    current_user: TokenUser = get_active_token_user_dep,
 ) -> Any:
-    return attachment.get_multi_by_task(db, task_id=task_id)
+    page = await attachment.aget_multi_by_task(db, task_id=task_id, skip=skip, limit=limit, cursor=cursor, schema=AttachmentRead)
+    return page_response(response, page, AttachmentRead)
 
 @router.get("/subtask/{subtask_id}", response_model=List[AttachmentRead])
-def read_attachments_by_subtask(
+async def read_attachments_by_subtask(
     *,
+    response: Response,
     db: Session = Depends(get_db),
     subtask_id: int,
-    current_user: User = get_current_active_user_dep,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    current_user: TokenUser = get_active_token_user_dep,
+) -> Any:
+    page = await attachment.aget_multi_by_subtask(db, subtask_id=subtask_id, skip=skip, limit=limit, cursor=cursor, schema=AttachmentRead)
+    return page_response(response, page, AttachmentRead)
+
+@router.get("/{attachment_id}/content", response_class=RangeFileResponse)
+@router.head("/{attachment_id}/content", include_in_schema=False)
+async def download_attachment(
+    *,
+    request: Request,
+    db: Session = Depends(get_db),
+    attachment_id: int,
+    inline: bool = False,
+    current_user: TokenUser = get_active_token_user_dep,
 ) -> Any:
-    return attachment.get_multi_by_subtask(db, subtask_id=subtask_id)
\ No newline at end of file
+    """Download an uploaded attachment's file.
+
+    Supports ``Range`` (including multiple ranges) and ``If-Range`` for
+    resumable downloads and seeking. The ``ETag`` is the file's SHA-256, so
+    ``If-None-Match`` revalidation answers ``304`` without touching the
+    file. ``inline=true`` lets a browser display images, videos and PDFs
+    instead of saving them; other types are always sent as downloads.
+    """
+    attachment_obj = await attachment.aget(db, id=attachment_id)
+    if not attachment_obj:
+        raise NotFoundError(detail="Attachment not found")
+    if not attachment_obj.sha256:
+        raise NotFoundError(detail="Attachment has no uploaded file")
+
+    headers = {
+        "ETag": f'"{attachment_obj.sha256}"',
+        "Cache-Control": CONTENT_CACHE_CONTROL,
+        **CONTENT_SECURITY_HEADERS,
+    }
+    if if_none_match(request, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    path = storage.path(attachment_obj.sha256)
+    try:
+        stat_result = await run_in_threadpool(os.stat, path)
+    except FileNotFoundError:
+        raise NotFoundError(detail="Attachment file is missing")
+    media_type = attachment_obj.content_type or "application/octet-stream"
+    # Read in chunks off the event loop, or handed to the server as a path
+    # where it supports the ASGI pathsend extension
+    return RangeFileResponse(
+        path,
+        headers=headers,
+        media_type=media_type,
+        filename=attachment_obj.filename,
+        stat_result=stat_result,
+        content_disposition_type="inline" if inline and can_inline(media_type) else "attachment",
+    )
@@ -7,7 +7,7 @@ from sqlalchemy.orm import Session
 
 from app.api.deps import get_db
 from app.core.config import settings
-from app.core.security import create_access_token, verify_password
+from app.core.security import create_access_token
 from app.core.errors import AuthenticationError, BadRequestError
 from app.crud.crud_user import user
 
@@ -23,21 +23,25 @@ async def login_access_token(
 ) -> Any:
     """OAuth2 compatible token login, get an access token for future requests."""
     # Try to authenticate with email
-    user_obj = user.authenticate(db, email=form_data.username, password=form_data.password)
+    user_obj = await user.aauthenticate(db, email=form_data.username, password=form_data.password)
     # If not found, try with username
     if not user_obj:
-        user_obj = user.get_by_username(db, username=form_data.username)
-        if user_obj and verify_password(form_data.password, user_obj.hashed_password):
-            pass
-        else:
-            raise AuthenticationError(detail="Incorrect email/username or password")
-    elif not user.is_active(user_obj):
+        user_obj = await user.aauthenticate(db, username=form_data.username, password=form_data.password)
+    if not user_obj:
+        raise AuthenticationError(detail="Incorrect email/username or password")
+    if not user.is_active(user_obj):
         raise AuthenticationError(detail="Inactive user")
     
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     return {
         "access_token": create_access_token(
-            user_obj.id, expires_delta=access_token_expires
+            user_obj.id,
+            expires_delta=access_token_expires,
+            claims={
+                "is_active": user_obj.is_active,
+                "is_superuser": user_obj.is_superuser,
+                "ver": user_obj.token_version,
+            },
         ),
         "token_type": "bearer",
     }
@@ -47,14 +51,14 @@ async def login_access_token(
 async def register_user(*, db: Session = Depends(get_db), user_in: UserCreate) -> Any:
     """Register a new user."""
     # Check if user with this email exists
-    user_by_email = user.get_by_email(db, email=user_in.email)
+    user_by_email = await user.aget_by_email(db, email=user_in.email)
     if user_by_email:
         raise BadRequestError(detail="Email already registered")
     
     # Check if user with this username exists
-    user_by_username = user.get_by_username(db, username=user_in.username)
+    user_by_username = await user.aget_by_username(db, username=user_in.username)
     if user_by_username:
         raise BadRequestError(detail="Username already taken")
     
     # Create new user
-    return user.create(db, obj_in=user_in)
\ No newline at end of file
+    return await user.acreate(db, obj_in=user_in)
\ No newline at end of file
@@ -0,0 +1,29 @@
+from typing import Any
+
+from fastapi import APIRouter
+from fastapi.concurrency import run_in_threadpool
+
+from app.api.deps import get_active_token_user_dep
+from app.crud.batch import run_batch
+from app.schemas.batch import BatchRequest, BatchResult
+from app.schemas.token import TokenUser
+
+router = APIRouter()
+
+
+@router.post("/", response_model=BatchResult)
+async def run_batch_operations(
+    *,
+    batch_in: BatchRequest,
+    current_user: TokenUser = get_active_token_user_dep,
+) -> Any:
+    """Create, update or complete tasks, subtasks, tickets and comments in one transaction.
+
+    Operations run in order, each with the checks of its single-item
+    endpoint, and every one gets a result with the status code that endpoint
+    would have returned. In ``atomic`` mode (the default) a failure rolls the
+    whole batch back; in ``best_effort`` mode only the failed operations are
+    undone.
+    """
+    # The batch runs in its own transaction on the sync engine, in either mode
+    return await run_in_threadpool(run_batch, batch_in, current_user)
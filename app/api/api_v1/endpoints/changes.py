@@ -0,0 +1,119 @@
+from typing import AsyncIterator, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect, status
+from fastapi.requests import HTTPConnection
+from fastapi.responses import StreamingResponse
+from app.core.broker import OVERFLOW, broker
+from app.core.config import settings
+from app.core.errors import AuthenticationError, BadRequestError
+from app.core.security import get_active_token_user, get_token_user
+from app.db.session import SessionLocal
+from app.schemas.token import TokenUser
+
+router = APIRouter()
+
+MAX_TOPICS = 100
+PING = b'{"type":"ping"}'
+
+
+def stream_topics(
+    project_id: Optional[List[int]] = Query(None),
+    task_id: Optional[List[int]] = Query(None),
+    ticket_id: Optional[List[int]] = Query(None),
+) -> List[str]:
+    """The topics a stream subscribes to, from repeatable query parameters."""
+    topics = [f"project:{id_}" for id_ in project_id or []]
+    topics += [f"task:{id_}" for id_ in task_id or []]
+    topics += [f"ticket:{id_}" for id_ in ticket_id or []]
+    if not topics:
+        raise BadRequestError(detail="Subscribe to at least one project_id, task_id or ticket_id")
+    if len(topics) > MAX_TOPICS:
+        raise BadRequestError(detail=f"At most {MAX_TOPICS} subscriptions per stream")
+    return topics
+
+
+async def stream_user(connection: HTTPConnection, access_token: Optional[str] = None) -> TokenUser:
+    """The caller, from the Authorization header or ``?access_token=``, as
+    browsers' EventSource and WebSocket can't send headers."""
+    token = access_token
+    if token is None:
+        scheme, _, value = connection.headers.get("authorization", "").partition(" ")
+        if scheme.lower() == "bearer":
+            token = value
+    if not token:
+        raise AuthenticationError()
+    # Its own short session: the request's would stay open, holding a pool
+    # connection, for as long as the stream runs
+    db = SessionLocal()
+    try:
+        token_user = await get_token_user(token, db)
+    finally:
+        db.close()
+    return await get_active_token_user(token_user)
+
+
+@router.get("/stream", response_class=StreamingResponse)
+async def stream_changes(
+    *,
+    topics: List[str] = Depends(stream_topics),
+    current_user: TokenUser = Depends(stream_user),
+) -> StreamingResponse:
+    """Server-Sent Events stream of changes to the given projects, tasks and tickets.
+
+    Each event's data is a change as JSON. An idle stream gets a comment
+    line every CHANGE_STREAM_HEARTBEAT_SECONDS. A client that falls too far
+    behind gets an ``overflow`` event and is disconnected: reload, then
+    subscribe again.
+    """
+    async def events() -> AsyncIterator[bytes]:
+        subscription = broker.subscribe(topics)
+        try:
+            # Sends the headers now, so the client knows it is subscribed
+            yield b": subscribed\n\n"
+            while True:
+                message = await subscription.get(settings.CHANGE_STREAM_HEARTBEAT_SECONDS)
+                if message is None:
+                    yield b": ping\n\n"
+                    continue
+                yield b"data: " + message + b"\n\n"
+                if message == OVERFLOW:
+                    return
+        finally:
+            subscription.close()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/ws")
+async def changes_websocket(
+    websocket: WebSocket,
+    project_id: Optional[List[int]] = Query(None),
+    task_id: Optional[List[int]] = Query(None),
+    ticket_id: Optional[List[int]] = Query(None),
+    access_token: Optional[str] = None,
+) -> None:
+    """WebSocket counterpart of ``/changes/stream``: one JSON text message
+    per change, ``{"type": "ping"}`` when idle, and ``{"type": "overflow"}``
+    before closing with 1013 when the client falls behind."""
+    try:
+        await stream_user(websocket, access_token)
+        topics = stream_topics(project_id, task_id, ticket_id)
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    await websocket.accept()
+    subscription = broker.subscribe(topics)
+    try:
+        while True:
+            message = await subscription.get(settings.CHANGE_STREAM_HEARTBEAT_SECONDS)
+            await websocket.send_text((message or PING).decode())
+            if message == OVERFLOW:
+                await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+                return
+    except WebSocketDisconnect:
+        pass
+    finally:
+        subscription.close()
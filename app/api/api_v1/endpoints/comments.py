@@ -1,13 +1,14 @@
-from typing import Any, List
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_current_active_user_dep
+from app.api.deps import get_db, get_active_token_user_dep
+from app.api.pagination import page_response
 from app.core.errors import NotFoundError, ForbiddenError
 from app.crud.crud_comment import comment
-from app.models.user import User
-from app.schemas.comment import Comment as CommentSchema, CommentCreate, CommentUpdate
+from app.schemas.token import TokenUser
+from app.schemas.comment import Comment as CommentSchema, CommentCreate, CommentSearchResult, CommentUpdate
 
 router = APIRouter()
 
@@ -17,36 +18,58 @@ async def create_comment(
     *,
     db: Session = Depends(get_db),
     comment_in: CommentCreate,
-    current_user: User = get_current_active_user_dep,
+    current_user: TokenUser = get_active_token_user_dep,
 ) -> Any:
     """Create new comment."""
-    return comment.create_with_owner(db, obj_in=comment_in, created_by_id=current_user.id)
+    return await comment.acreate_with_owner(db, obj_in=comment_in, created_by_id=current_user.id)
 
 
 @router.get("/ticket/{ticket_id}", response_model=List[CommentSchema])
 async def read_comments_by_ticket(
     *,
+    response: Response,
     db: Session = Depends(get_db),
     ticket_id: int,
     skip: int = 0,
     limit: int = 100,
-    current_user: User = get_current_active_user_dep,
+    cursor: Optional[str] = None,
+    current_user: TokenUser = get_active_token_user_dep,
 ) -> Any:
     """Get comments for a ticket."""
-    return comment.get_multi_by_ticket(db, ticket_id=ticket_id, skip=skip, limit=limit)
+    page = await comment.aget_multi_by_ticket(db, ticket_id=ticket_id, skip=skip, limit=limit, cursor=cursor, schema=CommentSchema)
+    return page_response(response, page, CommentSchema)
 
 
 @router.get("/task/{task_id}", response_model=List[CommentSchema])
 async def read_comments_by_task(
     *,
+    response: Response,
     db: Session = Depends(get_db),
     task_id: int,
     skip: int = 0,
     limit: int = 100,
-    current_user: User = get_current_active_user_dep,
+    cursor: Optional[str] = None,
+    current_user: TokenUser = get_active_token_user_dep,
 ) -> Any:
     """Get comments for a task."""
-    return comment.get_multi_by_task(db, task_id=task_id, skip=skip, limit=limit)
+    page = await comment.aget_multi_by_task(db, task_id=task_id, skip=skip, limit=limit, cursor=cursor, schema=CommentSchema)
+    return page_response(response, page, CommentSchema)
+
+
+@router.get("/search", response_model=List[CommentSearchResult])
+async def search_comments(
+    *,
+    response: Response,
+    db: Session = Depends(get_db),
+    query: str = Query(..., min_length=3),
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    current_user: TokenUser = get_active_token_user_dep,
+) -> Any:
+    """Search comments by content, best match first."""
+    page = await comment.asearch_comments(db, query=query, skip=skip, limit=limit, cursor=cursor)
+    return page_response(response, page, CommentSearchResult)
 
 
 @router.put("/{comment_id}", response_model=CommentSchema)
@@ -55,17 +78,17 @@ async def update_comment(
     db: Session = Depends(get_db),
     comment_id: int,
     comment_in: CommentUpdate,
-    current_user: User = get_current_active_user_dep,
+    current_user: TokenUser = get_active_token_user_dep,
 ) -> Any:
     """Update a comment."""
-    comment_obj = comment.get(db, id=comment_id)
+    comment_obj = await comment.aget(db, id=comment_id)
     if not comment_obj:
         raise NotFoundError(detail="Comment not found")
 
     if not (comment_obj.user_id == current_user.id or current_user.is_superuser):
         raise ForbiddenError(detail="Not enough permissions")
 
-    return comment.update(db, db_obj=comment_obj, obj_in=comment_in)
+    return await comment.aupdate(db, db_obj=comment_obj, obj_in=comment_in)
 
 
 @router.delete("/{comment_id}", response_model=CommentSchema)
@@ -73,14 +96,14 @@ async def delete_comment(
     *,
     db: Session = Depends(get_db),
     comment_id: int,
-    current_user: User = get_current_active_user_dep,
+    current_user: TokenUser = get_active_token_user_dep,
 ) -> Any:
     """Delete a comment."""
-    comment_obj = comment.get(db, id=comment_id)
+    comment_obj = await comment.aget(db, id=comment_id)
     if not comment_obj:
         raise NotFoundError(detail="Comment not found")
 
     if not (comment_obj.user_id == current_user.id or current_user.is_superuser):
         raise ForbiddenError(detail="Not enough permissions")
 
-    return comment.remove(db, id=comment_id)
\ No newline at end of file
+    return await comment.aremove(db, id=comment_id)
\ No newline at end of file
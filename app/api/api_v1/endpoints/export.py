@@ -0,0 +1,97 @@
+import csv
+import enum
+import io
+import json
+from datetime import datetime
+from itertools import chain
+from typing import Any, Dict, Iterator, List, Optional
+
+import orjson
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+
+from app.api.deps import get_active_token_user_dep
+from app.crud.export import archived_batches, export_batches, export_fields, export_query
+from app.db.session import SessionLocal
+from app.schemas.export import ExportEntity, ExportFormat
+from app.schemas.token import TokenUser
+
+router = APIRouter()
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def _ndjson(batches: Iterator[List[Dict[str, Any]]]) -> Iterator[bytes]:
+    for rows in batches:
+        yield b"".join(orjson.dumps(row) + b"\n" for row in rows)
+
+
+def _csv(fields: List[str], batches: Iterator[List[Dict[str, Any]]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    for rows in batches:
+        writer.writerows([_csv_value(row[field]) for field in fields] for row in rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+@router.get("/{entity}")
+def export(
+    entity: ExportEntity,
+    format: ExportFormat = ExportFormat.NDJSON,
+    project_id: Optional[int] = None,
+    status: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    current_user: TokenUser = get_active_token_user_dep,
+) -> StreamingResponse:
+    """Stream every matching row as NDJSON (one object per line) or CSV.
+
+    Filters: ``project_id`` (not for tickets), ``status`` (tasks and tickets)
+    and ``since <= created_at < until``. An activities export starts with the
+    archived entries, which are older than the live ones.
+    """
+    # The request's session is closed before the body is streamed, so the
+    # export reads through its own
+    db = SessionLocal()
+    try:
+        query = export_query(db, entity, project_id=project_id, status=status, since=since, until=until)
+    except Exception:
+        db.close()
+        raise
+
+    def body() -> Iterator[bytes]:
+        try:
+            batches = chain(
+                archived_batches(db, entity, project_id=project_id, since=since, until=until),
+                export_batches(db, entity, query),
+            )
+            if format == ExportFormat.CSV:
+                yield from _csv(export_fields(entity), batches)
+            else:
+                yield from _ndjson(batches)
+        finally:
+            db.close()
+
+    return StreamingResponse(
+        body(),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{entity.value}.{format.value}"'},
+    )
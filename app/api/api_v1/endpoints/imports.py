@@ -0,0 +1,49 @@
+from typing import Any, List
+
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db, get_active_token_user_dep
+from app.crud.base import run_in_session
+from app.crud.bulk_import import BulkImport
+from app.schemas.bulk_import import ImportResult
+from app.schemas.token import TokenUser
+
+router = APIRouter()
+
+
+@router.post(
+    "/",
+    response_model=ImportResult,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/x-ndjson": {"schema": {"type": "string"}}},
+        }
+    },
+)
+async def import_rows(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: TokenUser = get_active_token_user_dep,
+) -> Any:
+    """Create tasks, subtasks and tickets from an NDJSON body, one object per line.
+
+    Each line has a ``type`` (``task``, ``subtask`` or ``ticket``) and that
+    type's create fields. A ``ref`` names the row for later lines: a subtask
+    can point at its task with ``task_ref`` and at its parent with
+    ``parent_ref``. The body is read and written in chunks as it arrives;
+    lines that can't be imported are listed in ``errors`` by line number.
+    """
+    importer = BulkImport(created_by_id=current_user.id)
+    lines: List[bytes] = []
+    rest = b""
+    async for data in request.stream():
+        *complete, rest = (rest + data).split(b"\n")
+        lines.extend(complete)
+        if len(lines) >= importer.batch_size:
+            await run_in_session(db, importer.import_chunk, lines)
+            lines = []
+    lines.append(rest)
+    await run_in_session(db, importer.import_chunk, lines)
+    return importer.result
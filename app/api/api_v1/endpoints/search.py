@@ -0,0 +1,29 @@
+from typing import Any, List, Optional
+
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db, get_active_token_user_dep
+from app.api.pagination import page_response
+from app.crud.base import run_in_session
+from app.crud.search import search_all
+from app.schemas.search import SearchHit, SearchType
+from app.schemas.token import TokenUser
+
+router = APIRouter()
+
+
+@router.get("/", response_model=List[SearchHit])
+async def search(
+    *,
+    response: Response,
+    db: Session = Depends(get_db),
+    query: str = Query(..., min_length=3),
+    types: Optional[List[SearchType]] = Query(None),
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    current_user: TokenUser = get_active_token_user_dep,
+) -> Any:
+    """Search tasks, subtasks, tickets, comments and attachment filenames at once, best match first."""
+    page = await run_in_session(db, search_all, query=query, types=types, limit=limit, cursor=cursor)
+    return page_response(response, page, SearchHit)
@@ -1,11 +1,12 @@
 from typing import Any, List, Optional
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_current_active_user_dep
+from app.api.deps import get_db, get_active_token_user_dep
+from app.api.pagination import page_response
 from app.core.errors import NotFoundError, ForbiddenError
 from app.crud.crud_subtask import subtask
-from app.models.user import User
+from app.schemas.token import TokenUser
 from app.schemas.subtask import Subtask as SubtaskSchema, SubtaskCreate, SubtaskUpdate
 
 router = APIRouter()
@@ -13,13 +14,16 @@ router = APIRouter()
 
 @router.get("/", response_model=List[SubtaskSchema])
 async def read_subtasks(
+    response: Response,
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
-    current_user: User = get_current_active_user_dep,
+    cursor: Optional[str] = None,
+    current_user: TokenUser = get_active_token_user_dep,
 ) -> Any:
     """Retrieve all subtasks (paginated)."""
-    return subtask.get_multi(db, skip=skip, limit=limit)
+    page = await subtask.aget_multi(db, skip=skip, limit=limit, cursor=cursor)
+    return page_response(response, page, SubtaskSchema)
 
 
 @router.post("/", response_model=SubtaskSchema)
@@ -27,34 +31,40 @@ async def create_subtask(
     *,
     db: Session = Depends(get_db),
     subtask_in: SubtaskCreate,
-    current_user: User = get_current_active_user_dep,
+    current_user: TokenUser = get_active_token_user_dep,
 ) -> Any:
     """Create new subtask for a task."""
-    return subtask.create_with_task(db, obj_in=subtask_in, created_by_id=current_user.id)
+    return await subtask.acreate_with_task(db, obj_in=subtask_in, created_by_id=current_user.id)
 
 
 @router.get("/task/{task_id}", response_model=List[SubtaskSchema])
 async def read_subtasks_by_task(
     *,
+    response: Response,
     db: Session = Depends(get_db),
     task_id: int,
     skip: int = 0,
     limit: int = 100,
-    current_user: User = get_current_active_user_dep,
+    cursor: Optional[str] = None,
+    current_user: TokenUser = get_active_token_user_dep,
 ) -> Any:
     """Get subtasks belonging to a task."""
-    return subtask.get_multi_by_task(db, task_id=task_id, skip=skip, limit=limit)
+    page = await subtask.aget_multi_by_task(db, task_id=task_id, skip=skip, limit=limit, cursor=cursor)
+    return page_response(response, page, SubtaskSchema)
 
 
 @router.get("/assigned", response_model=List[SubtaskSchema])
 async def read_assigned_subtasks(
+    response: Response,
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
-    current_user: User = get_current_active_user_dep,
+    cursor: Optional[str] = None,
+    current_user: TokenUser = get_active_token_user_dep,
 ) -> Any:
     """Get subtasks assigned to current user (Many-to-Many)."""
-    return subtask.get_multi_by_assignee(db, user_id=current_user.id, skip=skip, limit=limit)
+    page = await subtask.aget_multi_by_assignee(db, user_id=current_user.id, skip=skip, limit=limit, cursor=cursor)
+    return page_response(response, page, SubtaskSchema)
 
 
 @router.put("/{subtask_id}", response_model=SubtaskSchema)
@@ -63,20 +73,20 @@ async def update_subtask(
     db: Session = Depends(get_db),
     subtask_id: int,
     subtask_in: SubtaskUpdate,
-    current_user: User = get_current_active_user_dep,
+    current_user: TokenUser = get_active_token_user_dep,
 ) -> Any:
     """Update a subtask."""
-    subtask_obj = subtask.get(db, id=subtask_id)
+    subtask_obj = await subtask.aget(db, id=subtask_id)
     if not subtask_obj:
         raise NotFoundError(detail="Subtask not found")
 
     if not (
-        current_user in subtask_obj.assignees or
+        current_user.id in subtask_obj.assignee_ids or
         current_user.is_superuser
     ):
         raise ForbiddenError(detail="Not enough permissions")
 
-    return subtask.update(db, db_obj=subtask_obj, obj_in=subtask_in)
+    return await subtask.aupdate(db, db_obj=subtask_obj, obj_in=subtask_in)
 
 
 @router.delete("/{subtask_id}", response_model=SubtaskSchema)
@@ -84,20 +94,20 @@ async def delete_subtask(
     *,
     db: Session = Depends(get_db),
     subtask_id: int,
-    current_user: User = get_current_active_user_dep,
+    current_user: TokenUser = get_active_token_user_dep,
 ) -> Any:
     """Delete a subtask."""
-    subtask_obj = subtask.get(db, id=subtask_id)
+    subtask_obj = await subtask.aget(db, id=subtask_id)
     if not subtask_obj:
         raise NotFoundError(detail="Subtask not found")
 
     if not (
-        current_user in subtask_obj.assignees or
+        current_user.id in subtask_obj.assignee_ids or
         current_user.is_superuser
     ):
         raise ForbiddenError(detail="Not enough permissions")
 
-    return subtask.remove(db, id=subtask_id)
+    return await subtask.aremove(db, id=subtask_id)
 
 
 @router.post("/{subtask_id}/complete", response_model=SubtaskSchema)
@@ -105,17 +115,17 @@ async def complete_subtask(
     *,
     db: Session = Depends(get_db),
     subtask_id: int,
-    current_user: User = get_current_active_user_dep,
+    current_user: TokenUser = get_active_token_user_dep,
 ) -> Any:
     """Mark a subtask as completed."""
-    subtask_obj = subtask.get(db, id=subtask_id)
+    subtask_obj = await subtask.aget(db, id=subtask_id)
     if not subtask_obj:
         raise NotFoundError(detail="Subtask not found")
 
     if not (
-        current_user in subtask_obj.assignees or
+        current_user.id in subtask_obj.assignee_ids or
         current_user.is_superuser
     ):
         raise ForbiddenError(detail="Not enough permissions")
 
-    return subtask.complete_subtask(db, subtask_id=subtask_id)
\ No newline at end of file
+    return await subtask.acomplete_subtask(db, subtask_id=subtask_id, user_id=current_user.id)
\ No newline at end of file
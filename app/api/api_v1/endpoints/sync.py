@@ -0,0 +1,28 @@
+from typing import Any
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from app.api.deps import get_db, get_active_token_user_dep
+from app.crud.base import run_in_session
+from app.crud.sync import changes_since
+from app.schemas.sync import SyncResult
+from app.schemas.token import TokenUser
+
+router = APIRouter()
+
+
+@router.get("/", response_model=SyncResult)
+async def sync(
+    *,
+    db: Session = Depends(get_db),
+    since: str = "0",
+    limit: int = Query(1000, ge=1, le=5000),
+    current_user: TokenUser = get_active_token_user_dep,
+) -> Any:
+    """Tasks, subtasks, tickets, comments and projects changed or deleted since ``since``.
+
+    Start from ``since=0`` (everything), store the returned ``token`` and
+    pass it next time. While ``has_more`` is true, call again at once with
+    the new token. Rows replace the client's copies, ``deleted`` ids are
+    dropped.
+    """
+    return await run_in_session(db, changes_since, since=since, limit=limit)
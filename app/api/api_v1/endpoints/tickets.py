@@ -1,33 +1,39 @@
 from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, Query, HTTPException, status
+from fastapi import APIRouter, Depends, Query, HTTPException, status, Response
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_current_active_user_dep, get_current_active_superuser_dep
+from app.api.deps import get_db, get_active_token_user_dep
+from app.api.fieldsets import fields_param, sparse_schema
+from app.api.pagination import page_response
 from app.core.errors import NotFoundError, ForbiddenError
 from app.crud.crud_ticket import ticket
 from app.crud.crud_user import user
-from app.models.user import User
+from app.schemas.token import TokenUser
 from app.models.ticket import TicketStatus, TicketPriority
-from app.schemas.ticket import Ticket as TicketSchema, TicketCreate, TicketUpdate, TicketList
+from app.schemas.ticket import Ticket as TicketSchema, TicketCreate, TicketSearchResult, TicketUpdate, TicketList
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[TicketSchema])
 async def read_tickets(
+    response: Response,
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = fields_param,
     status: Optional[TicketStatus] = None,
-    current_user: User = get_current_active_user_dep,
+    current_user: TokenUser = get_active_token_user_dep,
 ) -> Any:
     """Retrieve tickets with optional filtering by status."""
+    schema = sparse_schema(TicketSchema, fields)
     if status:
-        tickets = ticket.get_multi_by_status(db, status=status, skip=skip, limit=limit)
+        tickets = await ticket.aget_multi_by_status(db, status=status, skip=skip, limit=limit, cursor=cursor, schema=schema)
     else:
-        tickets = ticket.get_multi(db, skip=skip, limit=limit)
-    return tickets
+        tickets = await ticket.aget_multi(db, skip=skip, limit=limit, cursor=cursor, schema=schema)
+    return page_response(response, tickets, schema)
 
 
 @router.post("/", response_model=TicketSchema)
@@ -35,51 +41,64 @@ async def create_ticket(
     *,
     db: Session = Depends(get_db),
     ticket_in: TicketCreate,
-    current_user: User = get_current_active_user_dep,
+    current_user: TokenUser = get_active_token_user_dep,
 ) -> Any:
     """Create new ticket."""
     # Validate assigned_to_id if provided
     if ticket_in.assigned_to_id:
-        assigned_user = user.get(db, id=ticket_in.assigned_to_id)
+        assigned_user = await user.aget(db, id=ticket_in.assigned_to_id)
         if not assigned_user:
             raise NotFoundError(detail="Assigned user not found")
     
-    return ticket.create_with_owner(db, obj_in=ticket_in, created_by_id=current_user.id)
+    return await ticket.acreate_with_owner(db, obj_in=ticket_in, created_by_id=current_user.id)
 
 
 @router.get("/me", response_model=List[TicketSchema])
 async def read_my_tickets(
+    response: Response,
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
-    current_user: User = get_current_active_user_dep,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = fields_param,
+    current_user: TokenUser = get_active_token_user_dep,
 ) -> Any:
     """Get tickets created by current user."""
-    return ticket.get_multi_by_owner(db, created_by_id=current_user.id, skip=skip, limit=limit)
+    schema = sparse_schema(TicketSchema, fields)
+    page = await ticket.aget_multi_by_owner(db, created_by_id=current_user.id, skip=skip, limit=limit, cursor=cursor, schema=schema)
+    return page_response(response, page, schema)
 
 
 @router.get("/assigned", response_model=List[TicketSchema])
 async def read_assigned_tickets(
+    response: Response,
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
-    current_user: User = get_current_active_user_dep,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = fields_param,
+    current_user: TokenUser = get_active_token_user_dep,
 ) -> Any:
     """Get tickets assigned to current user."""
-    return ticket.get_multi_by_assignee(db, assigned_to_id=current_user.id, skip=skip, limit=limit)
+    schema = sparse_schema(TicketSchema, fields)
+    page = await ticket.aget_multi_by_assignee(db, assigned_to_id=current_user.id, skip=skip, limit=limit, cursor=cursor, schema=schema)
+    return page_response(response, page, schema)
 
 
-@router.get("/search", response_model=List[TicketSchema])
+@router.get("/search", response_model=List[TicketSearchResult])
 async def search_tickets(
     *,
+    response: Response,
     db: Session = Depends(get_db),
     query: str = Query(..., min_length=3),
     skip: int = 0,
     limit: int = 100,
-    current_user: User = get_current_active_user_dep,
+    cursor: Optional[str] = None,
+    current_user: TokenUser = get_active_token_user_dep,
 ) -> Any:
-    """Search tickets by title or description."""
-    return ticket.search_tickets(db, query=query, skip=skip, limit=limit)
+    """Search tickets by title or description, best match first."""
+    page = await ticket.asearch_tickets(db, query=query, skip=skip, limit=limit, cursor=cursor)
+    return page_response(response, page, TicketSearchResult)
 
 
 @router.get("/{ticket_id}", response_model=TicketSchema)
@@ -87,13 +106,13 @@ async def read_ticket(
     *,
     db: Session = Depends(get_db),
     ticket_id: int,
-    current_user: User = get_current_active_user_dep,
+    current_user: TokenUser = get_active_token_user_dep,
 ) -> Any:
     """Get ticket by ID."""
-    ticket_obj = ticket.get(db, id=ticket_id)
-    if not ticket_obj:
+    ticket_row = await ticket.aget_row(db, id=ticket_id, schema=TicketSchema)
+    if not ticket_row:
         raise NotFoundError(detail="Ticket not found")
-    return ticket_obj
+    return ticket_row
 
 
 @router.put("/{ticket_id}", response_model=TicketSchema)
@@ -102,10 +121,10 @@ async def update_ticket(
     db: Session = Depends(get_db),
     ticket_id: int,
     ticket_in: TicketUpdate,
-    current_user: User = get_current_active_user_dep,
+    current_user: TokenUser = get_active_token_user_dep,
 ) -> Any:
     """Update a ticket."""
-    ticket_obj = ticket.get(db, id=ticket_id)
+    ticket_obj = await ticket.aget(db, id=ticket_id)
     if not ticket_obj:
         raise NotFoundError(detail="Ticket not found")
     
@@ -117,11 +136,11 @@ async def update_ticket(
     
     # Validate assigned_to_id if provided
     if ticket_in.assigned_to_id and ticket_in.assigned_to_id != ticket_obj.assigned_to_id:
-        assigned_user = user.get(db, id=ticket_in.assigned_to_id)
+        assigned_user = await user.aget(db, id=ticket_in.assigned_to_id)
         if not assigned_user:
             raise NotFoundError(detail="Assigned user not found")
     
-    return ticket.update(db, db_obj=ticket_obj, obj_in=ticket_in)
+    return await ticket.aupdate(db, db_obj=ticket_obj, obj_in=ticket_in)
 
 
 @router.delete("/{ticket_id}", response_model=TicketSchema)
@@ -129,10 +148,10 @@ async def delete_ticket(
     *,
     db: Session = Depends(get_db),
     ticket_id: int,
-    current_user: User = get_current_active_user_dep,
+    current_user: TokenUser = get_active_token_user_dep,
 ) -> Any:
     """Delete a ticket."""
-    ticket_obj = ticket.get(db, id=ticket_id)
+    ticket_obj = await ticket.aget(db, id=ticket_id)
     if not ticket_obj:
         raise NotFoundError(detail="Ticket not found")
     
@@ -140,7 +159,7 @@ async def delete_ticket(
     if not (ticket_obj.created_by_id == current_user.id or current_user.is_superuser):
         raise ForbiddenError(detail="Not enough permissions")
     
-    return ticket.remove(db, id=ticket_id)
+    return await ticket.aremove(db, id=ticket_id)
 
 
 @router.post("/{ticket_id}/close", response_model=TicketSchema)
@@ -148,10 +167,10 @@ async def close_ticket(
     *,
     db: Session = Depends(get_db),
     ticket_id: int,
-    current_user: User = get_current_active_user_dep,
+    current_user: TokenUser = get_active_token_user_dep,
 ) -> Any:
     """Close a ticket."""
-    ticket_obj = ticket.get(db, id=ticket_id)
+    ticket_obj = await ticket.aget(db, id=ticket_id)
     if not ticket_obj:
         raise NotFoundError(detail="Ticket not found")
     
@@ -161,4 +180,4 @@ async def close_ticket(
             current_user.is_superuser):
         raise ForbiddenError(detail="Not enough permissions")
     
-    return ticket.close_ticket(db, ticket_id=ticket_id)
\ No newline at end of file
+    return await ticket.aclose_ticket(db, ticket_id=ticket_id)
\ No newline at end of file
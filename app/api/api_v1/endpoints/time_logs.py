@@ -1,36 +1,47 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, Response
 from sqlalchemy.orm import Session
-from app.api.deps import get_db, get_current_active_user_dep
+from app.api.deps import get_db, get_active_token_user_dep
+from app.api.pagination import page_response
 from app.crud.crud_time_log import time_log
 from app.schemas.time_log import TimeLogRead, TimeLogCreate
-from app.models.user import User
+from app.schemas.token import TokenUser
 
 router = APIRouter()
 
 @router.post("/", response_model=TimeLogRead)
-def create_time_log(
+async def create_time_log(
     *,
     db: Session = Depends(get_db),
     time_log_in: TimeLogCreate,
-    current_user: User = get_current_active_user_dep,
+    current_user: TokenUser = get_active_token_user_dep,
 ) -> Any:
-    return time_log.create_with_user(db, obj_in=time_log_in, user_id=current_user.id)
+    return await time_log.acreate_with_user(db, obj_in=time_log_in, user_id=current_user.id)
 
 @router.get("/task/{task_id}", response_model=List[TimeLogRead])
-def read_time_logs_by_task(
+async def read_time_logs_by_task(
     *,
+    response: Response,
     db: Session = Depends(get_db),
     task_id: int,
-    current_user: User = get_current_active_user_dep,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    current_user: TokenUser = get_active_token_user_dep,
 ) -> Any:
-    return time_log.get_multi_by_task(db, task_id=task_id)
+    page = await time_log.aget_multi_by_task(db, task_id=task_id, skip=skip, limit=limit, cursor=cursor, schema=TimeLogRead)
+    return page_response(response, page, TimeLogRead)
 
 @router.get("/subtask/{subtask_id}", response_model=List[TimeLogRead])
-def read_time_logs_by_subtask(
+async def read_time_logs_by_subtask(
     *,
+    response: Response,
     db: Session = Depends(get_db),
     subtask_id: int,
-    current_user: User = get_current_active_user_dep,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    current_user: TokenUser = get_active_token_user_dep,
 ) -> Any:
-    return time_log.get_multi_by_subtask(db, subtask_id=subtask_id)
\ No newline at end of file
+    page = await time_log.aget_multi_by_subtask(db, subtask_id=subtask_id, skip=skip, limit=limit, cursor=cursor, schema=TimeLogRead)
+    return page_response(response, page, TimeLogRead)
\ No newline at end of file
@@ -0,0 +1,171 @@
+from typing import Any, List, Tuple
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+from app.api.deps import get_db, get_active_token_user_dep
+from app.api.uploads import check_targets, clean_filename, content_type_of
+from app.core.config import settings
+from app.core.errors import BadRequestError, ForbiddenError, NotFoundError, PayloadTooLargeError
+from app.core.storage import storage
+from app.crud.base import run_in_session
+from app.crud.crud_attachment import attachment
+from app.crud.crud_upload import upload
+from app.models.upload import Upload
+from app.schemas.attachment import AttachmentBase, AttachmentRead
+from app.schemas.token import TokenUser
+from app.schemas.upload import UploadCreate, UploadRead
+
+router = APIRouter()
+
+CHUNK_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {"application/octet-stream": {"schema": {"type": "string", "format": "binary"}}},
+    }
+}
+
+
+async def get_own_upload(db: Session, upload_id: int, current_user: TokenUser) -> Upload:
+    upload_obj = await upload.aget_active(db, id=upload_id)
+    if not upload_obj:
+        raise NotFoundError(detail="Upload not found")
+    if not (upload_obj.created_by_id == current_user.id or current_user.is_superuser):
+        raise ForbiddenError(detail="Not enough permissions")
+    return upload_obj
+
+
+def missing_ranges(upload_obj: Upload) -> List[Tuple[int, int]]:
+    """The ``[start, end)`` byte ranges of the file not received yet."""
+    missing = []
+    position = 0
+    for start, end in upload_obj.received:
+        if start > position:
+            missing.append((position, start))
+        position = max(position, end)
+    if position < upload_obj.size:
+        missing.append((position, upload_obj.size))
+    return missing
+
+
+@router.post("/", response_model=UploadRead)
+async def create_upload(
+    *,
+    db: Session = Depends(get_db),
+    upload_in: UploadCreate,
+    current_user: TokenUser = get_active_token_user_dep,
+) -> Any:
+    """Start a resumable upload of a ``size`` byte file.
+
+    Send the file's bytes with ``PUT /attachments/uploads/{id}?offset=...``
+    in chunks of any size, in any order and in parallel, then complete the
+    upload to turn it into an attachment. An upload no chunk arrived for in
+    UPLOAD_EXPIRE_SECONDS is deleted.
+    """
+    if upload_in.size > settings.UPLOAD_MAX_SIZE:
+        raise PayloadTooLargeError(detail=f"Files are limited to {settings.UPLOAD_MAX_SIZE} bytes")
+    # Checked now rather than when the file has been sent in full
+    await check_targets(db, upload_in.task_id, upload_in.subtask_id)
+    upload_in.filename = clean_filename(upload_in.filename)
+    upload_obj = await upload.acreate_with_owner(
+        db, obj_in=upload_in, created_by_id=current_user.id,
+        content_type=content_type_of(upload_in.content_type, upload_in.filename),
+    )
+    try:
+        await run_in_threadpool(storage.create_partial, upload_obj.id, upload_obj.size)
+    except OSError:
+        await upload.aremove(db, id=upload_obj.id)
+        raise
+    return upload_obj
+
+@router.get("/{upload_id}", response_model=UploadRead)
+async def read_upload(
+    *,
+    db: Session = Depends(get_db),
+    upload_id: int,
+    current_user: TokenUser = get_active_token_user_dep,
+) -> Any:
+    """The upload with the byte ranges received so far, to resume from."""
+    return await get_own_upload(db, upload_id, current_user)
+
+@router.put("/{upload_id}", response_model=UploadRead, openapi_extra=CHUNK_BODY)
+async def upload_chunk(
+    *,
+    request: Request,
+    db: Session = Depends(get_db),
+    upload_id: int,
+    offset: int = Query(..., ge=0),
+    current_user: TokenUser = get_active_token_user_dep,
+) -> Any:
+    """Write the request body into the file from ``offset``.
+
+    A range only counts as received once its whole chunk has arrived, so a
+    chunk cut off midway is simply sent again. Sending a range twice is
+    harmless.
+    """
+    upload_obj = await get_own_upload(db, upload_id, current_user)
+    size = upload_obj.size
+    length = request.headers.get("content-length")
+    if offset > size or (length is not None and length.isdigit() and offset + int(length) > size):
+        raise BadRequestError(detail=f"The chunk runs past the end of the {size} byte file")
+    # No pool connection is held while the chunk streams in
+    await run_in_session(db, Session.rollback)
+    written = await storage.write_partial(upload_id, offset, request.stream(), size=size)
+    if written:
+        upload_obj = await upload.aadd_chunk(db, id=upload_id, offset=offset, length=written)
+    else:
+        upload_obj = await upload.aget_active(db, id=upload_id)
+    if not upload_obj:
+        raise NotFoundError(detail="Upload not found")
+    return upload_obj
+
+@router.post("/{upload_id}/complete", response_model=AttachmentRead)
+async def complete_upload(
+    *,
+    db: Session = Depends(get_db),
+    upload_id: int,
+    current_user: TokenUser = get_active_token_user_dep,
+) -> Any:
+    """Turn a fully received upload into an attachment.
+
+    The file is hashed, checked against the ``sha256`` given when the
+    upload was created, and moved into the attachment storage in one rename.
+    The rename comes after the attachment row is inserted, so if either
+    fails the upload is left as it was and can be completed again.
+    """
+    upload_obj = await get_own_upload(db, upload_id, current_user)
+    missing = missing_ranges(upload_obj)
+    if missing:
+        raise BadRequestError(detail=f"The upload is missing byte ranges {missing}")
+    sha256 = upload_obj.sha256
+    # No pool connection is held while the file is hashed
+    await run_in_session(db, Session.rollback)
+    stored = await storage.hash_partial(upload_id, sha256=sha256)
+    # It may have expired or been completed meanwhile
+    upload_obj = await get_own_upload(db, upload_id, current_user)
+    attachment_in = AttachmentBase(
+        filename=upload_obj.filename, task_id=upload_obj.task_id, subtask_id=upload_obj.subtask_id
+    )
+    attachment_obj = await attachment.acreate_with_owner(
+        db, obj_in=attachment_in, uploaded_by_id=upload_obj.created_by_id,
+        stored=stored, content_type=upload_obj.content_type,
+    )
+    try:
+        await run_in_threadpool(storage.place_partial, upload_obj.id, stored.sha256)
+    except OSError:
+        await attachment.aremove(db, id=attachment_obj.id)
+        raise
+    await upload.aremove(db, id=upload_obj.id)
+    return attachment_obj
+
+@router.delete("/{upload_id}", response_model=UploadRead)
+async def delete_upload(
+    *,
+    db: Session = Depends(get_db),
+    upload_id: int,
+    current_user: TokenUser = get_active_token_user_dep,
+) -> Any:
+    """Abandon an upload and delete what was received of it."""
+    upload_obj = await get_own_upload(db, upload_id, current_user)
+    upload_obj = await upload.aremove(db, id=upload_obj.id)
+    await run_in_threadpool(storage.discard_partial, upload_obj.id)
+    return upload_obj
@@ -0,0 +1,12 @@
+from fastapi import Request
+
+
+def if_none_match(request: Request, etag: str) -> bool:
+    """Whether the request's ``If-None-Match`` names ``etag`` (a quoted tag),
+    i.e. the client's cached copy is current and a ``304`` will do."""
+    header = request.headers.get("if-none-match")
+    if header is None:
+        return False
+    tags = [tag.strip() for tag in header.split(",")]
+    # If-None-Match compares weakly: W/"x" matches "x"
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
@@ -1,27 +1,24 @@
-from typing import Generator
-
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt
 from pydantic import ValidationError
-from sqlalchemy.orm import Session
 
 from app.core.config import settings
-from app.core.security import get_current_user, get_current_active_user, get_current_active_superuser
-from app.db.session import SessionLocal
+from app.core.security import (
+    get_active_token_superuser,
+    get_active_token_user,
+    get_current_active_superuser,
+    get_current_active_user,
+    get_current_user,
+)
+from app.db.session import get_db
 from app.models.user import User
 
 
-def get_db() -> Generator[Session, None, None]:
-    """Dependency for getting DB session."""
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 # Reusable dependencies
 get_current_user_dep = Depends(get_current_user)
 get_current_active_user_dep = Depends(get_current_active_user)
-get_current_active_superuser_dep = Depends(get_current_active_superuser)
\ No newline at end of file
+get_current_active_superuser_dep = Depends(get_current_active_superuser)
+# Claims-only variants: id and flags from the token, no users table lookup
+get_active_token_user_dep = Depends(get_active_token_user)
+get_active_token_superuser_dep = Depends(get_active_token_superuser)
\ No newline at end of file
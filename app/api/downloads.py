@@ -0,0 +1,63 @@
+import inspect
+from secrets import token_hex
+from typing import List, Tuple
+
+import anyio
+from fastapi.responses import FileResponse
+from starlette.types import Send
+
+
+class RangeFileResponse(FileResponse):
+    """``FileResponse`` whose multi-range replies are valid ``multipart/byteranges``.
+
+    Starlette's own puts the boundary in ``Content-Range`` instead of
+    ``Content-Type``, ends lines with a bare LF and announces one byte less
+    than it sends, which strict clients and servers reject. Full responses,
+    single ranges, ``If-Range`` and HEAD are left to ``FileResponse``.
+    """
+
+    async def _handle_multiple_ranges(
+        self, send: Send, ranges: List[Tuple[int, int]], file_size: int, send_header_only: bool
+    ) -> None:
+        boundary = token_hex(13)
+        content_type = self.headers["content-type"]
+        part_headers = [
+            (
+                f"--{boundary}\r\nContent-Type: {content_type}\r\n"
+                f"Content-Range: bytes {start}-{end - 1}/{file_size}\r\n\r\n"
+            ).encode("latin-1")
+            for start, end in ranges
+        ]
+        closing = f"--{boundary}--\r\n".encode("latin-1")
+        self.headers["content-type"] = f"multipart/byteranges; boundary={boundary}"
+        self.headers["content-length"] = str(
+            sum(len(header) + end - start + 2 for header, (start, end) in zip(part_headers, ranges)) + len(closing)
+        )
+        await send({"type": "http.response.start", "status": 206, "headers": self.raw_headers})
+        if send_header_only:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            for header, (start, end) in zip(part_headers, ranges):
+                await send({"type": "http.response.body", "body": header, "more_body": True})
+                await file.seek(start)
+                while start < end:
+                    chunk = await file.read(min(self.chunk_size, end - start))
+                    if not chunk:
+                        # Truncated or replaced on disk since it was stat'ed: the
+                        # announced length can't be met, so abort the response
+                        raise OSError(f"{self.path} ended at byte {start} of {file_size}")
+                    start += len(chunk)
+                    await send({"type": "http.response.body", "body": chunk, "more_body": True})
+                await send({"type": "http.response.body", "body": b"\r\n", "more_body": True})
+        await send({"type": "http.response.body", "body": closing, "more_body": False})
+
+
+# The override replaces a private FileResponse method, which is why starlette is
+# pinned in requirements.txt. Should an upgrade rename it or change its
+# arguments, fail on import rather than silently send Starlette's replies
+_OVERRIDDEN = getattr(FileResponse, "_handle_multiple_ranges", None)
+if _OVERRIDDEN is None or list(inspect.signature(_OVERRIDDEN).parameters) != list(
+    inspect.signature(RangeFileResponse._handle_multiple_ranges).parameters
+):
+    raise RuntimeError("RangeFileResponse needs updating for this version of Starlette")
@@ -0,0 +1,62 @@
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Type
+
+from fastapi import Query
+from pydantic import BaseModel, ConfigDict, create_model
+
+from app.core.errors import BadRequestError
+
+_schemas: Dict[Tuple[Any, ...], Type[BaseModel]] = {}
+
+fields_param = Query(None, description="Comma-separated fields to return; id is always included")
+
+
+def expand_param(expansions: Mapping[str, Type[BaseModel]]) -> Any:
+    return Query(None, description=f"Comma-separated lists to embed: {', '.join(expansions)}")
+
+
+def _names(value: Optional[str]) -> List[str]:
+    return [name.strip() for name in (value or "").split(",") if name.strip()]
+
+
+def sparse_schema(
+    schema: Type[BaseModel],
+    fields: Optional[str] = None,
+    expand: Optional[str] = None,
+    expansions: Optional[Mapping[str, Type[BaseModel]]] = None,
+) -> Type[BaseModel]:
+    """``schema`` cut down to the comma-separated ``fields`` plus ``expand`` lists.
+
+    ``id`` is always kept. Each name in ``expand`` must be a key of
+    ``expansions`` and adds a list of that schema. Built models are cached,
+    so a given combination is only compiled once. CRUD row reads select
+    just the columns the returned schema has (see CRUDBase.list_query).
+    """
+    names = _names(fields)
+    expanded = _names(expand)
+    if not names and not expanded:
+        return schema
+    unknown = [name for name in names if name not in schema.model_fields]
+    if unknown:
+        raise BadRequestError(detail=f"Unknown fields: {', '.join(unknown)}")
+    unknown = [name for name in expanded if name not in (expansions or {})]
+    if unknown:
+        raise BadRequestError(detail=f"Cannot expand: {', '.join(unknown)}")
+
+    picked = list(schema.model_fields)
+    if names:
+        picked = [name for name in picked if name == "id" or name in names]
+    expanded = [name for name in expansions or {} if name in expanded]
+    key = (schema, tuple(picked), tuple(expanded))
+    sparse = _schemas.get(key)
+    if sparse is None:
+        definitions: Dict[str, Any] = {
+            name: (schema.model_fields[name].annotation, schema.model_fields[name]) for name in picked
+        }
+        for name in expanded:
+            definitions[name] = (List[expansions[name]], [])
+        sparse = _schemas[key] = create_model(
+            schema.__name__,
+            __config__=ConfigDict(from_attributes=True),
+            **definitions,
+        )
+    return sparse
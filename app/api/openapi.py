@@ -0,0 +1,58 @@
+import gzip
+import hashlib
+import json
+import threading
+from typing import Optional, Tuple
+
+from fastapi import FastAPI, Request, Response
+
+from app.api.conditional import if_none_match
+
+
+class OpenAPIDocument:
+    """The app's OpenAPI schema, serialized and gzipped once and served with an ETag.
+
+    Rebuilt only when the app's routes change. Clients revalidate with
+    ``If-None-Match`` and get a bodyless ``304`` while the schema is unchanged.
+    """
+
+    def __init__(self, app: FastAPI) -> None:
+        self.app = app
+        self._lock = threading.Lock()
+        self._routes: Optional[Tuple[int, ...]] = None
+        self.body = b""
+        self.gzipped = b""
+        self.etag = ""
+        self.builds = 0
+
+    def _build(self) -> None:
+        # FastAPI keeps its own copy of the schema; drop it so route changes show up
+        self.app.openapi_schema = None
+        body = json.dumps(self.app.openapi(), ensure_ascii=False, separators=(",", ":")).encode()
+        self.body = body
+        self.gzipped = gzip.compress(body, mtime=0)
+        self.etag = hashlib.sha256(body).hexdigest()
+        self.builds += 1
+
+    def refresh(self) -> None:
+        """Rebuild the schema if routes were added or removed since the last build."""
+        routes = tuple(id(route) for route in self.app.routes)
+        if routes == self._routes:
+            return
+        with self._lock:
+            if routes != self._routes:
+                self._build()
+                self._routes = routes
+
+    def response(self, request: Request) -> Response:
+        self.refresh()
+        gzipped = "gzip" in request.headers.get("accept-encoding", "")
+        # Each encoding is a different representation, so it needs its own strong tag
+        etag = f'"{self.etag}-gzip"' if gzipped else f'"{self.etag}"'
+        headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+        if if_none_match(request, etag):
+            return Response(status_code=304, headers=headers)
+        if gzipped:
+            headers["Content-Encoding"] = "gzip"
+            return Response(self.gzipped, media_type="application/json", headers=headers)
+        return Response(self.body, media_type="application/json", headers=headers)
@@ -0,0 +1,41 @@
+from typing import Any, Dict, List
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from app.crud.pagination import Page
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+PREV_CURSOR_HEADER = "X-Prev-Cursor"
+
+
+def with_cursor_headers(response: Response, page: Page) -> Page:
+    """Send a page's cursors as headers, keeping the list body unchanged."""
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    if page.prev_cursor:
+        response.headers[PREV_CURSOR_HEADER] = page.prev_cursor
+    return page
+
+
+_list_adapters: Dict[Any, TypeAdapter] = {}
+
+
+def page_response(response: Response, page: Page, model: Any) -> Response:
+    """Serialize ``page`` as a JSON list of ``model`` with its cursor headers.
+
+    The rows are validated into ``model`` once and dumped straight to bytes,
+    skipping FastAPI's response_model pass (validate, re-encode to dicts,
+    then json.dumps). The route's response_model still documents the body.
+    """
+    with_cursor_headers(response, page)
+    adapter = _list_adapters.get(model)
+    if adapter is None:
+        adapter = _list_adapters[model] = TypeAdapter(List[model])
+    body = adapter.dump_json(adapter.validate_python(page, from_attributes=True))
+    return Response(
+        body,
+        status_code=response.status_code or 200,
+        headers=dict(response.headers),
+        media_type="application/json",
+    )
@@ -0,0 +1,123 @@
+import mimetypes
+import os
+from typing import AsyncIterator, Dict, List, Optional
+
+from fastapi import Request
+from python_multipart.exceptions import MultipartParseError
+from python_multipart.multipart import MultipartParser, parse_options_header
+from sqlalchemy.orm import Session
+
+from app.core.errors import BadRequestError, NotFoundError, PayloadTooLargeError
+from app.core.storage import storage
+from app.crud.crud_subtask import subtask
+from app.crud.crud_task import task
+
+DEFAULT_CONTENT_TYPE = "application/octet-stream"
+
+
+def clean_filename(filename: Optional[str]) -> str:
+    """The client's file name without any directory part."""
+    name = os.path.basename((filename or "").replace("\\", "/")).strip()
+    if not name:
+        raise BadRequestError(detail="A file name is required")
+    return name[:255]
+
+
+def content_type_of(declared: Optional[str], filename: str) -> str:
+    """The declared MIME type, or a guess from the file name if the client didn't send a real one."""
+    declared = (declared or "").split(";")[0].strip().lower()
+    if declared and declared != DEFAULT_CONTENT_TYPE:
+        return declared
+    return mimetypes.guess_type(filename)[0] or DEFAULT_CONTENT_TYPE
+
+
+def check_content_length(request: Request) -> None:
+    """Reject a body that announces itself as too large before reading any of it."""
+    length = request.headers.get("content-length")
+    if length is not None and length.isdigit() and int(length) > storage.max_size:
+        raise PayloadTooLargeError(detail=f"Files are limited to {storage.max_size} bytes")
+
+
+async def check_targets(db: Session, task_id: Optional[int], subtask_id: Optional[int]) -> None:
+    """Reject a file for a task or subtask that doesn't exist before reading any of it."""
+    if task_id is not None and not await task.aget(db, id=task_id):
+        raise NotFoundError(detail="Task not found")
+    if subtask_id is not None and not await subtask.aget(db, id=subtask_id):
+        raise NotFoundError(detail="Subtask not found")
+
+
+class MultipartFile:
+    """The first file part of a ``multipart/form-data`` request, streamed as it is parsed.
+
+    Unlike ``UploadFile``, which spools the whole part to a temporary file
+    before the handler runs, ``chunks()`` hands over the file's bytes as
+    each piece of the body arrives. Other parts are skipped.
+    """
+
+    def __init__(self, request: Request) -> None:
+        content_type, params = parse_options_header(request.headers.get("content-type", ""))
+        boundary = params.get(b"boundary")
+        if content_type != b"multipart/form-data" or not boundary:
+            raise BadRequestError(detail="Expected a multipart/form-data body")
+        self.request = request
+        self.filename: Optional[str] = None
+        self.content_type: Optional[str] = None
+        self._headers: Dict[bytes, bytes] = {}
+        self._field = b""
+        self._value = b""
+        self._in_file = False
+        self._done = False
+        self._data: List[bytes] = []
+        self._parser = MultipartParser(boundary, {
+            "on_part_begin": self._on_part_begin,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end,
+        })
+
+    def _on_part_begin(self) -> None:
+        self._headers = {}
+
+    def _on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._value += data[start:end]
+
+    def _on_header_end(self) -> None:
+        self._headers[self._field.lower()] = self._value
+        self._field = self._value = b""
+
+    def _on_headers_finished(self) -> None:
+        _, params = parse_options_header(self._headers.get(b"content-disposition", b""))
+        if self._done or b"filename" not in params:
+            return
+        self._in_file = True
+        self.filename = params[b"filename"].decode("utf-8", "replace")
+        self.content_type = self._headers.get(b"content-type", b"").decode("latin-1") or None
+
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._in_file:
+            self._data.append(data[start:end])
+
+    def _on_part_end(self) -> None:
+        if self._in_file:
+            self._in_file = False
+            self._done = True
+
+    async def chunks(self) -> AsyncIterator[bytes]:
+        try:
+            async for body in self.request.stream():
+                self._parser.write(body)
+                if self._data:
+                    chunk = b"".join(self._data)
+                    self._data.clear()
+                    yield chunk
+            self._parser.finalize()
+        except MultipartParseError:
+            raise BadRequestError(detail="Malformed multipart body")
+        if self.filename is None:
+            raise BadRequestError(detail="The form has no file")
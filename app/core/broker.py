@@ -0,0 +1,114 @@
+"""In-process publish/subscribe for change events (see app.db.change_events).
+
+Subscribers live on the event loop, each with a bounded queue of encoded
+messages; publishers may be any thread. A subscriber that lets its queue
+fill up is dropped rather than slowing the publisher or buffering without
+bound: it receives OVERFLOW and must reload what it shows.
+
+The broker only reaches subscribers of its own process: with several
+workers, a client sees the changes committed by the worker it is
+connected to.
+"""
+import asyncio
+from collections import defaultdict
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from app.core.config import settings
+
+# Message a dropped subscriber receives last
+OVERFLOW = b'{"type":"overflow"}'
+
+
+class Subscription:
+    def __init__(self, broker: "Broker", topics: FrozenSet[str], max_size: int) -> None:
+        self.broker = broker
+        self.topics = topics
+        self.queue: "asyncio.Queue[bytes]" = asyncio.Queue(max_size)
+        self.dropped = False
+
+    def _put(self, message: bytes) -> None:
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.dropped = True
+            self.broker.unsubscribe(self)
+            # Nothing queued is worth delivering once the client has to reload
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(OVERFLOW)
+
+    async def get(self, timeout: float) -> Optional[bytes]:
+        """The next message, or None if none arrived within ``timeout`` seconds."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        self.broker.unsubscribe(self)
+
+
+class Broker:
+    def __init__(self, *, queue_size: int) -> None:
+        self.queue_size = queue_size
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._topics: Dict[str, Set[Subscription]] = defaultdict(set)
+
+    @property
+    def active(self) -> bool:
+        """Whether anyone is listening, so publishers can skip building events."""
+        return self._loop is not None and bool(self._topics)
+
+    def start(self) -> None:
+        """Bind to the running event loop, which all subscribers run on."""
+        self._loop = asyncio.get_running_loop()
+
+    def stop(self) -> None:
+        self._loop = None
+        self._topics.clear()
+
+    def subscribe(self, topics: Iterable[str]) -> Subscription:
+        subscription = Subscription(self, frozenset(topics), self.queue_size)
+        for topic in subscription.topics:
+            self._topics[topic].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        for topic in subscription.topics:
+            subscribers = self._topics.get(topic)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._topics[topic]
+
+    def publish(self, events: List[Tuple[FrozenSet[str], bytes]]) -> None:
+        """Deliver each ``(topics, message)`` once to every subscriber of any of its topics.
+
+        Safe to call from any thread; a no-op when nobody is subscribed.
+        """
+        loop = self._loop
+        if loop is None or not events:
+            return
+        try:
+            on_loop = asyncio.get_running_loop() is loop
+        except RuntimeError:
+            on_loop = False
+        if on_loop:
+            self._fan_out(events)
+        else:
+            try:
+                loop.call_soon_threadsafe(self._fan_out, events)
+            except RuntimeError:
+                # The loop closed while shutting down
+                pass
+
+    def _fan_out(self, events: List[Tuple[FrozenSet[str], bytes]]) -> None:
+        for topics, message in events:
+            subscribers: Set[Subscription] = set()
+            for topic in topics:
+                subscribers.update(self._topics.get(topic, ()))
+            for subscription in subscribers:
+                subscription._put(message)
+
+
+broker = Broker(queue_size=settings.CHANGE_STREAM_QUEUE_SIZE)
@@ -8,8 +8,37 @@ from pydantic_settings import BaseSettings
 class Settings(BaseSettings):
     API_V1_STR: str = "/api/v1"
     SECRET_KEY: str = secrets.token_urlsafe(32)
-    # 60 minutes * 24 hours * 8 days = 8 days
-    ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8
+    # Access tokens carry the user's flags as claims and are verified without a
+    # DB lookup, so keep them short-lived
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # How often each process reloads token versions revoked by other processes
+    TOKEN_REVOCATION_REFRESH_SECONDS: int = 30
+    # Process-local cache of user rows for auth and /users/me
+    USER_CACHE_MAX_SIZE: int = 10000
+    USER_CACHE_TTL_SECONDS: int = 60
+    # Write activity entries from a background queue in batched INSERTs
+    # instead of inside each request's transaction
+    ACTIVITY_BUFFER_ENABLED: bool = False
+    ACTIVITY_BUFFER_MAX_SIZE: int = 10000
+    ACTIVITY_BUFFER_BATCH_SIZE: int = 500
+    ACTIVITY_BUFFER_FLUSH_SECONDS: float = 1.0
+    # Move activity entries older than this many days to activity_archive
+    ACTIVITY_ARCHIVE_ENABLED: bool = False
+    ACTIVITY_ARCHIVE_AFTER_DAYS: int = 90
+    ACTIVITY_ARCHIVE_INTERVAL_SECONDS: float = 3600.0
+    ACTIVITY_ARCHIVE_BATCH_SIZE: int = 1000
+    # Uploaded attachment files, stored once per SHA-256 digest
+    ATTACHMENT_STORAGE_DIR: str = "./attachments"
+    ATTACHMENT_MAX_SIZE: int = 1024 * 1024 * 1024
+    # Resumable uploads: size limit, and how long an upload may sit idle
+    # before its partial file is deleted
+    UPLOAD_MAX_SIZE: int = 16 * 1024 * 1024 * 1024
+    UPLOAD_EXPIRE_SECONDS: int = 24 * 60 * 60
+    UPLOAD_CLEANUP_INTERVAL_SECONDS: float = 3600.0
+    # Change stream: events a subscriber may fall behind by before it is
+    # dropped, and how often an idle connection is pinged
+    CHANGE_STREAM_QUEUE_SIZE: int = 256
+    CHANGE_STREAM_HEARTBEAT_SECONDS: float = 15.0
     # BACKEND_CORS_ORIGINS is a JSON-formatted list of origins
     # e.g: ["http://localhost", "http://localhost:4200", "http://localhost:3000"]
     BACKEND_CORS_ORIGINS: List[AnyHttpUrl] = []
@@ -28,6 +57,9 @@ class Settings(BaseSettings):
     
     # Database settings
     SQLALCHEMY_DATABASE_URI: str = "sqlite:///./ticket_system.db"
+    # Serve requests through an AsyncSession on an async driver
+    # (aiosqlite for SQLite, asyncpg for PostgreSQL) instead of the sync engine
+    SQLALCHEMY_ASYNC: bool = False
     
     class Config:
         case_sensitive = True
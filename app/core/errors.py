@@ -41,6 +41,12 @@ class BadRequestError(AppError):
         super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
 
 
+class PayloadTooLargeError(AppError):
+    """Request body too large error."""
+    def __init__(self, detail: str = "Request body too large") -> None:
+        super().__init__(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=detail)
+
+
 class ConflictError(AppError):
     """Conflict error."""
     def __init__(self, detail: str = "Resource already exists") -> None:
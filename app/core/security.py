@@ -1,5 +1,6 @@
+import time
 from datetime import datetime, timedelta
-from typing import Any, Optional, Union
+from typing import Any, Dict, Optional, Union
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
@@ -9,7 +10,7 @@ from pydantic import ValidationError
 
 from app.core.config import settings
 from app.models.user import User
-from app.schemas.token import TokenPayload
+from app.schemas.token import TokenPayload, TokenUser
 
 from app.db.session import get_db
 from sqlalchemy.orm import Session
@@ -34,24 +35,68 @@ def get_password_hash(password: str) -> str:
 
 
 def create_access_token(
-    subject: Union[str, Any], expires_delta: Optional[timedelta] = None
+    subject: Union[str, Any],
+    expires_delta: Optional[timedelta] = None,
+    claims: Optional[Dict[str, Any]] = None,
 ) -> str:
-    """Create a JWT access token."""
+    """Create a JWT access token, optionally signing extra claims into it."""
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
-    to_encode = {"exp": expire, "sub": str(subject)}
+    to_encode = {**(claims or {}), "exp": expire, "sub": str(subject)}
     encoded_jwt = jwt.encode(
         to_encode, settings.SECRET_KEY, algorithm="HS256"
     )
     return encoded_jwt
 
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
-    """Get the current user from the token."""
+class TokenRevocationList:
+    """In-memory map of the lowest token version still valid for each user.
+
+    A token is revoked when its ``ver`` claim is below the user's current
+    ``token_version``, or below the version recorded when the user was
+    deleted. Changes made by this process apply immediately; changes made by
+    other processes are picked up on the next periodic reload.
+    """
+
+    def __init__(self, refresh_seconds: int) -> None:
+        self.refresh_seconds = refresh_seconds
+        self._versions: Dict[int, int] = {}
+        self._refreshed_at: Optional[float] = None
+
+    def needs_refresh(self) -> bool:
+        return (
+            self._refreshed_at is None
+            or time.monotonic() - self._refreshed_at >= self.refresh_seconds
+        )
+
+    def load(self, versions: Dict[int, int]) -> None:
+        """Merge versions read from the database; versions only ever grow."""
+        for user_id, version in versions.items():
+            self.revoke(user_id, version)
+        self._refreshed_at = time.monotonic()
+
+    def revoke(self, user_id: int, version: int) -> None:
+        """Reject tokens of ``user_id`` issued before ``version``."""
+        if version > self._versions.get(user_id, 0):
+            self._versions[user_id] = version
+
+    def is_revoked(self, user_id: int, version: int) -> bool:
+        return version < self._versions.get(user_id, 0)
+
+
+token_revocations = TokenRevocationList(settings.TOKEN_REVOCATION_REFRESH_SECONDS)
+
+
+async def get_token_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> TokenUser:
+    """Get the caller's id and flags from the token claims.
+
+    Only touches the database to reload the revocation list, at most once
+    every TOKEN_REVOCATION_REFRESH_SECONDS per process.
+    """
     from app.crud.crud_user import user as crud_user
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -65,11 +110,48 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
         token_data = TokenPayload(**payload)
         if datetime.fromtimestamp(token_data.exp) < datetime.now():
             raise credentials_exception
+        # Tokens issued before claims were signed in have to be renewed
+        token_user = TokenUser(
+            id=token_data.sub,
+            is_active=token_data.is_active,
+            is_superuser=token_data.is_superuser,
+            ver=token_data.ver,
+        )
     except (JWTError, ValidationError):
         raise credentials_exception
-    user = crud_user.get(db, id=token_data.sub)
-    if not user:
+    if token_revocations.needs_refresh():
+        token_revocations.load(await crud_user.aget_token_versions(db))
+    if token_revocations.is_revoked(token_user.id, token_user.ver):
         raise credentials_exception
+    return token_user
+
+
+async def get_active_token_user(token_user: TokenUser = Depends(get_token_user)) -> TokenUser:
+    """Check the active flag of the token claims."""
+    if not token_user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    return token_user
+
+
+async def get_active_token_superuser(token_user: TokenUser = Depends(get_active_token_user)) -> TokenUser:
+    """Check the superuser flag of the token claims."""
+    if not token_user.is_superuser:
+        raise HTTPException(
+            status_code=403, detail="The user doesn't have enough privileges"
+        )
+    return token_user
+
+
+async def get_current_user(token_user: TokenUser = Depends(get_token_user), db: Session = Depends(get_db)) -> User:
+    """Get the current user from the token."""
+    from app.crud.crud_user import user as crud_user
+    user = await crud_user.aget(db, id=token_user.id)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     return user
 
 
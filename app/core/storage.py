@@ -0,0 +1,166 @@
+"""Content-addressed local storage for uploaded attachment files.
+
+A file is kept once, under its SHA-256 digest (``<root>/ab/cd/<digest>``),
+so uploading the same bytes again adds an Attachment row but no second copy.
+Uploads are streamed to a temporary file in ``<root>/tmp`` while being
+hashed, then renamed into place, so a file is never visible half-written.
+Resumable uploads are assembled in ``<root>/uploads/<upload id>``, written
+in chunks at any offset, and hashed, then renamed into place once complete.
+"""
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any, AsyncIterator, Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.errors import BadRequestError, NotFoundError, PayloadTooLargeError
+
+
+@dataclass
+class StoredFile:
+    sha256: str
+    size: int
+
+
+class LocalStorage:
+    def __init__(self, root: str, *, max_size: int) -> None:
+        self.root = Path(root)
+        self.max_size = max_size
+
+    def path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest[2:4] / digest
+
+    def exists(self, digest: str) -> bool:
+        return self.path(digest).is_file()
+
+    def _open_temp(self) -> IO[bytes]:
+        tmp_dir = self.root / "tmp"
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+        return tempfile.NamedTemporaryFile(dir=tmp_dir, delete=False)
+
+    @staticmethod
+    def _write(file: IO[bytes], digest: Any, chunk: bytes) -> None:
+        digest.update(chunk)
+        file.write(chunk)
+
+    def _commit(self, file: IO[bytes], digest: str) -> None:
+        """Move a finished temp file to its digest's path, or drop it if that file is already stored."""
+        file.flush()
+        os.fsync(file.fileno())
+        file.close()
+        self._place(file.name, digest)
+
+    def _place(self, source: str, digest: str) -> None:
+        target = self.path(digest)
+        if target.is_file():
+            os.unlink(source)
+            return
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(source, target)
+
+    @staticmethod
+    def _discard(file: IO[bytes]) -> None:
+        file.close()
+        try:
+            os.unlink(file.name)
+        except FileNotFoundError:
+            pass
+
+    async def save(self, chunks: AsyncIterator[bytes], *, max_size: Optional[int] = None) -> StoredFile:
+        """Stream ``chunks`` into the store; only one chunk is held in memory at a time.
+
+        Raises PayloadTooLargeError once more than ``max_size`` (default
+        ATTACHMENT_MAX_SIZE) bytes have arrived.
+        """
+        max_size = self.max_size if max_size is None else max_size
+        file = await run_in_threadpool(self._open_temp)
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > max_size:
+                    raise PayloadTooLargeError(detail=f"Files are limited to {max_size} bytes")
+                # File writes and hashing of large chunks stay off the event loop
+                await run_in_threadpool(self._write, file, digest, chunk)
+            await run_in_threadpool(self._commit, file, digest.hexdigest())
+        except BaseException:
+            # Also on cancellation (client gone), where nothing can be awaited
+            self._discard(file)
+            raise
+        return StoredFile(sha256=digest.hexdigest(), size=size)
+
+    def partial_path(self, upload_id: int) -> Path:
+        return self.root / "uploads" / str(upload_id)
+
+    def create_partial(self, upload_id: int, size: int) -> None:
+        """Create a resumable upload's file at its full size; unwritten parts stay sparse."""
+        path = self.partial_path(upload_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as file:
+            file.truncate(size)
+
+    def discard_partial(self, upload_id: int) -> None:
+        try:
+            os.unlink(self.partial_path(upload_id))
+        except FileNotFoundError:
+            pass
+
+    def _open_partial(self, upload_id: int, offset: int) -> IO[bytes]:
+        try:
+            file = open(self.partial_path(upload_id), "r+b")
+        except FileNotFoundError:
+            raise NotFoundError(detail="Upload not found")
+        file.seek(offset)
+        return file
+
+    async def write_partial(self, upload_id: int, offset: int, chunks: AsyncIterator[bytes], *, size: int) -> int:
+        """Write ``chunks`` into an upload's file from ``offset``; returns the number of bytes written.
+
+        Several chunks of one upload may be written at once, each through its
+        own file handle. Raises BadRequestError for bytes past ``size``.
+        """
+        file = await run_in_threadpool(self._open_partial, upload_id, offset)
+        written = 0
+        try:
+            async for chunk in chunks:
+                written += len(chunk)
+                if offset + written > size:
+                    raise BadRequestError(detail=f"The chunk runs past the end of the {size} byte file")
+                await run_in_threadpool(file.write, chunk)
+        finally:
+            file.close()
+        return written
+
+    def _hash_partial(self, upload_id: int, sha256: Optional[str]) -> StoredFile:
+        path = self.partial_path(upload_id)
+        try:
+            file = open(path, "rb")
+        except FileNotFoundError:
+            raise NotFoundError(detail="Upload not found")
+        with file:
+            digest = hashlib.file_digest(file, "sha256").hexdigest()
+            size = file.tell()
+            # Chunks were written through other handles; this flushes them all
+            os.fsync(file.fileno())
+        if sha256 is not None and digest != sha256:
+            raise BadRequestError(detail=f"SHA-256 mismatch: the received file hashes to {digest}")
+        return StoredFile(sha256=digest, size=size)
+
+    async def hash_partial(self, upload_id: int, *, sha256: Optional[str] = None) -> StoredFile:
+        """Hash a completed upload's file, leaving it in place.
+
+        Raises BadRequestError if it doesn't hash to ``sha256``.
+        """
+        return await run_in_threadpool(self._hash_partial, upload_id, sha256)
+
+    def place_partial(self, upload_id: int, digest: str) -> None:
+        """Move a hashed upload's file into the store under its ``digest``."""
+        self._place(str(self.partial_path(upload_id)), digest)
+
+
+storage = LocalStorage(settings.ATTACHMENT_STORAGE_DIR, max_size=settings.ATTACHMENT_MAX_SIZE)
@@ -1,9 +1,12 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from typing import Any, Callable, Dict, Generic, List, Optional, Sequence, Type, TypeVar, Union
 
+from fastapi.concurrency import run_in_threadpool
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Query, Session
 
+from app.crud.pagination import Page, paginate
 from app.db.session import Base as db_session_base
 from app.models.user import User
 
@@ -12,6 +15,28 @@ CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
 
+async def run_in_session(
+    db: Union[Session, AsyncSession], fn: Callable[..., Any], *args: Any, **kwargs: Any
+) -> Any:
+    """Run a sync CRUD callable without blocking the event loop.
+
+    An AsyncSession runs it through ``run_sync`` on the async driver,
+    a plain Session runs it in the threadpool.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
+
+
+def awaitable(method_name: str) -> Callable[..., Any]:
+    """Build the async twin of a sync CRUD method, e.g. ``aget`` for ``get``."""
+    async def method(self, db: Union[Session, AsyncSession], *args: Any, **kwargs: Any) -> Any:
+        return await run_in_session(db, getattr(self, method_name), *args, **kwargs)
+
+    method.__name__ = f"a{method_name}"
+    return method
+
+
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def __init__(self, model: Type[ModelType]):
         """CRUD object with default methods to Create, Read, Update, Delete (CRUD).
@@ -20,16 +45,97 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             model: A SQLAlchemy model class
         """
         self.model = model
+        self._row_columns: Dict[Type[BaseModel], List[Any]] = {}
+
+    def base_query(self, db: Session) -> Query:
+        """Query every read starts from; subclasses add loader options here."""
+        return db.query(self.model)
+
+    def row_columns(self, schema: Type[BaseModel]) -> List[Any]:
+        """The table columns behind the fields of ``schema``."""
+        columns = self._row_columns.get(schema)
+        if columns is None:
+            table = self.model.__table__
+            columns = [table.c[name] for name in schema.model_fields if name in table.c]
+            self._row_columns[schema] = columns
+        return columns
+
+    def list_query(self, db: Session, schema: Optional[Type[BaseModel]] = None) -> Query:
+        """Query a list read starts from.
+
+        With ``schema``, it selects only the columns ``schema`` needs, and
+        reads return plain dicts instead of ORM objects: no identity map,
+        change tracking or relationship loading for rows that are only
+        serialized.
+        """
+        if schema is None:
+            return self.base_query(db)
+        return db.query(*self.row_columns(schema))
+
+    def load_related_rows(self, db: Session, rows: List[Dict[str, Any]], schema: Type[BaseModel]) -> None:
+        """Row-read counterpart of load_related: fill in schema fields that
+        aren't table columns, for the whole page at once."""
+
+    def load_related(self, db: Session, db_objs: List[ModelType]) -> None:
+        """Batch-load what loader options can't express, for every record a read returns.
+
+        Called with the whole page at once, so an override should cost a
+        constant number of queries however many records there are.
+        """
+
+    def refresh(self, db: Session, db_obj: ModelType) -> ModelType:
+        """Reload a record in place through base_query, so its loader options apply."""
+        db_obj = (
+            self.base_query(db)
+            .populate_existing()
+            .filter(self.model.id == db_obj.id)
+            .one()
+        )
+        self.load_related(db, [db_obj])
+        return db_obj
 
     def get(self, db: Session, id: Any) -> Optional[ModelType]:
         """Get a record by ID."""
-        return db.query(self.model).filter(self.model.id == id).first()
+        db_obj = self.base_query(db).filter(self.model.id == id).first()
+        if db_obj is not None:
+            self.load_related(db, [db_obj])
+        return db_obj
+
+    def get_row(self, db: Session, id: Any, schema: Type[BaseModel]) -> Optional[Dict[str, Any]]:
+        """Get a record by ID as a dict of the fields of ``schema``."""
+        row = self.list_query(db, schema).filter(self.model.id == id).first()
+        if row is None:
+            return None
+        return self.rows_page(db, Page([row]), schema)[0]
 
     def get_multi(
-        self, db: Session, *, skip: int = 0, limit: int = 100
+        self, db: Session, *, skip: int = 0, limit: int = 100, cursor: Optional[str] = None,
+        schema: Optional[Type[BaseModel]] = None,
     ) -> List[ModelType]:
         """Get multiple records with pagination."""
-        return db.query(self.model).offset(skip).limit(limit).all()
+        return self.paginate(self.list_query(db, schema), skip=skip, limit=limit, cursor=cursor, schema=schema)
+
+    def paginate(
+        self, query: Query, *, skip: int = 0, limit: int = 100, cursor: Optional[str] = None,
+        keys: Optional[Sequence[Any]] = None, descending: bool = False,
+        schema: Optional[Type[BaseModel]] = None,
+    ) -> Page:
+        """Page through ``query`` in ``keys`` order (default id), by offset or by keyset cursor.
+
+        Pass the ``schema`` a list_query(schema) was built with to get dicts back.
+        """
+        keys = keys or (self.model.id,)
+        page = paginate(query, keys, skip=skip, limit=limit, cursor=cursor, descending=descending)
+        if schema is not None:
+            return self.rows_page(query.session, page, schema)
+        self.load_related(query.session, page)
+        return page
+
+    def rows_page(self, db: Session, page: Page, schema: Type[BaseModel]) -> Page:
+        """Turn a page of list_query(schema) rows into dicts, via load_related_rows."""
+        rows = [dict(row._mapping) for row in page]
+        self.load_related_rows(db, rows, schema)
+        return Page(rows, next_cursor=page.next_cursor, prev_cursor=page.prev_cursor)
 
     def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
         """Create a new record."""
@@ -69,12 +175,18 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
 
         db.add(db_obj)
         db.commit()
-        db.refresh(db_obj)
-        return db_obj
+        return self.refresh(db, db_obj)
 
     def remove(self, db: Session, *, id: int) -> ModelType:
         """Remove a record."""
-        obj = db.query(self.model).get(id)
+        obj = self.get(db, id=id)
         db.delete(obj)
         db.commit()
-        return obj
\ No newline at end of file
+        return obj
+
+    aget = awaitable("get")
+    aget_row = awaitable("get_row")
+    aget_multi = awaitable("get_multi")
+    acreate = awaitable("create")
+    aupdate = awaitable("update")
+    aremove = awaitable("remove")
\ No newline at end of file
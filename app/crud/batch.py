@@ -0,0 +1,156 @@
+from typing import Any, List
+
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.broker import broker
+from app.core.errors import BadRequestError, ForbiddenError, NotFoundError
+from app.crud.crud_comment import comment
+from app.crud.crud_subtask import subtask
+from app.crud.crud_task import task
+from app.crud.crud_ticket import ticket
+from app.crud.crud_user import user
+from app.db import change_events
+from app.db.activity_writer import INLINE_KEY
+from app.db.session import SessionLocal, engine
+from app.schemas.batch import BatchAction, BatchEntity, BatchMode, BatchOperation, BatchOperationResult, BatchRequest, BatchResult
+from app.schemas.comment import Comment as CommentSchema, CommentCreate, CommentUpdate
+from app.schemas.subtask import Subtask as SubtaskSchema, SubtaskCreate, SubtaskUpdate
+from app.schemas.task import Task as TaskSchema, TaskCreate, TaskUpdate
+from app.schemas.ticket import Ticket as TicketSchema, TicketCreate, TicketUpdate
+from app.schemas.token import TokenUser
+
+# entity -> (crud, response schema, create schema, update schema, name in errors)
+BATCH_ENTITIES = {
+    BatchEntity.TASK: (task, TaskSchema, TaskCreate, TaskUpdate, "Task"),
+    BatchEntity.SUBTASK: (subtask, SubtaskSchema, SubtaskCreate, SubtaskUpdate, "Subtask"),
+    BatchEntity.TICKET: (ticket, TicketSchema, TicketCreate, TicketUpdate, "Ticket"),
+    BatchEntity.COMMENT: (comment, CommentSchema, CommentCreate, CommentUpdate, "Comment"),
+}
+
+
+def _can_edit(entity: BatchEntity, db_obj: Any, current_user: TokenUser) -> bool:
+    """The permission checks of the single-item update and complete endpoints."""
+    if current_user.is_superuser:
+        return True
+    if entity == BatchEntity.TASK:
+        return db_obj.created_by_id == current_user.id or current_user.id in db_obj.assignee_ids
+    if entity == BatchEntity.SUBTASK:
+        return current_user.id in db_obj.assignee_ids
+    if entity == BatchEntity.TICKET:
+        return current_user.id in (db_obj.created_by_id, db_obj.assigned_to_id)
+    return db_obj.user_id == current_user.id
+
+
+def _check_assigned_user(db: Session, assigned_to_id: Any) -> None:
+    if assigned_to_id and not user.get(db, id=assigned_to_id):
+        raise NotFoundError(detail="Assigned user not found")
+
+
+def _apply(db: Session, op: BatchOperation, current_user: TokenUser) -> Any:
+    """Run one operation the way its single-item endpoint does."""
+    crud, _, create_schema, update_schema, name = BATCH_ENTITIES[op.entity]
+    if op.action == BatchAction.CREATE:
+        obj_in = create_schema.model_validate(op.data)
+        if op.entity == BatchEntity.TASK:
+            return task.create_with_owner(db, obj_in=obj_in, created_by_id=current_user.id)
+        if op.entity == BatchEntity.SUBTASK:
+            return subtask.create_with_task(db, obj_in=obj_in, created_by_id=current_user.id)
+        if op.entity == BatchEntity.TICKET:
+            _check_assigned_user(db, obj_in.assigned_to_id)
+            return ticket.create_with_owner(db, obj_in=obj_in, created_by_id=current_user.id)
+        return comment.create_with_owner(db, obj_in=obj_in, created_by_id=current_user.id)
+
+    if op.id is None:
+        raise BadRequestError(detail=f"id is required to {op.action.value} a {op.entity.value}")
+    if op.action == BatchAction.COMPLETE and op.entity == BatchEntity.COMMENT:
+        raise BadRequestError(detail="Comments can't be completed")
+    db_obj = crud.get(db, id=op.id)
+    if not db_obj:
+        raise NotFoundError(detail=f"{name} not found")
+    if not _can_edit(op.entity, db_obj, current_user):
+        raise ForbiddenError(detail="Not enough permissions")
+
+    if op.action == BatchAction.UPDATE:
+        obj_in = update_schema.model_validate(op.data)
+        if op.entity == BatchEntity.TICKET and obj_in.assigned_to_id != db_obj.assigned_to_id:
+            _check_assigned_user(db, obj_in.assigned_to_id)
+        return crud.update(db, db_obj=db_obj, obj_in=obj_in)
+    if op.entity == BatchEntity.TASK:
+        return task.complete_task(db, task_id=op.id, user_id=current_user.id)
+    if op.entity == BatchEntity.SUBTASK:
+        return subtask.complete_subtask(db, subtask_id=op.id, user_id=current_user.id)
+    return ticket.close_ticket(db, ticket_id=op.id)
+
+
+def _failure(exc: Exception) -> BatchOperationResult:
+    if isinstance(exc, HTTPException):
+        return BatchOperationResult(status=exc.status_code, detail=exc.detail)
+    if isinstance(exc, ValidationError):
+        return BatchOperationResult(
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=exc.errors(include_url=False, include_context=False),
+        )
+    return BatchOperationResult(status=status.HTTP_409_CONFLICT, detail="Conflicts with existing data")
+
+
+def run_batch(batch_in: BatchRequest, current_user: TokenUser) -> BatchResult:
+    """Apply ``batch_in.operations`` in order, in one database transaction.
+
+    Each operation goes through the usual crud_* methods on a session joined
+    to that transaction, so their commits only release a SAVEPOINT and the
+    batch commits once at the end. A failed operation is rolled back to its
+    savepoint; in atomic mode the whole batch is then rolled back instead.
+    Change events of the batch reach the change stream after the final commit.
+    """
+    results: List[BatchOperationResult] = []
+    failed_at = None
+    changes: List[Any] = []
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        if connection.dialect.name == "sqlite":
+            # pysqlite only opens its transaction at the first INSERT/UPDATE/
+            # DELETE; a SAVEPOINT before that would run and RELEASE outside it
+            connection.exec_driver_sql("BEGIN")
+        db = SessionLocal(
+            bind=connection,
+            join_transaction_mode="create_savepoint",
+            info={INLINE_KEY: True, change_events.HELD_KEY: changes},
+        )
+        try:
+            for position, op in enumerate(batch_in.operations):
+                schema = BATCH_ENTITIES[op.entity][1]
+                try:
+                    db_obj = _apply(db, op, current_user)
+                    data = schema.model_validate(db_obj, from_attributes=True).model_dump(mode="json")
+                except (HTTPException, ValidationError, IntegrityError) as e:
+                    db.rollback()
+                    results.append(_failure(e))
+                    if batch_in.mode == BatchMode.ATOMIC:
+                        failed_at = position
+                        break
+                else:
+                    results.append(BatchOperationResult(status=status.HTTP_200_OK, data=data))
+        finally:
+            db.close()
+        if failed_at is None:
+            transaction.commit()
+        else:
+            transaction.rollback()
+    if failed_at is None:
+        broker.publish(change_events.encode(changes))
+
+    if failed_at is not None:
+        # Operations before the failed one were undone, the ones after it never ran
+        for position in range(len(batch_in.operations)):
+            if position < failed_at:
+                results[position] = BatchOperationResult(
+                    status=status.HTTP_424_FAILED_DEPENDENCY, detail=f"Rolled back: operation {failed_at} failed"
+                )
+            elif position > failed_at:
+                results.append(BatchOperationResult(
+                    status=status.HTTP_424_FAILED_DEPENDENCY, detail=f"Not run: operation {failed_at} failed"
+                ))
+    return BatchResult(committed=failed_at is None, results=results)
@@ -0,0 +1,289 @@
+import logging
+from collections import defaultdict
+from datetime import datetime
+from itertools import count
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.core.broker import broker
+from app.db import change_events, change_sequence
+from app.models.activity import Activity, ActivityType
+from app.models.project import Project
+from app.models.subtask import Subtask, subtask_assignees
+from app.models.task import Task, TaskPriority, TaskStatus, task_assignees
+from app.models.ticket import Ticket, TicketPriority, TicketStatus
+from app.models.user import User
+from app.schemas.bulk_import import ImportLine, ImportResult, ImportRowError, SubtaskImport, TaskImport, TicketImport
+
+logger = logging.getLogger(__name__)
+
+_line_adapter = TypeAdapter(ImportLine)
+
+
+def _insert_ids(connection: Connection, model: Any, rows: List[Dict[str, Any]]) -> List[int]:
+    """Batched INSERT of ``rows``; returns their new ids in ``rows`` order."""
+    if connection.dialect.name == "sqlite":
+        # SQLAlchemy can't order SQLite's RETURNING rows and would fall back
+        # to one INSERT per row; rowids are handed out in VALUES order, though
+        return sorted(connection.scalars(insert(model).returning(model.id), rows))
+    return connection.scalars(insert(model).returning(model.id, sort_by_parameter_order=True), rows).all()
+
+
+class BulkImport:
+    """One NDJSON import, fed to ``import_chunk`` ``batch_size`` lines at a time.
+
+    Each chunk costs one lookup per referenced table, a few ``executemany``
+    INSERTs and one commit, however many rows it holds. A line that fails
+    validation is reported in ``result.errors`` and skipped; the rest of its
+    chunk is still imported.
+    """
+
+    def __init__(self, *, created_by_id: int, batch_size: int = 1000) -> None:
+        self.created_by_id = created_by_id
+        self.batch_size = batch_size
+        self.result = ImportResult()
+        self.line = 0
+        # ref -> ("task" | "subtask", id) of rows committed by earlier chunks
+        self.refs: Dict[str, Tuple[str, int]] = {}
+        # ids already known to exist, so each is looked up once per import
+        self._known: Dict[Any, Set[int]] = defaultdict(set)
+
+    def _error(self, line: int, detail: Any, ref: Optional[str] = None) -> None:
+        self.result.errors.append(ImportRowError(line=line, ref=ref, detail=detail))
+
+    def _parse(self, lines: Iterable[bytes]) -> List[Tuple[int, Any]]:
+        items = []
+        for raw in lines:
+            self.line += 1
+            if not raw.strip():
+                continue
+            try:
+                items.append((self.line, _line_adapter.validate_json(raw)))
+            except ValidationError as e:
+                self._error(self.line, e.errors(include_url=False, include_context=False))
+        return items
+
+    def _lookup(self, db: Session, model: Any, ids: Set[int]) -> None:
+        """Add the ids of ``model`` that exist out of ``ids`` to the known set, in one query."""
+        known = self._known[model]
+        missing = ids - known
+        if missing:
+            known.update(db.scalars(select(model.id).where(model.id.in_(missing))))
+
+    def _unknown(self, model: Any, ids: Iterable[Optional[int]]) -> List[int]:
+        known = self._known[model]
+        return [id_ for id_ in ids if id_ is not None and id_ not in known]
+
+    def _check(self, item: Any, chunk_refs: Dict[str, str]) -> Optional[str]:
+        """Why ``item`` can't be imported, or None if it can."""
+        def ref_type(ref: str) -> Optional[str]:
+            if ref in chunk_refs:
+                return chunk_refs[ref]
+            return self.refs[ref][0] if ref in self.refs else None
+
+        ref = getattr(item, "ref", None)
+        if ref is not None and ref_type(ref) is not None:
+            return f"Duplicate ref: {ref}"
+        if isinstance(item, TicketImport):
+            users = self._unknown(User, [item.assigned_to_id])
+        else:
+            users = self._unknown(User, item.assignee_ids or [])
+        if users:
+            return f"Unknown users: {users}"
+        if isinstance(item, TaskImport) and self._unknown(Project, [item.project_id]):
+            return f"Unknown project: {item.project_id}"
+        if isinstance(item, SubtaskImport):
+            if (item.task_id is None) == (item.task_ref is None):
+                return "Exactly one of task_id and task_ref is required"
+            if self._unknown(Task, [item.task_id]):
+                return f"Unknown task: {item.task_id}"
+            if item.task_ref is not None and ref_type(item.task_ref) != "task":
+                return f"Unknown task_ref: {item.task_ref}"
+            if item.parent_id is not None and item.parent_ref is not None:
+                return "Only one of parent_id and parent_ref can be set"
+            if self._unknown(Subtask, [item.parent_id]):
+                return f"Unknown parent: {item.parent_id}"
+            if item.parent_ref is not None and ref_type(item.parent_ref) != "subtask":
+                return f"Unknown parent_ref: {item.parent_ref}"
+        return None
+
+    def import_chunk(self, db: Session, lines: List[bytes]) -> None:
+        """Validate and insert one chunk of NDJSON lines in one transaction."""
+        errors = self.result.errors
+        first_error = len(errors)
+        items = self._parse(lines)
+
+        # Everything the chunk points at, looked up with one query per table
+        users, projects, tasks, subtasks = set(), set(), set(), set()
+        for _, item in items:
+            if isinstance(item, TicketImport):
+                users.add(item.assigned_to_id)
+                continue
+            users.update(item.assignee_ids or [])
+            if isinstance(item, TaskImport):
+                projects.add(item.project_id)
+            else:
+                tasks.add(item.task_id)
+                subtasks.add(item.parent_id)
+        for model, ids in ((User, users), (Project, projects), (Task, tasks), (Subtask, subtasks)):
+            self._lookup(db, model, ids - {None})
+
+        # refs may only point at earlier lines, so one pass in line order
+        # resolves them; a subtask's depth orders parents before children
+        chunk_refs: Dict[str, str] = {}
+        depths: Dict[int, int] = {}
+        ref_depths: Dict[str, int] = {}
+        accepted: Dict[type, List[Tuple[int, Any]]] = defaultdict(list)
+        for line, item in items:
+            problem = self._check(item, chunk_refs)
+            if problem is not None:
+                self._error(line, problem, getattr(item, "ref", None))
+                continue
+            accepted[type(item)].append((line, item))
+            if isinstance(item, SubtaskImport):
+                depths[line] = ref_depths.get(item.parent_ref, -1) + 1
+                if item.ref is not None:
+                    ref_depths[item.ref] = depths[line]
+            if getattr(item, "ref", None) is not None:
+                chunk_refs[item.ref] = item.type
+
+        try:
+            new_refs = self._insert(db, accepted, depths)
+            db.commit()
+        except Exception:
+            db.rollback()
+            logger.exception("Bulk import of lines up to %d failed", self.line)
+            for rows in accepted.values():
+                for line, item in rows:
+                    self._error(line, "Not imported: writing its batch failed", getattr(item, "ref", None))
+        else:
+            self.refs.update(new_refs)
+            self.result.tasks += len(accepted[TaskImport])
+            self.result.subtasks += len(accepted[SubtaskImport])
+            self.result.tickets += len(accepted[TicketImport])
+        errors[first_error:] = sorted(errors[first_error:], key=lambda error: error.line)
+
+    def _insert(
+        self, db: Session, accepted: Dict[type, List[Tuple[int, Any]]], depths: Dict[int, int]
+    ) -> Dict[str, Tuple[str, int]]:
+        """Batched INSERTs for the chunk's valid rows; returns the refs they define."""
+        # Core INSERTs on the session's connection: no ORM bookkeeping per row
+        connection = db.connection()
+        new_refs: Dict[str, Tuple[str, int]] = {}
+        activities: List[Dict[str, Any]] = []
+        now = datetime.utcnow()
+        # The flush listener never sees these rows: number them here
+        total = len(accepted[TaskImport]) + len(accepted[SubtaskImport]) + len(accepted[TicketImport])
+        seqs = count(change_sequence.allocate(connection, total)) if total else None
+
+        def inserted(model: Any, rows: List[Dict[str, Any]]) -> List[int]:
+            ids = _insert_ids(connection, model, rows)
+            # The change stream's flush hook misses them too: report them as created
+            change_events.record_rows(db, model, ({**row, "id": id_} for row, id_ in zip(rows, ids)), "created")
+            return ids
+
+        def insert_unreferenced(model: Any, rows: List[Dict[str, Any]]) -> None:
+            # Nothing refers to these rows: fetch their ids only for a subscriber
+            if broker.active:
+                inserted(model, rows)
+            else:
+                connection.execute(insert(model), rows)
+
+        def ref_id(ref: str) -> int:
+            return (new_refs.get(ref) or self.refs[ref])[1]
+
+        def created(items: List[Any], ids: List[int], kind: str) -> None:
+            for item, id_ in zip(items, ids):
+                if item.ref is not None:
+                    new_refs[item.ref] = (kind, id_)
+                activities.append({
+                    "user_id": self.created_by_id,
+                    "action_type": ActivityType.CREATED,
+                    "task_id": id_ if kind == "task" else None,
+                    "subtask_id": id_ if kind == "subtask" else None,
+                    "old_value": None,
+                    "new_value": {"title": item.title, "description": item.description},
+                    "created_at": now,
+                })
+
+        items = [item for _, item in accepted[TaskImport]]
+        if items:
+            ids = inserted(
+                Task,
+                [
+                    {
+                        "title": item.title,
+                        "description": item.description,
+                        "status": item.status or TaskStatus.TODO,
+                        "priority": item.priority or TaskPriority.MEDIUM,
+                        "due_date": item.due_date,
+                        "project_id": item.project_id,
+                        "created_by_id": self.created_by_id,
+                        "change_seq": next(seqs),
+                    }
+                    for item in items
+                ],
+            )
+            created(items, ids, "task")
+            assignees = [
+                {"task_id": id_, "user_id": user_id}
+                for item, id_ in zip(items, ids)
+                for user_id in dict.fromkeys(item.assignee_ids or [])
+            ]
+            if assignees:
+                connection.execute(insert(task_assignees), assignees)
+
+        # One INSERT per nesting level, so a parent_ref always resolves
+        levels: Dict[int, List[Any]] = defaultdict(list)
+        for line, item in accepted[SubtaskImport]:
+            levels[depths[line]].append(item)
+        assignees = []
+        for depth in sorted(levels):
+            items = levels[depth]
+            ids = inserted(
+                Subtask,
+                [
+                    {
+                        "title": item.title,
+                        "description": item.description,
+                        "status": item.status or TaskStatus.TODO,
+                        "priority": item.priority or TaskPriority.MEDIUM,
+                        "due_date": item.due_date,
+                        "task_id": item.task_id if item.task_ref is None else ref_id(item.task_ref),
+                        "parent_id": item.parent_id if item.parent_ref is None else ref_id(item.parent_ref),
+                        "change_seq": next(seqs),
+                    }
+                    for item in items
+                ],
+            )
+            created(items, ids, "subtask")
+            assignees.extend(
+                {"subtask_id": id_, "user_id": user_id}
+                for item, id_ in zip(items, ids)
+                for user_id in dict.fromkeys(item.assignee_ids or [])
+            )
+        if assignees:
+            connection.execute(insert(subtask_assignees), assignees)
+
+        items = [item for _, item in accepted[TicketImport]]
+        if items:
+            insert_unreferenced(Ticket, [
+                {
+                    "title": item.title,
+                    "description": item.description,
+                    "status": item.status or TicketStatus.OPEN,
+                    "priority": item.priority or TicketPriority.MEDIUM,
+                    "created_by_id": self.created_by_id,
+                    "assigned_to_id": item.assigned_to_id,
+                    "change_seq": next(seqs),
+                }
+                for item in items
+            ])
+
+        if activities:
+            insert_unreferenced(Activity, activities)
+        return new_refs
@@ -1,7 +1,19 @@
-from sqlalchemy.orm import Session
-from app.models.activity import Activity
+import json
+import zlib
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Type
+from pydantic import BaseModel
+from sqlalchemy import or_, select, update
+from sqlalchemy.orm import Query, Session
+from app.models.activity import Activity, ActivityArchive, ActivityArchiveLock, ActivityType
+from app.models.subtask import Subtask
+from app.models.task import Task
 from app.schemas.activity import ActivityCreate
-from app.crud.base import CRUDBase
+from app.crud.base import CRUDBase, awaitable
+from app.crud.pagination import Page
+from app.db import change_events
+from app.db.activity_writer import INLINE_KEY, activity_writer
 
 
 class CRUDActivity(CRUDBase[Activity, ActivityCreate, None]):
@@ -16,6 +28,12 @@ class CRUDActivity(CRUDBase[Activity, ActivityCreate, None]):
         old_value: dict = None,
         new_value: dict = None,
     ) -> Activity:
+        """Add an activity entry to the caller's unit of work.
+
+        Not committed here: the caller's own commit writes it together with
+        the change it describes, or with ACTIVITY_BUFFER_ENABLED queues it
+        for the background writer.
+        """
         db_obj = Activity(
             user_id=user_id,
             action_type=action_type,
@@ -23,11 +41,235 @@ class CRUDActivity(CRUDBase[Activity, ActivityCreate, None]):
             subtask_id=subtask_id,
             old_value=old_value,
             new_value=new_value,
+            created_at=datetime.utcnow(),
         )
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        if activity_writer is not None and not db.info.get(INLINE_KEY):
+            activity_writer.add(db, {
+                column.key: getattr(db_obj, column.key)
+                for column in Activity.__table__.columns
+                if column.key != "id"
+            })
+            # Never flushed by this session, so the change stream needs telling
+            change_events.record(db, db_obj, "created")
+        else:
+            db.add(db_obj)
         return db_obj
 
+    def feed(
+        self,
+        query: Query,
+        *,
+        action_types: Optional[Sequence[ActivityType]] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        schema: Optional[Type[BaseModel]] = None,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> Page:
+        """Page through ``query`` newest first, optionally narrowed to
+        ``action_types`` and to ``since <= created_at < until``."""
+        if action_types:
+            query = query.filter(Activity.action_type.in_(action_types))
+        if since is not None:
+            query = query.filter(Activity.created_at >= since)
+        if until is not None:
+            query = query.filter(Activity.created_at < until)
+        return self.paginate(
+            query, keys=(Activity.created_at, Activity.id), skip=skip, limit=limit, cursor=cursor,
+            descending=True, schema=schema,
+        )
+
+    def get_multi_by_task(
+        self, db: Session, *, task_id: int, schema: Optional[Type[BaseModel]] = None, **filters: Any
+    ) -> Page:
+        return self.feed(self.list_query(db, schema).filter(Activity.task_id == task_id), schema=schema, **filters)
+
+    def get_multi_by_subtask(
+        self, db: Session, *, subtask_id: int, schema: Optional[Type[BaseModel]] = None, **filters: Any
+    ) -> Page:
+        return self.feed(self.list_query(db, schema).filter(Activity.subtask_id == subtask_id), schema=schema, **filters)
+
+    def get_multi_by_project(
+        self, db: Session, *, project_id: int, schema: Optional[Type[BaseModel]] = None, **filters: Any
+    ) -> Page:
+        """Entries of the project's tasks and of their subtasks, in one query."""
+        task_ids = select(Task.id).where(Task.project_id == project_id)
+        subtask_ids = select(Subtask.id).where(Subtask.task_id.in_(task_ids))
+        query = self.list_query(db, schema).filter(
+            or_(Activity.task_id.in_(task_ids), Activity.subtask_id.in_(subtask_ids))
+        )
+        return self.feed(query, schema=schema, **filters)
+
+    def get_multi_by_user(
+        self, db: Session, *, user_id: int, schema: Optional[Type[BaseModel]] = None, **filters: Any
+    ) -> Page:
+        return self.feed(self.list_query(db, schema).filter(Activity.user_id == user_id), schema=schema, **filters)
+
+    def archive(self, db: Session, *, before: datetime, batch_size: int = 1000) -> int:
+        """Move entries created before ``before`` into activity_archive.
+
+        Entries are grouped into one compressed chunk per (month, task,
+        subtask); entries for a month that already has a chunk are merged into
+        it, so repeated runs don't fragment the archive. Each batch is moved
+        in its own transaction. Returns the number of entries moved.
+
+        Every worker may run the archiver: each batch first locks the one row
+        of activity_archive_lock, so a concurrent run waits, then reads what
+        is left rather than the entries just moved, and never adds a second
+        chunk for the same group.
+        """
+        moved = 0
+        while True:
+            db.execute(
+                update(ActivityArchiveLock).where(ActivityArchiveLock.id == 1).values(locked_at=datetime.utcnow())
+            )
+            rows = (
+                db.query(Activity)
+                .filter(Activity.created_at < before)
+                .order_by(Activity.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not rows:
+                db.commit()
+                return moved
+            groups: Dict[tuple, List[Dict[str, Any]]] = defaultdict(list)
+            for row in rows:
+                groups[(f"{row.created_at:%Y-%m}", row.task_id, row.subtask_id)].append(_archive_entry(row))
+            for (period, task_id, subtask_id), entries in groups.items():
+                chunk = (
+                    db.query(ActivityArchive)
+                    .filter_by(period=period, task_id=task_id, subtask_id=subtask_id)
+                    .first()
+                )
+                if chunk is None:
+                    chunk = ActivityArchive(period=period, task_id=task_id, subtask_id=subtask_id)
+                    db.add(chunk)
+                else:
+                    entries = _decompress(chunk.payload) + entries
+                entries.sort(key=lambda entry: (entry["created_at"], entry["id"]))
+                chunk.payload = _compress(entries)
+                chunk.row_count = len(entries)
+                chunk.first_at = datetime.fromisoformat(entries[0]["created_at"])
+                chunk.last_at = datetime.fromisoformat(entries[-1]["created_at"])
+            db.query(Activity).filter(Activity.id.in_([row.id for row in rows])).delete(synchronize_session=False)
+            db.commit()
+            moved += len(rows)
+
+    def archive_chunks(
+        self,
+        db: Session,
+        *,
+        task_id: Optional[int] = None,
+        subtask_id: Optional[int] = None,
+        project_id: Optional[int] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> Query:
+        """Archive chunks that may hold entries of a task, a subtask or a
+        project's tasks and subtasks (default: all), oldest month first."""
+        query = db.query(ActivityArchive)
+        if task_id is not None:
+            query = query.filter(ActivityArchive.task_id == task_id)
+        if subtask_id is not None:
+            query = query.filter(ActivityArchive.subtask_id == subtask_id)
+        if project_id is not None:
+            task_ids = select(Task.id).where(Task.project_id == project_id)
+            subtask_ids = select(Subtask.id).where(Subtask.task_id.in_(task_ids))
+            query = query.filter(
+                or_(ActivityArchive.task_id.in_(task_ids), ActivityArchive.subtask_id.in_(subtask_ids))
+            )
+        if since is not None:
+            query = query.filter(ActivityArchive.last_at >= since)
+        if until is not None:
+            query = query.filter(ActivityArchive.first_at < until)
+        return query.order_by(ActivityArchive.period, ActivityArchive.id)
+
+    def archived_entries(
+        self,
+        chunks: Iterable[ActivityArchive],
+        *,
+        user_id: Optional[int] = None,
+        action_types: Optional[Sequence[ActivityType]] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """The entries of ``chunks``, one chunk in memory at a time, narrowed
+        like ``feed`` and optionally to ``user_id``."""
+        types = {ActivityType(action_type).value for action_type in action_types or ()}
+        since, until = _utc(since), _utc(until)
+        for chunk in chunks:
+            for entry in _decompress(chunk.payload):
+                if user_id is not None and entry["user_id"] != user_id:
+                    continue
+                if types and entry["action_type"] not in types:
+                    continue
+                created_at = _utc(datetime.fromisoformat(entry["created_at"]))
+                if (since is not None and created_at < since) or (until is not None and created_at >= until):
+                    continue
+                yield entry
+
+    def get_archived(
+        self,
+        db: Session,
+        *,
+        task_id: Optional[int] = None,
+        subtask_id: Optional[int] = None,
+        project_id: Optional[int] = None,
+        user_id: Optional[int] = None,
+        action_types: Optional[Sequence[ActivityType]] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> List[Dict[str, Any]]:
+        """Archived entries of a task, subtask, project or user, newest first.
+
+        A user's entries are spread over every chunk: narrow those reads
+        with ``since``/``until``, which skip whole months.
+        """
+        chunks = self.archive_chunks(
+            db, task_id=task_id, subtask_id=subtask_id, project_id=project_id, since=since, until=until,
+        )
+        entries = list(self.archived_entries(
+            chunks.yield_per(100), user_id=user_id, action_types=action_types, since=since, until=until,
+        ))
+        entries.sort(key=lambda entry: (entry["created_at"], entry["id"]), reverse=True)
+        return entries
+
+    alog = awaitable("log")
+    aget_multi_by_task = awaitable("get_multi_by_task")
+    aget_multi_by_subtask = awaitable("get_multi_by_subtask")
+    aget_multi_by_project = awaitable("get_multi_by_project")
+    aget_multi_by_user = awaitable("get_multi_by_user")
+    aget_archived = awaitable("get_archived")
+
+
+def _archive_entry(row: Activity) -> Dict[str, Any]:
+    return {
+        "id": row.id,
+        "user_id": row.user_id,
+        "created_at": row.created_at.isoformat(),
+        "task_id": row.task_id,
+        "subtask_id": row.subtask_id,
+        "action_type": row.action_type.value,
+        "old_value": row.old_value,
+        "new_value": row.new_value,
+    }
+
+
+def _utc(value: Optional[datetime]) -> Optional[datetime]:
+    """``value`` as an aware UTC datetime; naive ones, as stored by SQLite, are UTC already."""
+    if value is None or value.tzinfo is not None:
+        return value
+    return value.replace(tzinfo=timezone.utc)
+
+
+def _compress(entries: List[Dict[str, Any]]) -> bytes:
+    return zlib.compress(json.dumps(entries, separators=(",", ":"), default=str).encode(), 9)
+
+
+def _decompress(payload: bytes) -> List[Dict[str, Any]]:
+    return json.loads(zlib.decompress(payload))
+
 
 activity = CRUDActivity(Activity)
\ No newline at end of file
@@ -1,15 +1,25 @@
-from typing import List, Optional
+from typing import List, Optional, Type
+from pydantic import BaseModel
 from sqlalchemy.orm import Session
-from app.crud.base import CRUDBase
+from app.crud.base import CRUDBase, awaitable
 from app.models.attachment import Attachment
-from app.schemas.attachment import AttachmentCreate, AttachmentUpdate
+from app.core.storage import StoredFile
+from app.schemas.attachment import AttachmentBase, AttachmentCreate, AttachmentUpdate
 from app.crud.crud_activity import activity
 from app.models.activity import ActivityType
 
 class CRUDAttachment(CRUDBase[Attachment, AttachmentCreate, AttachmentUpdate]):
     def create_with_owner(
-        self, db: Session, *, obj_in: AttachmentCreate, uploaded_by_id: int
+        self,
+        db: Session,
+        *,
+        obj_in: AttachmentBase,
+        uploaded_by_id: int,
+        stored: Optional[StoredFile] = None,
+        content_type: Optional[str] = None,
     ) -> Attachment:
+        """Create an attachment: a link (AttachmentCreate) or, with ``stored``,
+        a file already saved to the attachment storage."""
         db_obj = Attachment(
             filename=obj_in.filename,
             file_url=obj_in.file_url,
@@ -17,39 +27,49 @@ class CRUDAttachment(CRUDBase[Attachment, AttachmentCreate, AttachmentUpdate]):
             subtask_id=obj_in.subtask_id,
             uploaded_by_id=uploaded_by_id,
         )
+        new_value = {"filename": obj_in.filename, "file_url": obj_in.file_url}
+        if stored is not None:
+            db_obj.size = stored.size
+            db_obj.sha256 = stored.sha256
+            db_obj.content_type = content_type
+            new_value.update(size=stored.size, sha256=stored.sha256)
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
         activity.log(
             db,
             user_id=uploaded_by_id,
             action_type=ActivityType.CREATED,
             task_id=obj_in.task_id,
-            new_value={"filename": obj_in.filename, "file_url": obj_in.file_url},
+            new_value=new_value,
         )
+        db.commit()
+        db.refresh(db_obj)
         return db_obj
 
     def get_multi_by_task(
-        self, db: Session, *, task_id: int, skip: int = 0, limit: int = 100
+        self, db: Session, *, task_id: int, skip: int = 0, limit: int = 100,
+        cursor: Optional[str] = None,
+        schema: Optional[Type[BaseModel]] = None,
     ) -> List[Attachment]:
-        return (
-            db.query(self.model)
+        query = (
+            self.list_query(db, schema)
             .filter(Attachment.task_id == task_id)
-            .offset(skip)
-            .limit(limit)
-            .all()
         )
+        return self.paginate(query, skip=skip, limit=limit, cursor=cursor, schema=schema)
 
     def get_multi_by_subtask(
-        self, db: Session, *, subtask_id: int, skip: int = 0, limit: int = 100
+        self, db: Session, *, subtask_id: int, skip: int = 0, limit: int = 100,
+        cursor: Optional[str] = None,
+        schema: Optional[Type[BaseModel]] = None,
     ) -> List[Attachment]:
-        return (
-            db.query(self.model)
+        query = (
+            self.list_query(db, schema)
             .filter(Attachment.subtask_id == subtask_id)
-            .offset(skip)
-            .limit(limit)
-            .all()
         )
+        return self.paginate(query, skip=skip, limit=limit, cursor=cursor, schema=schema)
+
+    acreate_with_owner = awaitable("create_with_owner")
+    aget_multi_by_task = awaitable("get_multi_by_task")
+    aget_multi_by_subtask = awaitable("get_multi_by_subtask")
 
 
 attachment = CRUDAttachment(Attachment)
\ No newline at end of file
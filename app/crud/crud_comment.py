@@ -1,6 +1,8 @@
-from typing import List
+from typing import List, Optional, Type
+from pydantic import BaseModel
 from sqlalchemy.orm import Session
-from app.crud.base import CRUDBase
+from app.crud.base import CRUDBase, awaitable
+from app.crud.search import full_text_search
 from app.models.comment import Comment
 from app.schemas.comment import CommentCreate, CommentUpdate
 from app.crud.crud_activity import activity
@@ -15,8 +17,6 @@ class CRUDComment(CRUDBase[Comment, CommentCreate, CommentUpdate]):
             user_id=created_by_id,
         )
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
         activity.log(
             db,
             user_id=created_by_id,
@@ -24,25 +24,32 @@ class CRUDComment(CRUDBase[Comment, CommentCreate, CommentUpdate]):
             task_id=obj_in.task_id,
             new_value={"content": obj_in.content},
         )
+        db.commit()
+        db.refresh(db_obj)
         return db_obj
 
-    def get_multi_by_ticket(self, db: Session, *, ticket_id: int, skip: int = 0, limit: int = 100) -> List[Comment]:
-        return (
-            db.query(self.model)
+    def get_multi_by_ticket(self, db: Session, *, ticket_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, schema: Optional[Type[BaseModel]] = None) -> List[Comment]:
+        query = (
+            self.list_query(db, schema)
             .filter(Comment.ticket_id == ticket_id)
-            .offset(skip)
-            .limit(limit)
-            .all()
         )
+        return self.paginate(query, skip=skip, limit=limit, cursor=cursor, schema=schema)
 
-    def get_multi_by_task(self, db: Session, *, task_id: int, skip: int = 0, limit: int = 100) -> List[Comment]:
-        return (
-            db.query(self.model)
+    def get_multi_by_task(self, db: Session, *, task_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, schema: Optional[Type[BaseModel]] = None) -> List[Comment]:
+        query = (
+            self.list_query(db, schema)
             .filter(Comment.task_id == task_id)
-            .offset(skip)
-            .limit(limit)
-            .all()
         )
+        return self.paginate(query, skip=skip, limit=limit, cursor=cursor, schema=schema)
+
+    def search_comments(self, db: Session, *, query: str, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Comment]:
+        """Full-text search over comment content, best match first."""
+        return full_text_search(self.base_query(db), Comment, query, skip=skip, limit=limit, cursor=cursor)
+
+    acreate_with_owner = awaitable("create_with_owner")
+    aget_multi_by_ticket = awaitable("get_multi_by_ticket")
+    aget_multi_by_task = awaitable("get_multi_by_task")
+    asearch_comments = awaitable("search_comments")
 
 
 comment = CRUDComment(Comment)
\ No newline at end of file
@@ -1,8 +1,9 @@
-from typing import List
+from typing import List, Optional, Type
 
+from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
-from app.crud.base import CRUDBase
+from app.crud.base import CRUDBase, awaitable
 
 from app.models.project import Project
 
@@ -37,15 +38,18 @@ class CRUDProject(CRUDBase[Project, ProjectCreate, ProjectUpdate]):
         return db_obj
 
     def get_multi_by_owner(
-        self, db: Session, *, created_by_id: int, skip: int = 0, limit: int = 100
+        self, db: Session, *, created_by_id: int, skip: int = 0, limit: int = 100,
+        cursor: Optional[str] = None,
+        schema: Optional[Type[BaseModel]] = None,
     ) -> List[Project]:
-        return (
-            db.query(self.model)
+        query = (
+            self.list_query(db, schema)
             .filter(Project.created_by_id == created_by_id)
-            .offset(skip)
-            .limit(limit)
-            .all()
         )
+        return self.paginate(query, skip=skip, limit=limit, cursor=cursor, schema=schema)
+
+    acreate_with_owner = awaitable("create_with_owner")
+    aget_multi_by_owner = awaitable("get_multi_by_owner")
 
 
 project = CRUDProject(Project)
\ No newline at end of file
@@ -2,7 +2,7 @@ from typing import List, Optional
 
 from sqlalchemy.orm import Session
 
-from app.crud.base import CRUDBase
+from app.crud.base import CRUDBase, awaitable
 from app.models.project_member import ProjectMember, ProjectRole
 from app.schemas.project_member import ProjectMemberCreate, ProjectMemberUpdate
 from app.crud.crud_activity import activity
@@ -24,15 +24,14 @@ class CRUDProjectMember(CRUDBase[ProjectMember, ProjectMemberCreate, ProjectMemb
         return db_obj
 
     def get_members(
-        self, db: Session, *, project_id: int, skip: int = 0, limit: int = 100
+        self, db: Session, *, project_id: int, skip: int = 0, limit: int = 100,
+        cursor: Optional[str] = None,
     ) -> List[ProjectMember]:
-        return (
+        query = (
             db.query(self.model)
             .filter(ProjectMember.project_id == project_id)
-            .offset(skip)
-            .limit(limit)
-            .all()
         )
+        return self.paginate(query, skip=skip, limit=limit, cursor=cursor)
 
     def get_member(
         self, db: Session, *, project_id: int, user_id: int
@@ -48,5 +47,10 @@ class CRUDProjectMember(CRUDBase[ProjectMember, ProjectMemberCreate, ProjectMemb
     def get_by_project(self, db: Session, project_id: int) -> List[ProjectMember]:
         return db.query(ProjectMember).filter(ProjectMember.project_id == project_id).all()
 
+    aadd_member = awaitable("add_member")
+    aget_members = awaitable("get_members")
+    aget_member = awaitable("get_member")
+    aget_by_project = awaitable("get_by_project")
+
 
 project_member = CRUDProjectMember(ProjectMember)
\ No newline at end of file
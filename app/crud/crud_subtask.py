@@ -1,11 +1,14 @@
-from typing import List, Optional
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Type
 from datetime import datetime
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from pydantic import BaseModel
+from sqlalchemy.orm import Query, Session, lazyload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy import or_, select
 
 from app.core.errors import NotFoundError
-from app.crud.base import CRUDBase
-from app.models.subtask import Subtask
+from app.crud.base import CRUDBase, awaitable
+from app.models.subtask import Subtask, subtask_assignees
 from app.models.user import User
 from app.schemas.subtask import SubtaskCreate, SubtaskUpdate
 from app.models.task import TaskStatus
@@ -13,6 +16,52 @@ from app.crud.crud_activity import activity
 from app.models.activity import ActivityType
 
 class CRUDSubtask(CRUDBase[Subtask, SubtaskCreate, SubtaskUpdate]):
+    def base_query(self, db: Session) -> Query:
+        # children are attached by load_related, not one selectin per tree level
+        return db.query(self.model).options(lazyload(Subtask.children))
+
+    def load_related(self, db: Session, db_objs: List[Subtask]) -> None:
+        """Attach the whole children tree of ``db_objs``, which the Subtask schema serializes.
+
+        All descendants come from one recursive query (plus one selectin for
+        their assignees), however deep the trees are.
+        """
+        if not db_objs:
+            return
+        tree = (
+            select(Subtask.id)
+            .where(Subtask.parent_id.in_([obj.id for obj in db_objs]))
+            .cte("subtask_tree", recursive=True)
+        )
+        # UNION, not UNION ALL: stops on a (broken) parent_id cycle
+        tree = tree.union(select(Subtask.id).join(tree, Subtask.parent_id == tree.c.id))
+        descendants = (
+            self.base_query(db)
+            .filter(Subtask.id.in_(select(tree.c.id)))
+            .order_by(Subtask.id)
+            .all()
+        )
+        children = defaultdict(list)
+        for node in descendants:
+            children[node.parent_id].append(node)
+        for node in [*db_objs, *descendants]:
+            set_committed_value(node, "children", children[node.id])
+
+    def load_related_rows(self, db: Session, rows: List[Dict[str, Any]], schema: Type[BaseModel]) -> None:
+        """assignee_ids, one query for the whole page; row reads have no children tree."""
+        if not rows or "assignee_ids" not in schema.model_fields:
+            return
+        by_subtask = {row["id"]: row for row in rows}
+        for row in rows:
+            row["assignee_ids"] = []
+        links = db.execute(
+            select(subtask_assignees.c.subtask_id, subtask_assignees.c.user_id)
+            .where(subtask_assignees.c.subtask_id.in_(by_subtask))
+            .order_by(subtask_assignees.c.subtask_id, subtask_assignees.c.user_id)
+        )
+        for subtask_id, user_id in links:
+            by_subtask[subtask_id]["assignee_ids"].append(user_id)
+
     def create_with_task(self, db: Session, *, obj_in: SubtaskCreate, created_by_id: int) -> Subtask:
         db_obj = Subtask(
             title=obj_in.title,
@@ -30,8 +79,7 @@ class CRUDSubtask(CRUDBase[Subtask, SubtaskCreate, SubtaskUpdate]):
             db_obj.assignees = users
 
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        db.flush()  # assigns db_obj.id for the activity entry
         activity.log(
             db,
             user_id=created_by_id,
@@ -39,46 +87,49 @@ class CRUDSubtask(CRUDBase[Subtask, SubtaskCreate, SubtaskUpdate]):
             subtask_id=db_obj.id,
             new_value={"title": db_obj.title, "description": db_obj.description},
         )
+        db.commit()
+        db.refresh(db_obj)
         return db_obj
 
-    def get_multi_by_task(self, db: Session, *, task_id: int, skip: int = 0, limit: int = 100) -> List[Subtask]:
-        return (
-            db.query(self.model)
+    def get_multi_by_task(self, db: Session, *, task_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Subtask]:
+        query = (
+            self.base_query(db)
             .filter(Subtask.task_id == task_id)
-            .offset(skip)
-            .limit(limit)
-            .all()
         )
+        return self.paginate(query, skip=skip, limit=limit, cursor=cursor)
 
     def get_multi_by_assignee(
-        self, db: Session, *, user_id: int, skip: int = 0, limit: int = 100
+        self, db: Session, *, user_id: int, skip: int = 0, limit: int = 100,
+        cursor: Optional[str] = None,
     ) -> List[Subtask]:
-        return (
-            db.query(self.model)
+        query = (
+            self.base_query(db)
             .join(Subtask.assignees)
             .filter(User.id == user_id)
-            .offset(skip)
-            .limit(limit)
-            .all()
         )
+        return self.paginate(query, skip=skip, limit=limit, cursor=cursor)
 
-    def complete_subtask(self, db: Session, *, subtask_id: int) -> Optional[Subtask]:
+    def complete_subtask(self, db: Session, *, subtask_id: int, user_id: int) -> Optional[Subtask]:
         subtask = self.get(db, id=subtask_id)
         if not subtask:
             return None
         subtask.status = TaskStatus.DONE
         subtask.completed_at = datetime.now()
         db.add(subtask)
-        db.commit()
-        db.refresh(subtask)
         activity.log(
             db,
-            user_id=subtask.assignees,
+            user_id=user_id,
             action_type=ActivityType.STATUS_CHANGED,
             subtask_id=subtask.id,
             new_value={"title": subtask.title, "description": subtask.description, "status": subtask.status},
         )
-        return subtask
+        db.commit()
+        return self.refresh(db, subtask)
+
+    acreate_with_task = awaitable("create_with_task")
+    aget_multi_by_task = awaitable("get_multi_by_task")
+    aget_multi_by_assignee = awaitable("get_multi_by_assignee")
+    acomplete_subtask = awaitable("complete_subtask")
 
 
 subtask = CRUDSubtask(Subtask)
\ No newline at end of file
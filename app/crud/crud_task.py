@@ -1,19 +1,73 @@
-from typing import Optional, List
+from typing import Any, Dict, Optional, List, Type, get_args
 from datetime import datetime
 
+from pydantic import BaseModel
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
 
 from app.core.errors import NotFoundError
-from app.crud.base import CRUDBase
-from app.models.task import Task, TaskStatus
+from app.crud.base import CRUDBase, awaitable
+from app.crud.pagination import Page
+from app.crud.search import full_text_search
+from app.models.task import Task, TaskStatus, task_assignees
 from app.models.user import User
 from app.schemas.task import TaskCreate, TaskUpdate
 from app.crud.crud_activity import activity
+from app.crud.crud_attachment import attachment
+from app.crud.crud_comment import comment
+from app.crud.crud_subtask import subtask
+from app.crud.crud_time_log import time_log
 from app.models.activity import ActivityType
+from app.models.attachment import Attachment
+from app.models.comment import Comment
+from app.models.subtask import Subtask
+from app.models.time_log import TimeLog
+
+# Row fields a task list can expand into (see TASK_EXPANSIONS), with the
+# foreign key to the task; subtasks stay ORM objects for their children tree
+EXPANSIONS = {
+    "subtasks": (subtask, Subtask.task_id, False),
+    "comments": (comment, Comment.task_id, True),
+    "attachments": (attachment, Attachment.task_id, True),
+    "time_logs": (time_log, TimeLog.task_id, True),
+}
 
 
 class CRUDTask(CRUDBase[Task, TaskCreate, TaskUpdate]):
+    def load_related_rows(self, db: Session, rows: List[Dict[str, Any]], schema: Type[BaseModel]) -> None:
+        """assignee_ids and the expanded lists ``schema`` asks for, one query each for the whole page."""
+        if not rows:
+            return
+        fields = schema.model_fields
+        by_task = {row["id"]: row for row in rows}
+        if "assignee_ids" in fields:
+            for row in rows:
+                row["assignee_ids"] = []
+            # task_assignees alone, no users join
+            links = db.execute(
+                select(task_assignees.c.task_id, task_assignees.c.user_id)
+                .where(task_assignees.c.task_id.in_(by_task))
+                .order_by(task_assignees.c.task_id, task_assignees.c.user_id)
+            )
+            for task_id, user_id in links:
+                by_task[task_id]["assignee_ids"].append(user_id)
+        for name, (crud, task_id, as_rows) in EXPANSIONS.items():
+            if name not in fields:
+                continue
+            for row in rows:
+                row[name] = []
+            item_schema = get_args(fields[name].annotation)[0] if as_rows else None
+            query = crud.list_query(db, item_schema).filter(task_id.in_(by_task)).order_by(crud.model.id)
+            if as_rows:
+                items = crud.rows_page(db, Page(query.all()), item_schema)
+                parents = [item[task_id.key] for item in items]
+            else:
+                items = query.all()
+                crud.load_related(db, items)
+                parents = [getattr(item, task_id.key) for item in items]
+            for parent, item in zip(parents, items):
+                by_task[parent][name].append(item)
+
     def create_with_owner(self, db: Session, *, obj_in: TaskCreate, created_by_id: int) -> Task:
         db_obj = Task(
             title=obj_in.title,
@@ -26,12 +80,11 @@ class CRUDTask(CRUDBase[Task, TaskCreate, TaskUpdate]):
         )
         if obj_in.assignee_ids:
             users = db.query(User).filter(User.id.in_(obj_in.assignee_ids)).all()
-            if not users:
-                raise NotFoundError(detail="Assigned users not found")
+            if not users or len(users) != len(obj_in.assignee_ids):
+                raise NotFoundError(detail="One or more assigned users not found")
             db_obj.assignees = users
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        db.flush()  # assigns db_obj.id for the activity entry
         activity.log(
             db,
             user_id=created_by_id,
@@ -39,65 +92,64 @@ class CRUDTask(CRUDBase[Task, TaskCreate, TaskUpdate]):
             task_id=db_obj.id,
             new_value={"title": db_obj.title, "description": db_obj.description},
         )
+        db.commit()
+        db.refresh(db_obj)
         return db_obj
 
-    def get_multi_by_project(self, db: Session, *, project_id: int, skip: int = 0, limit: int = 100) -> List[Task]:
-        return (
-            db.query(self.model)
+    def get_multi_by_project(self, db: Session, *, project_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, schema: Optional[Type[BaseModel]] = None) -> List[Task]:
+        query = (
+            self.list_query(db, schema)
             .filter(Task.project_id == project_id)
-            .offset(skip)
-            .limit(limit)
-            .all()
         )
+        return self.paginate(query, skip=skip, limit=limit, cursor=cursor, schema=schema)
 
     def get_multi_by_assignee(
-        self, db: Session, *, user_id: int, skip: int = 0, limit: int = 100
+        self, db: Session, *, user_id: int, skip: int = 0, limit: int = 100,
+        cursor: Optional[str] = None,
+        schema: Optional[Type[BaseModel]] = None,
     ) -> List[Task]:
-        return (
-            db.query(self.model)
+        query = (
+            self.list_query(db, schema)
             .join(Task.assignees)  
             .filter(User.id == user_id)
-            .offset(skip)
-            .limit(limit)
-            .all()
         )
+        return self.paginate(query, skip=skip, limit=limit, cursor=cursor, schema=schema)
 
-    def get_multi_by_status(self, db: Session, *, status: TaskStatus, skip: int = 0, limit: int = 100) -> List[Task]:
-        return (
-            db.query(self.model)
+    def get_multi_by_status(self, db: Session, *, status: TaskStatus, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, schema: Optional[Type[BaseModel]] = None) -> List[Task]:
+        query = (
+            self.list_query(db, schema)
             .filter(Task.status == status)
-            .offset(skip)
-            .limit(limit)
-            .all()
         )
+        return self.paginate(query, skip=skip, limit=limit, cursor=cursor, schema=schema)
 
-    def search_tasks(self, db: Session, *, query: str, skip: int = 0, limit: int = 100) -> List[Task]:
-        search = f"%{query}%"
-        return (
-            db.query(self.model)
-            .filter(or_(Task.title.ilike(search), Task.description.ilike(search)))
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+    def search_tasks(self, db: Session, *, query: str, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Task]:
+        """Full-text search over title and description, best match first."""
+        return full_text_search(self.base_query(db), Task, query, skip=skip, limit=limit, cursor=cursor)
 
-    def complete_task(self, db: Session, *, task_id: int) -> Optional[Task]:
+    def complete_task(self, db: Session, *, task_id: int, user_id: Optional[int] = None) -> Optional[Task]:
         task = self.get(db, id=task_id)
         if not task:
             return None
         task.status = TaskStatus.DONE
         task.completed_at = datetime.now()
         db.add(task)
-        db.commit()
-        db.refresh(task)
         activity.log(
             db,
-            user_id=task.created_by_id,
+            user_id=user_id or task.created_by_id,
             action_type=ActivityType.STATUS_CHANGED,
             task_id=task.id,
             new_value={"title": task.title, "description": task.description},
         )
+        db.commit()
+        db.refresh(task)
         return task
 
+    acreate_with_owner = awaitable("create_with_owner")
+    aget_multi_by_project = awaitable("get_multi_by_project")
+    aget_multi_by_assignee = awaitable("get_multi_by_assignee")
+    aget_multi_by_status = awaitable("get_multi_by_status")
+    asearch_tasks = awaitable("search_tasks")
+    acomplete_task = awaitable("complete_task")
+
 
 task = CRUDTask(Task)
\ No newline at end of file
@@ -1,10 +1,12 @@
-from typing import Any, Dict, Optional, Union, List
+from typing import Any, Dict, Optional, Union, List, Type
 from datetime import datetime
 
+from pydantic import BaseModel
 from sqlalchemy.orm import Session
 from sqlalchemy import or_, and_
 
-from app.crud.base import CRUDBase
+from app.crud.base import CRUDBase, awaitable
+from app.crud.search import full_text_search
 from app.models.ticket import Ticket, TicketStatus
 from app.schemas.ticket import TicketCreate, TicketUpdate
 from app.crud.crud_activity import activity
@@ -27,53 +29,47 @@ class CRUDTicket(CRUDBase[Ticket, TicketCreate, TicketUpdate]):
         return db_obj
 
     def get_multi_by_owner(
-        self, db: Session, *, created_by_id: int, skip: int = 0, limit: int = 100
+        self, db: Session, *, created_by_id: int, skip: int = 0, limit: int = 100,
+        cursor: Optional[str] = None,
+        schema: Optional[Type[BaseModel]] = None,
     ) -> List[Ticket]:
         """Get tickets created by a specific user."""
-        return (
-            db.query(self.model)
+        query = (
+            self.list_query(db, schema)
             .filter(Ticket.created_by_id == created_by_id)
-            .offset(skip)
-            .limit(limit)
-            .all()
         )
+        return self.paginate(query, skip=skip, limit=limit, cursor=cursor, schema=schema)
     
     def get_multi_by_assignee(
-        self, db: Session, *, assigned_to_id: int, skip: int = 0, limit: int = 100
+        self, db: Session, *, assigned_to_id: int, skip: int = 0, limit: int = 100,
+        cursor: Optional[str] = None,
+        schema: Optional[Type[BaseModel]] = None,
     ) -> List[Ticket]:
         """Get tickets assigned to a specific user."""
-        return (
-            db.query(self.model)
+        query = (
+            self.list_query(db, schema)
             .filter(Ticket.assigned_to_id == assigned_to_id)
-            .offset(skip)
-            .limit(limit)
-            .all()
         )
+        return self.paginate(query, skip=skip, limit=limit, cursor=cursor, schema=schema)
     
     def get_multi_by_status(
-        self, db: Session, *, status: TicketStatus, skip: int = 0, limit: int = 100
+        self, db: Session, *, status: TicketStatus, skip: int = 0, limit: int = 100,
+        cursor: Optional[str] = None,
+        schema: Optional[Type[BaseModel]] = None,
     ) -> List[Ticket]:
         """Get tickets by status."""
-        return (
-            db.query(self.model)
+        query = (
+            self.list_query(db, schema)
             .filter(Ticket.status == status)
-            .offset(skip)
-            .limit(limit)
-            .all()
         )
+        return self.paginate(query, skip=skip, limit=limit, cursor=cursor, schema=schema)
     
     def search_tickets(
-        self, db: Session, *, query: str, skip: int = 0, limit: int = 100
+        self, db: Session, *, query: str, skip: int = 0, limit: int = 100,
+        cursor: Optional[str] = None,
     ) -> List[Ticket]:
-        """Search tickets by title or description."""
-        search = f"%{query}%"
-        return (
-            db.query(self.model)
-            .filter(or_(Ticket.title.ilike(search), Ticket.description.ilike(search)))
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+        """Full-text search over title and description, best match first."""
+        return full_text_search(self.base_query(db), Ticket, query, skip=skip, limit=limit, cursor=cursor)
     
     def close_ticket(self, db: Session, *, ticket_id: int) -> Optional[Ticket]:
         """Close a ticket by setting its status to closed and recording the closed time."""
@@ -88,5 +84,12 @@ class CRUDTicket(CRUDBase[Ticket, TicketCreate, TicketUpdate]):
         db.refresh(ticket)
         return ticket
 
+    acreate_with_owner = awaitable("create_with_owner")
+    aget_multi_by_owner = awaitable("get_multi_by_owner")
+    aget_multi_by_assignee = awaitable("get_multi_by_assignee")
+    aget_multi_by_status = awaitable("get_multi_by_status")
+    asearch_tickets = awaitable("search_tickets")
+    aclose_ticket = awaitable("close_ticket")
+
 
 ticket = CRUDTicket(Ticket)
\ No newline at end of file
@@ -1,6 +1,7 @@
-from typing import List
+from typing import List, Optional, Type
+from pydantic import BaseModel
 from sqlalchemy.orm import Session
-from app.crud.base import CRUDBase
+from app.crud.base import CRUDBase, awaitable
 from app.models.time_log import TimeLog
 from app.schemas.time_log import TimeLogCreate, TimeLogUpdate
 from app.crud.crud_activity import activity
@@ -18,8 +19,6 @@ class CRUDTimeLog(CRUDBase[TimeLog, TimeLogCreate, TimeLogUpdate]):
             user_id=user_id,
         )
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
         activity.log(
             db,
             user_id=user_id,
@@ -27,29 +26,35 @@ class CRUDTimeLog(CRUDBase[TimeLog, TimeLogCreate, TimeLogUpdate]):
             task_id=db_obj.task_id,
             new_value={"task_id": obj_in.task_id, "minutes_spent": obj_in.minutes_spent},
         )
+        db.commit()
+        db.refresh(db_obj)
         return db_obj
 
     def get_multi_by_task(
-        self, db: Session, *, task_id: int, skip: int = 0, limit: int = 100
+        self, db: Session, *, task_id: int, skip: int = 0, limit: int = 100,
+        cursor: Optional[str] = None,
+        schema: Optional[Type[BaseModel]] = None,
     ) -> List[TimeLog]:
-        return (
-            db.query(self.model)
+        query = (
+            self.list_query(db, schema)
             .filter(TimeLog.task_id == task_id)
-            .offset(skip)
-            .limit(limit)
-            .all()
         )
+        return self.paginate(query, skip=skip, limit=limit, cursor=cursor, schema=schema)
 
     def get_multi_by_subtask(
-        self, db: Session, *, subtask_id: int, skip: int = 0, limit: int = 100
+        self, db: Session, *, subtask_id: int, skip: int = 0, limit: int = 100,
+        cursor: Optional[str] = None,
+        schema: Optional[Type[BaseModel]] = None,
     ) -> List[TimeLog]:
-        return (
-            db.query(self.model)
+        query = (
+            self.list_query(db, schema)
             .filter(TimeLog.subtask_id == subtask_id)
-            .offset(skip)
-            .limit(limit)
-            .all()
         )
+        return self.paginate(query, skip=skip, limit=limit, cursor=cursor, schema=schema)
+
+    acreate_with_user = awaitable("create_with_user")
+    aget_multi_by_task = awaitable("get_multi_by_task")
+    aget_multi_by_subtask = awaitable("get_multi_by_subtask")
 
 
 time_log = CRUDTimeLog(TimeLog)
\ No newline at end of file
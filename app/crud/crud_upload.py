@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta
+from typing import List, Optional
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.crud.base import CRUDBase, awaitable
+from app.models.upload import Upload, UploadChunk
+from app.schemas.upload import UploadCreate
+
+
+def _expires_at() -> datetime:
+    return datetime.utcnow() + timedelta(seconds=settings.UPLOAD_EXPIRE_SECONDS)
+
+
+class CRUDUpload(CRUDBase[Upload, UploadCreate, UploadCreate]):
+    def create_with_owner(
+        self, db: Session, *, obj_in: UploadCreate, created_by_id: int, content_type: str
+    ) -> Upload:
+        db_obj = Upload(
+            filename=obj_in.filename,
+            content_type=content_type,
+            size=obj_in.size,
+            sha256=obj_in.sha256,
+            task_id=obj_in.task_id,
+            subtask_id=obj_in.subtask_id,
+            created_by_id=created_by_id,
+            expires_at=_expires_at(),
+        )
+        db.add(db_obj)
+        db.commit()
+        return self.refresh(db, db_obj)
+
+    def get_active(self, db: Session, *, id: int) -> Optional[Upload]:
+        """An upload that hasn't expired yet."""
+        return (
+            self.base_query(db)
+            .filter(Upload.id == id, Upload.expires_at > datetime.utcnow())
+            .first()
+        )
+
+    def add_chunk(self, db: Session, *, id: int, offset: int, length: int) -> Optional[Upload]:
+        """Record a byte range written to the upload's file and push its expiry back.
+
+        Returns None if the upload expired or was completed while the range
+        was being written.
+        """
+        db_obj = self.get_active(db, id=id)
+        if db_obj is None:
+            return None
+        db.add(UploadChunk(upload_id=db_obj.id, offset=offset, length=length))
+        db_obj.expires_at = _expires_at()
+        db.commit()
+        return self.refresh(db, db_obj)
+
+    def remove_expired(self, db: Session) -> List[int]:
+        """Delete expired uploads; returns their ids, whose partial files can then go."""
+        ids = [id_ for id_, in db.query(Upload.id).filter(Upload.expires_at <= datetime.utcnow())]
+        if ids:
+            db.query(UploadChunk).filter(UploadChunk.upload_id.in_(ids)).delete(synchronize_session=False)
+            db.query(Upload).filter(Upload.id.in_(ids)).delete(synchronize_session=False)
+            db.commit()
+        return ids
+
+    acreate_with_owner = awaitable("create_with_owner")
+    aget_active = awaitable("get_active")
+    aadd_chunk = awaitable("add_chunk")
+
+
+upload = CRUDUpload(Upload)
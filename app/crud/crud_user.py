@@ -1,25 +1,61 @@
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, List, Optional, Union
 
-from sqlalchemy.orm import Session
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
 
-from app.core.security import get_password_hash, verify_password
-from app.models.user import User
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.security import get_password_hash, token_revocations, verify_password
+from app.crud.base import awaitable
+from app.crud.pagination import paginate
+from app.models.user import DeletedUser, User
 from app.schemas.user import UserCreate, UserUpdate
 from app.crud.crud_activity import activity
 from app.models.activity import ActivityType
 
+# Detached snapshots of user rows, keyed by ("id" | "email" | "username", value)
+user_cache = TTLCache(
+    maxsize=settings.USER_CACHE_MAX_SIZE, ttl=settings.USER_CACHE_TTL_SECONDS
+)
+
+
+def _cache_keys(user: User) -> List[tuple]:
+    return [("id", user.id), ("email", user.email), ("username", user.username)]
+
+
 class CRUDUser:
     def get(self, db: Session, id: int) -> Optional[User]:
-        return db.query(User).filter(User.id == id).first()
+        return self._get_cached(db, "id", id)
 
     def get_by_email(self, db: Session, email: str) -> Optional[User]:
-        return db.query(User).filter(User.email == email).first()
+        return self._get_cached(db, "email", email)
     
     def get_by_username(self, db: Session, username: str) -> Optional[User]:
-        return db.query(User).filter(User.username == username).first()
+        return self._get_cached(db, "username", username)
+
+    def _get_cached(self, db: Session, field: str, value: Any) -> Optional[User]:
+        """Look a user up by a unique column, serving hot users from user_cache.
+
+        Hits are merged into the session without loading, so they cost no SQL
+        and can still be updated like any other persistent object.
+        """
+        snapshot = user_cache.get((field, value))
+        if snapshot is not None:
+            return db.merge(snapshot, load=False)
+        return self._get_fresh(db, field, value)
 
-    def get_multi(self, db: Session, *, skip: int = 0, limit: int = 100) -> list[User]:
-        return db.query(User).offset(skip).limit(limit).all()
+    def _get_fresh(self, db: Session, field: str, value: Any) -> Optional[User]:
+        """Look a user up by a unique column in the database, refreshing user_cache."""
+        db_obj = db.query(User).filter(getattr(User, field) == value).populate_existing().first()
+        if db_obj is not None:
+            snapshot = User(**{attr.key: getattr(db_obj, attr.key) for attr in inspect(User).column_attrs})
+            make_transient_to_detached(snapshot)
+            for key in _cache_keys(db_obj):
+                user_cache.set(key, snapshot)
+        return db_obj
+
+    def get_multi(self, db: Session, *, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> list[User]:
+        return paginate(db.query(User), (User.id,), skip=skip, limit=limit, cursor=cursor)
 
     def create(self, db: Session, *, obj_in: UserCreate) -> User:
         db_obj = User(
@@ -31,8 +67,15 @@ class CRUDUser:
             is_active=obj_in.is_active,
         )
         db.add(db_obj)
+        db.flush()
+        # The id of a deleted user can be handed out again: start above the
+        # version its tokens are revoked below, or the new user couldn't log in
+        deleted = db.get(DeletedUser, db_obj.id)
+        if deleted is not None:
+            db_obj.token_version = deleted.token_version
         db.commit()
         db.refresh(db_obj)
+        user_cache.delete(*_cache_keys(db_obj))
         return db_obj
 
     def update(self, db: Session, *, db_obj: User, obj_in: Union[UserUpdate, Dict[str, Any]]) -> User:
@@ -44,22 +87,58 @@ class CRUDUser:
             hashed_password = get_password_hash(update_data["password"])
             del update_data["password"]
             update_data["hashed_password"] = hashed_password
+        # Issued tokens carry these as claims, so changing them revokes the tokens
+        revoke_tokens = "hashed_password" in update_data or any(
+            field in update_data and update_data[field] != getattr(db_obj, field)
+            for field in ("is_active", "is_superuser")
+        )
+        stale_keys = _cache_keys(db_obj)
         for field in update_data:
             if hasattr(db_obj, field):
                 setattr(db_obj, field, update_data[field])
+        if revoke_tokens:
+            # Incremented in SQL: db_obj may come from a snapshot that is up to
+            # USER_CACHE_TTL_SECONDS old
+            db_obj.token_version = User.token_version + 1
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
+        user_cache.delete(*stale_keys, *_cache_keys(db_obj))
+        if revoke_tokens:
+            token_revocations.revoke(db_obj.id, db_obj.token_version)
         return db_obj
 
     def delete(self, db: Session, *, id: int) -> User:
         obj = db.query(User).get(id)
+        # Read in SQL: obj may come from a snapshot that is up to
+        # USER_CACHE_TTL_SECONDS old
+        version = db.query(User.token_version).filter(User.id == id).scalar() + 1
+        # Kept in the database, so the other processes revoke the user's
+        # tokens on their next reload, though the users row is gone
+        db.merge(DeletedUser(user_id=id, token_version=version))
         db.delete(obj)
         db.commit()
+        token_revocations.revoke(id, version)
+        user_cache.delete(*_cache_keys(obj))
         return obj
 
-    def authenticate(self, db: Session, *, email: str, password: str) -> Optional[User]:
-        user = self.get_by_email(db, email=email)
+    def get_token_versions(self, db: Session) -> Dict[int, int]:
+        """Lowest valid token version of every user, existing or deleted, whose
+        tokens were ever revoked."""
+        versions = dict(db.query(DeletedUser.user_id, DeletedUser.token_version).all())
+        for user_id, version in db.query(User.id, User.token_version).filter(User.token_version > 0):
+            versions[user_id] = max(version, versions.get(user_id, 0))
+        return versions
+
+    def authenticate(
+        self, db: Session, *, password: str, email: Optional[str] = None, username: Optional[str] = None
+    ) -> Optional[User]:
+        # Never from user_cache: another process may have changed the password
+        # or deactivated the user since the snapshot was taken
+        if email is not None:
+            user = self._get_fresh(db, "email", email)
+        else:
+            user = self._get_fresh(db, "username", username)
         if not user:
             return None
         if not verify_password(password, user.hashed_password):
@@ -72,5 +151,15 @@ class CRUDUser:
     def is_superuser(self, user: User) -> bool:
         return user.is_superuser
 
+    aget = awaitable("get")
+    aget_by_email = awaitable("get_by_email")
+    aget_by_username = awaitable("get_by_username")
+    aget_multi = awaitable("get_multi")
+    acreate = awaitable("create")
+    aupdate = awaitable("update")
+    adelete = awaitable("delete")
+    aauthenticate = awaitable("authenticate")
+    aget_token_versions = awaitable("get_token_versions")
+
 
 user = CRUDUser()
\ No newline at end of file
@@ -0,0 +1,110 @@
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Query, Session
+
+from app.core.errors import BadRequestError
+from app.crud.crud_activity import activity
+from app.crud.crud_task import task
+from app.crud.crud_ticket import ticket
+from app.crud.crud_time_log import time_log
+from app.models.subtask import Subtask
+from app.models.task import Task, TaskStatus
+from app.models.ticket import TicketStatus
+from app.schemas.activity import ActivityRead
+from app.schemas.export import ExportEntity
+from app.schemas.task import Task as TaskSchema
+from app.schemas.ticket import Ticket as TicketSchema
+from app.schemas.time_log import TimeLogRead
+
+# entity -> (crud, schema of each exported row, status enum if it has one)
+EXPORTS = {
+    ExportEntity.TASKS: (task, TaskSchema, TaskStatus),
+    ExportEntity.TICKETS: (ticket, TicketSchema, TicketStatus),
+    ExportEntity.TIME_LOGS: (time_log, TimeLogRead, None),
+    ExportEntity.ACTIVITIES: (activity, ActivityRead, None),
+}
+
+
+def export_query(
+    db: Session,
+    entity: ExportEntity,
+    *,
+    project_id: Optional[int] = None,
+    status: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> Query:
+    """Rows of ``entity`` to export, in id order, filtered by project, status
+    and ``since <= created_at < until``."""
+    crud, schema, status_enum = EXPORTS[entity]
+    model = crud.model
+    query = crud.list_query(db, schema)
+    if project_id is not None:
+        if entity == ExportEntity.TASKS:
+            query = query.filter(Task.project_id == project_id)
+        elif entity == ExportEntity.TICKETS:
+            raise BadRequestError(detail="Tickets don't belong to projects")
+        else:
+            # Logged against a task of the project or against one of its subtasks
+            task_ids = select(Task.id).where(Task.project_id == project_id)
+            subtask_ids = select(Subtask.id).where(Subtask.task_id.in_(task_ids))
+            query = query.filter(or_(model.task_id.in_(task_ids), model.subtask_id.in_(subtask_ids)))
+    if status is not None:
+        if status_enum is None:
+            raise BadRequestError(detail=f"{entity.value} have no status")
+        try:
+            query = query.filter(model.status == status_enum(status))
+        except ValueError:
+            raise BadRequestError(detail=f"Invalid status: {status}")
+    if since is not None:
+        query = query.filter(model.created_at >= since)
+    if until is not None:
+        query = query.filter(model.created_at < until)
+    return query.order_by(model.id)
+
+
+def export_batches(db: Session, entity: ExportEntity, query: Query, *, batch_size: int = 1000) -> Iterator[List[Dict[str, Any]]]:
+    """Stream ``query`` (from export_query) as lists of row dicts.
+
+    Rows come from a server-side cursor ``batch_size`` at a time, so memory
+    stays flat however many rows match.
+    """
+    crud, schema, _ = EXPORTS[entity]
+    result = db.execute(query.statement, execution_options={"yield_per": batch_size})
+    for partition in result.partitions():
+        rows = [dict(row._mapping) for row in partition]
+        crud.load_related_rows(db, rows, schema)
+        yield rows
+
+
+def archived_batches(
+    db: Session,
+    entity: ExportEntity,
+    *,
+    project_id: Optional[int] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    batch_size: int = 1000,
+) -> Iterator[List[Dict[str, Any]]]:
+    """The archived activity entries (see CRUDActivity.archive) an activities
+    export covers, as lists of row dicts; nothing for the other entities.
+
+    One archive chunk is decompressed at a time.
+    """
+    if entity != ExportEntity.ACTIVITIES:
+        return
+    chunks = activity.archive_chunks(db, project_id=project_id, since=since, until=until)
+    batch: List[Dict[str, Any]] = []
+    for entry in activity.archived_entries(chunks.yield_per(100), since=since, until=until):
+        batch.append(entry)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def export_fields(entity: ExportEntity) -> List[str]:
+    return list(EXPORTS[entity][1].model_fields)
@@ -0,0 +1,104 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Iterable, List, Optional, Sequence
+
+from sqlalchemy import DateTime, and_, or_
+from sqlalchemy.orm import Query
+
+from app.core.errors import BadRequestError
+
+
+class Page(list):
+    """A page of rows plus the opaque cursors of the pages around it.
+
+    Serializes like the plain list list endpoints always returned.
+    """
+
+    def __init__(
+        self,
+        items: Iterable[Any] = (),
+        next_cursor: Optional[str] = None,
+        prev_cursor: Optional[str] = None,
+    ) -> None:
+        super().__init__(items)
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+
+
+def encode_cursor(values: Sequence[Any], direction: str) -> str:
+    payload = {
+        "k": [v.isoformat() if isinstance(v, datetime) else v for v in values],
+        "d": direction,
+    }
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, keys: Sequence[Any]) -> tuple:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        values, direction = payload["k"], payload["d"]
+        if direction not in ("next", "prev") or len(values) != len(keys):
+            raise ValueError(cursor)
+        values = [
+            datetime.fromisoformat(v) if isinstance(key.type, DateTime) and v is not None else v
+            for key, v in zip(keys, values)
+        ]
+    except (ValueError, KeyError, TypeError, binascii.Error):
+        raise BadRequestError(detail="Invalid cursor")
+    return values, direction
+
+
+def _after(keys: Sequence[Any], values: Sequence[Any], ascending: bool):
+    """Rows strictly after ``values`` in (keys) order, as an OR-expanded row comparison."""
+    clauses = []
+    for i, key in enumerate(keys):
+        step = key > values[i] if ascending else key < values[i]
+        clauses.append(and_(*[keys[j] == values[j] for j in range(i)], step))
+    return or_(*clauses)
+
+
+def paginate(
+    query: Query,
+    keys: Sequence[Any],
+    *,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    descending: bool = False,
+) -> Page:
+    """Page through ``query`` ordered by ``keys``, e.g. ``(Task.id,)``.
+
+    Without a cursor this is the old offset mode (``skip``/``limit``). With a
+    cursor the page is found by seeking past the cursor's key values, so deep
+    pages cost the same as the first one when ``keys`` are indexed.
+    """
+    backward = False
+    if cursor is not None:
+        values, direction = decode_cursor(cursor, keys)
+        backward = direction == "prev"
+        query = query.filter(_after(keys, values, ascending=descending == backward))
+    ascending = descending == backward
+    query = query.order_by(*[key.asc() if ascending else key.desc() for key in keys])
+    if cursor is None and skip:
+        query = query.offset(skip)
+    rows: List[Any] = query.limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if backward:
+        rows.reverse()
+
+    def cursor_for(row: Any, direction: str) -> str:
+        return encode_cursor([getattr(row, key.key) for key in keys], direction)
+
+    # Paging backward we came from the rows after this page, and vice versa
+    more_after = backward or has_more
+    more_before = has_more if backward else (cursor is not None or skip > 0)
+    next_cursor = prev_cursor = None
+    if rows:
+        if more_after:
+            next_cursor = cursor_for(rows[-1], "next")
+        if more_before:
+            prev_cursor = cursor_for(rows[0], "prev")
+    return Page(rows, next_cursor=next_cursor, prev_cursor=prev_cursor)
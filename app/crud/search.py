@@ -0,0 +1,192 @@
+import heapq
+import re
+from itertools import islice
+from typing import Any, Dict, List, Optional, Sequence, Type
+
+from sqlalchemy import Float, Integer, String, and_, column, func, literal, literal_column, or_, select, table as sql_table
+from sqlalchemy.orm import Query, Session
+
+from app.core.errors import BadRequestError
+from app.crud.pagination import Page, decode_cursor, encode_cursor, paginate
+from app.db.full_text import BM25_WEIGHTS, SEARCH_COLUMNS, TS_CONFIG, fts_table
+from app.models.attachment import Attachment
+from app.models.comment import Comment
+from app.models.subtask import Subtask
+from app.models.task import Task
+from app.models.ticket import Ticket
+from app.schemas.search import SearchType
+
+SNIPPET_START = "<mark>"
+SNIPPET_STOP = "</mark>"
+SNIPPET_WORDS = 16
+
+
+def search_terms(text: str) -> List[str]:
+    """Split user input into bare words, dropping FTS operators and punctuation."""
+    return re.findall(r"\w+", text.lower())
+
+
+def _hits(model: Type[Any], text: str, dialect: str):
+    """Subquery of matching ids with ``score`` (higher is better) and ``snippet``."""
+    table = model.__tablename__
+    weighted = SEARCH_COLUMNS[table]
+    terms = search_terms(text)
+    if dialect == "sqlite":
+        fts = literal_column(fts_table(table))
+        # Every word must match, each as a prefix ("log" finds "login")
+        match = " ".join(f'"{term}"*' for term in terms)
+        return (
+            select(
+                literal_column("rowid").label("id"),
+                (-func.bm25(fts, *[BM25_WEIGHTS[weight] for _, weight in weighted])).label("score"),
+                func.snippet(fts, -1, SNIPPET_START, SNIPPET_STOP, "…", SNIPPET_WORDS).label("snippet"),
+            )
+            .select_from(sql_table(fts_table(table)))
+            .where(fts.op("MATCH")(match))
+            .subquery("hits")
+        )
+    columns = [getattr(model, column) for column, _ in weighted]
+    if dialect == "postgresql":
+        vector = literal_column(f"{table}.search_vector")
+        query = func.to_tsquery(TS_CONFIG, " & ".join(f"{term}:*" for term in terms))
+        return (
+            select(
+                model.id.label("id"),
+                func.ts_rank(vector, query).label("score"),
+                func.ts_headline(
+                    TS_CONFIG,
+                    func.concat_ws(" ", *columns),
+                    query,
+                    f"StartSel={SNIPPET_START}, StopSel={SNIPPET_STOP}, MaxWords={SNIPPET_WORDS}, MinWords=5",
+                ).label("snippet"),
+            )
+            .where(vector.op("@@")(query))
+            .subquery("hits")
+        )
+    # No full-text index on this backend: unranked substring match
+    search = f"%{text}%"
+    return (
+        select(model.id.label("id"), literal(0.0).label("score"), literal(None).label("snippet"))
+        .where(or_(*[column.ilike(search) for column in columns]))
+        .subquery("hits")
+    )
+
+
+def full_text_search(
+    query: Query,
+    model: Type[Any],
+    text: str,
+    *,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+) -> Page:
+    """Rows of ``query`` matching ``text``, best match first.
+
+    Each returned object gets ``score`` and ``snippet`` (the matched text with
+    the hits wrapped in ``<mark>``) attributes. Paging by cursor seeks on
+    ``(score, id)``.
+    """
+    if not search_terms(text):
+        return Page()
+    hits = _hits(model, text, query.session.get_bind().dialect.name)
+    query = query.join(hits, hits.c.id == model.id).add_columns(hits.c.score, hits.c.snippet, hits.c.id)
+    page = paginate(query, (hits.c.score, hits.c.id), skip=skip, limit=limit, cursor=cursor, descending=True)
+    for row in page:
+        row[0].score = row.score
+        row[0].snippet = row.snippet
+    return Page([row[0] for row in page], next_cursor=page.next_cursor, prev_cursor=page.prev_cursor)
+
+
+# What /search looks in, in tie-break order: (model, title, task_id, ticket_id)
+SEARCH_TARGETS = {
+    SearchType.TASK: (Task, Task.title, Task.id, None),
+    SearchType.SUBTASK: (Subtask, Subtask.title, Subtask.task_id, None),
+    SearchType.TICKET: (Ticket, Ticket.title, None, Ticket.id),
+    SearchType.COMMENT: (Comment, None, Comment.task_id, Comment.ticket_id),
+    SearchType.ATTACHMENT: (Attachment, Attachment.filename, Attachment.task_id, None),
+}
+SEARCH_ORDER = list(SEARCH_TARGETS)
+
+# Position of the last hit of the previous page in the merged stream
+SEARCH_CURSOR_KEYS = (column("score", Float), column("type", String), column("id", Integer))
+
+
+def _merge_key(hit: Dict[str, Any]) -> tuple:
+    return (-hit["score"], SEARCH_ORDER.index(hit["type"]), -hit["id"])
+
+
+def search_all(
+    db: Session,
+    *,
+    query: str,
+    types: Optional[Sequence[SearchType]] = None,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+) -> Page:
+    """Full-text search across every entity in SEARCH_TARGETS, best match first.
+
+    Each type is its own ranked stream, ordered by ``(score, id)`` and read
+    only as far as this page can reach; the streams are then k-way merged.
+    The cursor is the last hit's position in the merged order, so one cursor
+    resumes every stream.
+    """
+    if not search_terms(query):
+        return Page()
+    after = None
+    if cursor is not None:
+        (score, type_, id_), direction = decode_cursor(cursor, SEARCH_CURSOR_KEYS)
+        if direction != "next" or type_ not in SEARCH_ORDER:
+            raise BadRequestError(detail="Invalid cursor")
+        after = (score, SEARCH_ORDER.index(type_), id_)
+
+    dialect = db.get_bind().dialect.name
+    streams: List[List[Dict[str, Any]]] = []
+    for position, type_ in enumerate(SEARCH_ORDER):
+        if types and type_ not in types:
+            continue
+        model, title, task_id, ticket_id = SEARCH_TARGETS[type_]
+        hits = _hits(model, query, dialect)
+        stream = (
+            db.query(
+                hits.c.id,
+                hits.c.score,
+                hits.c.snippet,
+                title if title is not None else literal(None),
+                task_id if task_id is not None else literal(None),
+                ticket_id if ticket_id is not None else literal(None),
+            )
+            .join(model, model.id == hits.c.id)
+        )
+        if after is not None:
+            score, cursor_position, cursor_id = after
+            # Streams before the cursor's in tie-break order already gave up
+            # their hits with an equal score, streams after it haven't
+            if position < cursor_position:
+                stream = stream.filter(hits.c.score < score)
+            elif position == cursor_position:
+                stream = stream.filter(or_(hits.c.score < score, and_(hits.c.score == score, hits.c.id < cursor_id)))
+            else:
+                stream = stream.filter(hits.c.score <= score)
+        rows = stream.order_by(hits.c.score.desc(), hits.c.id.desc()).limit(limit + 1).all()
+        streams.append([
+            {
+                "type": type_,
+                "id": row[0],
+                "score": row[1],
+                "snippet": row[2],
+                "title": row[3],
+                "task_id": row[4],
+                "ticket_id": row[5],
+            }
+            for row in rows
+        ])
+
+    page = list(islice(heapq.merge(*streams, key=_merge_key), limit + 1))
+    next_cursor = None
+    if len(page) > limit:
+        page = page[:limit]
+        if page:
+            last = page[-1]
+            next_cursor = encode_cursor([last["score"], last["type"].value, last["id"]], "next")
+    return Page(page, next_cursor=next_cursor)
@@ -0,0 +1,91 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.errors import BadRequestError
+from app.crud.crud_comment import comment
+from app.crud.crud_project import project
+from app.crud.crud_subtask import subtask
+from app.crud.crud_task import task
+from app.crud.crud_ticket import ticket
+from app.crud.pagination import Page
+from app.db.change_sequence import high_water
+from app.models.tombstone import Tombstone
+from app.schemas.comment import Comment as CommentSchema
+from app.schemas.project import Project as ProjectSchema
+from app.schemas.sync import SyncDeleted, SyncResult, SyncSubtask
+from app.schemas.task import Task as TaskSchema
+from app.schemas.ticket import Ticket as TicketSchema
+
+# entity (as in app.db.change_sequence.SYNCED) -> (crud, schema of each synced row)
+SYNC_ENTITIES = {
+    "tasks": (task, TaskSchema),
+    "subtasks": (subtask, SyncSubtask),
+    "tickets": (ticket, TicketSchema),
+    "comments": (comment, CommentSchema),
+    "projects": (project, ProjectSchema),
+}
+
+
+def decode_token(token: str) -> int:
+    """The change sequence number behind a sync token."""
+    if not token.isdigit():
+        raise BadRequestError(detail="Invalid sync token")
+    return int(token)
+
+
+def changes_since(db: Session, *, since: str = "0", limit: int = 1000) -> SyncResult:
+    """Rows changed and deleted after the sync token ``since``, oldest change first.
+
+    At most ``limit`` changes come back, with the token of the last one;
+    ``has_more`` says to call again with it. Each table is read by one range
+    scan of its ``change_seq`` index, never more than ``limit + 1`` rows.
+
+    The tables are read one statement at a time, without a shared snapshot,
+    so every read stops at the high-water mark taken first: a change that
+    commits in between is left for the next call instead of being skipped.
+    """
+    seq = decode_token(since)
+    until = high_water(db.connection())
+    # (change_seq, entity, row or None, id of the deleted row or None)
+    changes: List[Tuple[int, str, Any, Optional[int]]] = []
+    for entity, (crud, schema) in SYNC_ENTITIES.items():
+        model = crud.model
+        rows = (
+            crud.list_query(db, schema)
+            .add_columns(model.change_seq)
+            .filter(model.change_seq > seq, model.change_seq <= until)
+            .order_by(model.change_seq)
+            .limit(limit + 1)
+            .all()
+        )
+        changes += [(row.change_seq, entity, row, None) for row in rows]
+    tombstones = (
+        db.query(Tombstone.change_seq, Tombstone.entity, Tombstone.entity_id)
+        .filter(Tombstone.change_seq > seq, Tombstone.change_seq <= until)
+        .order_by(Tombstone.change_seq)
+        .limit(limit + 1)
+    )
+    changes += [(change_seq, entity, None, entity_id) for change_seq, entity, entity_id in tombstones]
+
+    # Every table was cut at limit + 1, so the first ``limit`` changes
+    # overall are all here, and anything past them means there are more
+    changes.sort(key=lambda change: change[0])
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+
+    rows_of: Dict[str, List[Any]] = {entity: [] for entity in SYNC_ENTITIES}
+    deleted: Dict[str, List[int]] = {entity: [] for entity in SYNC_ENTITIES}
+    for _, entity, row, deleted_id in changes:
+        if row is not None:
+            rows_of[entity].append(row)
+        else:
+            deleted[entity].append(deleted_id)
+    result: Dict[str, Any] = {}
+    for entity, (crud, schema) in SYNC_ENTITIES.items():
+        result[entity] = crud.rows_page(db, Page(rows_of[entity]), schema)
+        # An id can be reused: a row that exists now was created after the deletion
+        alive = {row["id"] for row in result[entity]}
+        deleted[entity] = [id_ for id_ in deleted[entity] if id_ not in alive]
+    token = str(changes[-1][0]) if changes else str(seq)
+    return SyncResult(token=token, has_more=has_more, deleted=SyncDeleted(**deleted), **result)
@@ -0,0 +1,84 @@
+"""Background job moving old activity entries to the compressed archive
+(ACTIVITY_ARCHIVE_ENABLED).
+
+Every ACTIVITY_ARCHIVE_INTERVAL_SECONDS, entries older than
+ACTIVITY_ARCHIVE_AFTER_DAYS are moved out of ``activities`` into
+``activity_archive`` (see CRUDActivity.archive), so the hot table only holds
+recent history. Run ``python -m app.db.activity_archiver`` to archive once.
+"""
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Optional
+
+from app.core.config import settings
+from app.crud.crud_activity import activity
+from app.db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+class ActivityArchiver:
+    def __init__(self, *, after_days: int, interval: float, batch_size: int) -> None:
+        self.after_days = after_days
+        self.interval = interval
+        self.batch_size = batch_size
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="activity-archiver", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        if not self.running:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def run_once(self) -> int:
+        before = datetime.utcnow() - timedelta(days=self.after_days)
+        db = SessionLocal()
+        try:
+            moved = activity.archive(db, before=before, batch_size=self.batch_size)
+        finally:
+            db.close()
+        if moved:
+            logger.info("Archived %d activity entries older than %s", moved, before)
+        return moved
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception:
+                logger.exception("Activity archiving failed")
+            self._stop.wait(self.interval)
+
+
+def _archiver() -> ActivityArchiver:
+    return ActivityArchiver(
+        after_days=settings.ACTIVITY_ARCHIVE_AFTER_DAYS,
+        interval=settings.ACTIVITY_ARCHIVE_INTERVAL_SECONDS,
+        batch_size=settings.ACTIVITY_ARCHIVE_BATCH_SIZE,
+    )
+
+
+activity_archiver = _archiver() if settings.ACTIVITY_ARCHIVE_ENABLED else None
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    _archiver().run_once()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Optional background writer for activity entries (ACTIVITY_BUFFER_ENABLED).
+
+Instead of being inserted in the request's transaction, an entry is held on
+the session until it commits, then queued and written by a worker thread in
+batched INSERTs. Rolled-back entries are discarded with their transaction.
+
+Entries become visible up to ACTIVITY_BUFFER_FLUSH_SECONDS after the change
+they describe, and entries still queued when the process dies are lost.
+"""
+import logging
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event, insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import engine
+from app.models.activity import Activity
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = "pending_activities"
+# Set in the info of a session whose commits only release a SAVEPOINT of an
+# outer transaction (see app.crud.batch): its entries are written inline, so
+# they can't reach the writer before that transaction commits
+INLINE_KEY = "inline_activities"
+
+
+class ActivityWriter:
+    """Queue of activity rows flushed to the database in bulk by one worker thread.
+
+    A batch is written once it reaches ``batch_size`` rows or
+    ``flush_interval`` seconds after its first row, whichever comes first.
+    """
+
+    def __init__(self, engine: Engine, *, max_size: int, batch_size: int, flush_interval: float) -> None:
+        self.engine = engine
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue(maxsize=max_size)
+        self._thread: Optional[threading.Thread] = None
+        self.written = 0
+        self.failed = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._thread = threading.Thread(target=self._run, name="activity-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Write everything still queued, then stop the worker."""
+        if not self.running:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def add(self, db: Session, row: Dict[str, Any]) -> None:
+        """Hold ``row`` until ``db`` commits; it is queued only if the commit succeeds."""
+        db.info.setdefault(_PENDING_KEY, []).append(row)
+
+    def enqueue(self, rows: List[Dict[str, Any]]) -> None:
+        for i, row in enumerate(rows):
+            try:
+                self._queue.put_nowait(row)
+            except queue.Full:
+                # Backpressure: the writer is behind, so the producer pays for
+                # the write itself instead of queueing without bound
+                self._write(rows[i:])
+                return
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            row = self._queue.get()
+            if row is None:
+                break
+            batch = [row]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    row = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if row is None:
+                    stopping = True
+                    break
+                batch.append(row)
+            self._write(batch)
+        # Drain whatever was queued behind the stop marker
+        rest = []
+        while True:
+            try:
+                row = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if row is not None:
+                rest.append(row)
+        for start in range(0, len(rest), self.batch_size):
+            self._write(rest[start:start + self.batch_size])
+
+    def _write(self, rows: List[Dict[str, Any]]) -> None:
+        try:
+            with self.engine.begin() as connection:
+                connection.execute(insert(Activity), rows)
+        except Exception:
+            self.failed += len(rows)
+            logger.exception("Failed to write %d activity entries", len(rows))
+        else:
+            self.written += len(rows)
+
+
+activity_writer = None
+if settings.ACTIVITY_BUFFER_ENABLED:
+    activity_writer = ActivityWriter(
+        engine,
+        max_size=settings.ACTIVITY_BUFFER_MAX_SIZE,
+        batch_size=settings.ACTIVITY_BUFFER_BATCH_SIZE,
+        flush_interval=settings.ACTIVITY_BUFFER_FLUSH_SECONDS,
+    )
+
+
+@event.listens_for(Session, "after_commit")
+def _queue_committed(session: Session) -> None:
+    rows = session.info.pop(_PENDING_KEY, None)
+    if rows and activity_writer is not None:
+        activity_writer.enqueue(rows)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_uncommitted(session: Session, transaction) -> None:
+    # Rows of a committed transaction were already taken by _queue_committed
+    if transaction.parent is None:
+        session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,180 @@
+"""Change events for the change stream, published when a session commits.
+
+After each flush, the rows it inserted, updated or deleted are turned into
+events addressed to topics (``project:<id>``, ``task:<id>``,
+``ticket:<id>``) and held on the session; the commit hands them to the
+broker and a rollback discards them. Every crud_* write and activity.log
+goes through here without knowing about it; bulk_import's Core INSERTs
+report their rows with ``record_rows``. Nothing is collected while nobody
+is subscribed.
+
+An event is ``{"type": "change", "entity": ..., "action": "created" |
+"updated" | "deleted", "id": ..., "data": {...}}``, ``data`` holding the
+row's columns already in memory (server-generated ones such as
+``updated_at`` may be missing).
+"""
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+import orjson
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+
+from app.core.broker import broker
+from app.models.activity import Activity
+from app.models.attachment import Attachment
+from app.models.comment import Comment
+from app.models.project import Project
+from app.models.subtask import Subtask
+from app.models.task import Task
+from app.models.ticket import Ticket
+from app.models.time_log import TimeLog
+
+_PENDING_KEY = "pending_changes"
+_UNFLUSHED_KEY = "unflushed_changes"
+# Set in the info of a session whose commits only release a SAVEPOINT of an
+# outer transaction (see app.crud.batch): its events are collected in this
+# list, for the owner of the transaction to publish once that commits
+HELD_KEY = "held_changes"
+
+ENTITIES = {
+    Task: "task",
+    Subtask: "subtask",
+    Ticket: "ticket",
+    Comment: "comment",
+    Project: "project",
+    Attachment: "attachment",
+    TimeLog: "time_log",
+    Activity: "activity",
+}
+
+
+def _loaded(obj: Any) -> Dict[str, Any]:
+    """The column values of ``obj`` in memory, without loading the rest."""
+    state = inspect(obj)
+    return {
+        column.key: state.dict[column.key]
+        for column in obj.__table__.columns
+        if column.key in state.dict
+    }
+
+
+def _parents(session: Session, model: Any, column: Any, ids: Set[int]) -> Dict[int, Optional[int]]:
+    """``column`` of the ``model`` rows ``ids``, from the identity map where loaded, else one query."""
+    found: Dict[int, Optional[int]] = {}
+    for id_ in ids:
+        obj = session.identity_map.get(session.identity_key(model, id_))
+        if obj is not None and column.key in inspect(obj).dict:
+            found[id_] = inspect(obj).dict[column.key]
+    missing = ids - found.keys()
+    if missing:
+        # On the connection, so no autoflush can run from inside the flush
+        found.update(session.connection().execute(select(model.id, column).where(model.id.in_(missing))).all())
+    return found
+
+
+def _events(session: Session, changes: List[Tuple[Any, str, Dict[str, Any]]]) -> List[Tuple[Tuple[str, Any], FrozenSet[str], Dict[str, Any]]]:
+    """Address ``(model, action, data)`` changes to their topics; one query per table at most."""
+    subtask_ids = {data["subtask_id"] for _, _, data in changes if data.get("subtask_id") and not data.get("task_id")}
+    subtask_tasks = _parents(session, Subtask, Subtask.task_id, subtask_ids) if subtask_ids else {}
+
+    def task_of(model: Any, data: Dict[str, Any]) -> Optional[int]:
+        if model is Task:
+            return data.get("id")
+        return data.get("task_id") or subtask_tasks.get(data.get("subtask_id"))
+
+    task_ids = {task_of(model, data) for model, _, data in changes if model is not Task} - {None}
+    task_projects = _parents(session, Task, Task.project_id, task_ids) if task_ids else {}
+
+    events = []
+    for model, action, data in changes:
+        entity = ENTITIES[model]
+        topics = set()
+        task_id = task_of(model, data)
+        if task_id is not None:
+            topics.add(f"task:{task_id}")
+            project_id = data.get("project_id") if model is Task else task_projects.get(task_id)
+            if project_id is not None:
+                topics.add(f"project:{project_id}")
+        if model is Project:
+            topics.add(f"project:{data.get('id')}")
+        if model is Ticket:
+            topics.add(f"ticket:{data.get('id')}")
+        if model is Comment and data.get("ticket_id") is not None:
+            topics.add(f"ticket:{data['ticket_id']}")
+        if topics:
+            key = (entity, data.get("id") if data.get("id") is not None else id(data))
+            events.append((key, frozenset(topics), {
+                "type": "change", "entity": entity, "action": action, "id": data.get("id"), "data": data,
+            }))
+    return events
+
+
+def record(db: Session, obj: Any, action: str) -> None:
+    """Add a change the session won't flush itself, e.g. an activity entry
+    queued for the background writer, to the session's next commit."""
+    if broker.active:
+        db.info.setdefault(_UNFLUSHED_KEY, []).append((type(obj), action, _loaded(obj)))
+
+
+def record_rows(db: Session, model: Any, rows: Iterable[Dict[str, Any]], action: str) -> None:
+    """``record`` for rows written by Core statements (see app.crud.bulk_import),
+    given as dicts of their columns, ``id`` included."""
+    if broker.active:
+        db.info.setdefault(_UNFLUSHED_KEY, []).extend((model, action, row) for row in rows)
+
+
+def _add(session: Session, changes: List[Tuple[Any, str, Dict[str, Any]]]) -> None:
+    if changes:
+        session.info.setdefault(_PENDING_KEY, []).extend(_events(session, changes))
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed(session: Session, flush_context) -> None:
+    if not broker.active:
+        return
+    changes = [(obj, "created") for obj in session.new if type(obj) in ENTITIES]
+    changes += [
+        (obj, "updated") for obj in session.dirty
+        if type(obj) in ENTITIES and session.is_modified(obj)
+    ]
+    changes += [(obj, "deleted") for obj in session.deleted if type(obj) in ENTITIES]
+    _add(session, [(type(obj), action, _loaded(obj)) for obj, action in changes])
+
+
+@event.listens_for(Session, "before_commit")
+def _collect_unflushed(session: Session) -> None:
+    changes = session.info.pop(_UNFLUSHED_KEY, None)
+    if changes:
+        _add(session, changes)
+
+
+def encode(events: Iterable[Tuple[Tuple[str, Any], FrozenSet[str], Dict[str, Any]]]) -> List[Tuple[FrozenSet[str], bytes]]:
+    """One message per changed row, with its last state; a row created and
+    then updated in the same transaction is reported as created."""
+    latest: Dict[Tuple[str, Any], Tuple[FrozenSet[str], Dict[str, Any]]] = {}
+    for key, topics, message in events:
+        previous = latest.pop(key, None)
+        if previous is not None and previous[1]["action"] == "created" and message["action"] == "updated":
+            message = {**message, "action": "created"}
+        latest[key] = (topics, message)
+    return [(topics, orjson.dumps(message, default=str)) for topics, message in latest.values()]
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_committed(session: Session) -> None:
+    events = session.info.pop(_PENDING_KEY, None)
+    if not events:
+        return
+    held = session.info.get(HELD_KEY)
+    if held is not None:
+        held.extend(events)
+    else:
+        broker.publish(encode(events))
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_uncommitted(session: Session, transaction) -> None:
+    # Events of a committed transaction were already taken by _publish_committed
+    if transaction.parent is None:
+        session.info.pop(_PENDING_KEY, None)
+        session.info.pop(_UNFLUSHED_KEY, None)
@@ -0,0 +1,129 @@
+"""Change sequence numbers for the delta sync (GET /sync).
+
+Every flush that inserts or updates a row of a SYNCED table stamps it with
+the next number of one global counter (``change_seq``), and every delete
+leaves a ``tombstones`` row with one, as do the synced rows the database
+deletes along with it by ON DELETE CASCADE. A client that remembers the highest
+number it has seen asks for everything above it.
+
+The counter is the single row of ``change_counter``, bumped inside the
+writing transaction. Its row lock makes a concurrent writer wait until
+that transaction ends, so numbers become visible in the order they were
+handed out: every number up to the counter's committed value belongs to
+a committed transaction. Readers take that value first (``high_water``)
+and read nothing above it, so a client never skips past a change that
+commits while it reads. The price is that writes to synced tables are
+serialized from their first flush to their commit.
+
+Core statements that bypass the ORM take their numbers from ``allocate``
+(see app.crud.bulk_import) or write their tombstones with
+``write_tombstones`` themselves.
+"""
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.models.comment import Comment
+from app.models.project import Project
+from app.models.subtask import Subtask
+from app.models.task import Task
+from app.models.ticket import Ticket
+from app.models.tombstone import ChangeCounter, Tombstone
+
+# model -> name reported by /sync and kept in Tombstone.entity
+SYNCED = {
+    Task: "tasks",
+    Subtask: "subtasks",
+    Ticket: "tickets",
+    Comment: "comments",
+    Project: "projects",
+}
+
+
+def allocate(connection: Connection, count: int) -> int:
+    """Reserve ``count`` consecutive sequence numbers; returns the first."""
+    last = connection.execute(
+        update(ChangeCounter)
+        .where(ChangeCounter.id == 1)
+        .values(value=ChangeCounter.value + count)
+        .returning(ChangeCounter.value)
+    ).scalar_one()
+    return last - count + 1
+
+
+def high_water(connection: Connection) -> int:
+    """The counter's committed value; all changes numbered up to it are visible."""
+    return connection.execute(select(ChangeCounter.value).where(ChangeCounter.id == 1)).scalar_one()
+
+
+def _cascades() -> Dict[Any, List[Tuple[Any, Any]]]:
+    tables = {model.__table__: model for model in SYNCED}
+    cascades: Dict[Any, List[Tuple[Any, Any]]] = defaultdict(list)
+    for child in SYNCED:
+        for foreign_key in child.__table__.foreign_keys:
+            parent = tables.get(foreign_key.column.table)
+            if parent is not None and (foreign_key.ondelete or "").upper() == "CASCADE":
+                cascades[parent].append((child, foreign_key.parent))
+    return cascades
+
+
+# parent model -> (child model, foreign key column) for the synced rows the
+# database deletes itself, by ON DELETE CASCADE, when their parent goes
+CASCADES = _cascades()
+
+
+def write_tombstones(connection: Connection, deleted: Dict[Any, Iterable[int]]) -> None:
+    """Tombstones for the ``deleted`` ids of synced models, and for the synced
+    rows the database deletes along with them by ON DELETE CASCADE.
+
+    Call it before the DELETE, while the cascaded rows can still be found.
+    Code deleting rows without the ORM (a bulk ``query.delete()``) must
+    call it itself.
+    """
+    buried: Dict[Any, Set[int]] = {model: set(ids) for model, ids in deleted.items()}
+    frontier = dict(buried)
+    while frontier:
+        found: Dict[Any, Set[int]] = defaultdict(set)
+        for parent, ids in frontier.items():
+            for child, column in CASCADES.get(parent, ()):
+                found[child].update(connection.scalars(select(child.id).where(column.in_(ids))))
+        frontier = {}
+        for child, ids in found.items():
+            new = ids - buried.setdefault(child, set())
+            if new:
+                buried[child] |= new
+                frontier[child] = new
+    rows = [(model, id_) for model, ids in buried.items() for id_ in sorted(ids)]
+    if not rows:
+        return
+    seq = allocate(connection, len(rows))
+    now = datetime.utcnow()
+    connection.execute(insert(Tombstone), [
+        {"entity": SYNCED[model], "entity_id": id_, "change_seq": seq + i, "deleted_at": now}
+        for i, (model, id_) in enumerate(rows)
+    ])
+
+
+@event.listens_for(Session, "before_flush")
+def _stamp_changes(session: Session, flush_context, instances) -> None:
+    changed: List[Any] = [obj for obj in session.new if type(obj) in SYNCED]
+    changed += [obj for obj in session.dirty if type(obj) in SYNCED and session.is_modified(obj)]
+    deleted: Dict[Any, Set[int]] = defaultdict(set)
+    for obj in session.deleted:
+        if type(obj) in SYNCED:
+            deleted[type(obj)].add(obj.id)
+    if not changed and not deleted:
+        return
+    # On the connection, so no autoflush can run from inside the flush
+    connection = session.connection()
+    if changed:
+        seq = allocate(connection, len(changed))
+        for obj in changed:
+            obj.change_seq = seq
+            seq += 1
+    if deleted:
+        write_tombstones(connection, deleted)
@@ -0,0 +1,127 @@
+"""Full-text search indexes for tasks, subtasks, tickets, comments and attachments.
+
+SQLite gets an external-content FTS5 table per source table, kept in sync by
+triggers. PostgreSQL gets a generated ``search_vector`` tsvector column with a
+GIN index. Other backends get nothing and search falls back to ILIKE.
+
+The DDL is installed both by the Alembic migration and by
+``Base.metadata.create_all`` (see the listener at the bottom).
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Connection
+
+from app.db.session import Base
+
+# table -> ((column, weight), ...); weights are tsvector labels, "A" ranks highest
+SEARCH_COLUMNS: Dict[str, Tuple[Tuple[str, str], ...]] = {
+    "tasks": (("title", "A"), ("description", "B")),
+    "subtasks": (("title", "A"), ("description", "B")),
+    "tickets": (("title", "A"), ("description", "B")),
+    "comments": (("content", "A"),),
+    "attachments": (("filename", "A"),),
+}
+
+# Same relative weights as PostgreSQL's ts_rank defaults, for bm25()
+BM25_WEIGHTS = {"A": 1.0, "B": 0.4, "C": 0.2, "D": 0.1}
+
+# "simple" does no stemming, so Russian and English text are tokenized alike
+TS_CONFIG = "simple"
+FTS5_TOKENIZER = "unicode61 remove_diacritics 2"
+
+
+def fts_table(table: str) -> str:
+    return f"{table}_fts"
+
+
+def _sqlite_ddl(table: str, columns: List[str], exists: bool) -> List[str]:
+    fts = fts_table(table)
+    cols = ", ".join(columns)
+    new = ", ".join(f"new.{c}" for c in columns)
+    old = ", ".join(f"old.{c}" for c in columns)
+    statements = [] if exists else [
+        f"CREATE VIRTUAL TABLE {fts} USING fts5("
+        f"{cols}, content='{table}', content_rowid='id', tokenize='{FTS5_TOKENIZER}')",
+        # Index rows that existed before the FTS table
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+    return statements + [
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old}); "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new}); END",
+    ]
+
+
+def _postgresql_ddl(table: str, weighted: Tuple[Tuple[str, str], ...]) -> List[str]:
+    vector = " || ".join(
+        f"setweight(to_tsvector('{TS_CONFIG}', coalesce({column}, '')), '{weight}')"
+        for column, weight in weighted
+    )
+    return [
+        f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        f"GENERATED ALWAYS AS ({vector}) STORED",
+        f"CREATE INDEX IF NOT EXISTS ix_{table}_search_vector ON {table} USING gin (search_vector)",
+    ]
+
+
+def create_full_text_search(bind: Connection, tables: Optional[Iterable[str]] = None) -> None:
+    """Create the search indexes (of ``tables``, default all) for the connection's dialect.
+
+    Safe to re-run. On SQLite, Alembic batch migrations recreate tables and
+    drop their triggers, so re-run this after one touches a table in
+    SEARCH_COLUMNS.
+    """
+    dialect = bind.dialect.name
+    for table in tables or SEARCH_COLUMNS:
+        weighted = SEARCH_COLUMNS[table]
+        if dialect == "sqlite":
+            exists = bind.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                {"name": fts_table(table)},
+            ).first() is not None
+            statements = _sqlite_ddl(table, [column for column, _ in weighted], exists)
+        elif dialect == "postgresql":
+            statements = _postgresql_ddl(table, weighted)
+        else:
+            statements = []
+        for statement in statements:
+            bind.execute(text(statement))
+
+
+def drop_full_text_search(bind: Connection, tables: Optional[Iterable[str]] = None) -> None:
+    dialect = bind.dialect.name
+    for table in tables or SEARCH_COLUMNS:
+        if dialect == "sqlite":
+            fts = fts_table(table)
+            statements = [f"DROP TRIGGER IF EXISTS {fts}_{suffix}" for suffix in ("ai", "ad", "au")]
+            statements.append(f"DROP TABLE IF EXISTS {fts}")
+        elif dialect == "postgresql":
+            statements = [
+                f"DROP INDEX IF EXISTS ix_{table}_search_vector",
+                f"ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector",
+            ]
+        else:
+            statements = []
+        for statement in statements:
+            bind.execute(text(statement))
+
+
+def is_full_text_object(name: str) -> bool:
+    """Whether a reflected table/column/index belongs to the search indexes.
+
+    They live outside the models, so Alembic autogenerate must skip them.
+    """
+    return name == "search_vector" or name.endswith("_search_vector") or any(
+        name == fts_table(table) or name.startswith(f"{fts_table(table)}_")
+        for table in SEARCH_COLUMNS
+    )
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_full_text_search(target, connection: Connection, **kw) -> None:
+    create_full_text_search(connection)
@@ -1,6 +1,10 @@
+from typing import AsyncGenerator, Generator
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import settings
 
@@ -12,10 +16,51 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
-# Dependency to get DB session
-def get_db():
+# Async driver for each backend when SQLALCHEMY_ASYNC is enabled
+ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+}
+
+
+def get_async_database_url(database_uri: str) -> URL:
+    """Swap the driver of a sync database URI for its async counterpart."""
+    url = make_url(database_uri)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for '{backend}'")
+    return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+
+
+async_engine = None
+AsyncSessionLocal = None
+if settings.SQLALCHEMY_ASYNC:
+    async_engine = create_async_engine(get_async_database_url(settings.SQLALCHEMY_DATABASE_URI))
+    # Objects are serialized after the handler returns, outside of the greenlet,
+    # so they must not expire (and lazily reload) on commit.
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, autoflush=False, expire_on_commit=False
+    )
+
+# Dependency to get DB session.
+#
+# This is the request's single unit of work: FastAPI caches a dependency per
+# request, so auth, permission checks and every crud_* call made by the handler
+# share this one session. Sessions begin lazily, so no pool connection is
+# checked out until the first query runs.
+def get_sync_db() -> Generator[Session, None, None]:
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# Depend on this callable only; a second get_db-like dependency would open a
+# second session (and pool connection) for the same request.
+get_db = get_async_db if settings.SQLALCHEMY_ASYNC else get_sync_db
@@ -0,0 +1,86 @@
+"""Background job deleting expired resumable uploads.
+
+Every UPLOAD_CLEANUP_INTERVAL_SECONDS, uploads idle for longer than
+UPLOAD_EXPIRE_SECONDS are deleted along with their partial files, as are
+partial files no upload refers to any more (e.g. left by a crash). Set the
+interval to 0 to disable, and run ``python -m app.db.upload_cleaner`` from
+cron instead.
+"""
+import logging
+import threading
+from typing import Optional
+
+from app.core.config import settings
+from app.core.storage import storage
+from app.crud.crud_upload import upload
+from app.db.session import SessionLocal
+from app.models.upload import Upload
+
+logger = logging.getLogger(__name__)
+
+
+class UploadCleaner:
+    def __init__(self, *, interval: float) -> None:
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="upload-cleaner", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        if not self.running:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def run_once(self) -> int:
+        db = SessionLocal()
+        try:
+            expired = upload.remove_expired(db)
+            partial_dir = storage.partial_path(0).parent
+            names = [path.name for path in partial_dir.iterdir()] if partial_dir.is_dir() else []
+            ids = [int(name) for name in names if name.isdigit()]
+            live = {id_ for id_, in db.query(Upload.id).filter(Upload.id.in_(ids))} if ids else set()
+        finally:
+            db.close()
+        removed = 0
+        for upload_id in set(expired) | (set(ids) - live):
+            storage.discard_partial(upload_id)
+            removed += 1
+        if removed:
+            logger.info("Deleted %d expired uploads", removed)
+        return removed
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception:
+                logger.exception("Upload cleanup failed")
+            self._stop.wait(self.interval)
+
+
+def _cleaner() -> UploadCleaner:
+    return UploadCleaner(interval=settings.UPLOAD_CLEANUP_INTERVAL_SECONDS)
+
+
+upload_cleaner = _cleaner() if settings.UPLOAD_CLEANUP_INTERVAL_SECONDS > 0 else None
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    _cleaner().run_once()
+
+
+if __name__ == "__main__":
+    main()
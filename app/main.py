@@ -1,19 +1,53 @@
-from fastapi import FastAPI, Depends
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.docs import get_swagger_ui_html
-from fastapi.openapi.utils import get_openapi
+from fastapi.responses import ORJSONResponse
 
+from app.core.broker import broker
 from app.core.config import settings
 from app.api.api_v1.api import api_router
+from app.api.openapi import OpenAPIDocument
+from app.api.pagination import NEXT_CURSOR_HEADER, PREV_CURSOR_HEADER
 from app.core.security import get_current_active_user
+from app.db.activity_archiver import activity_archiver
+from app.db.activity_writer import activity_writer
+from app.db.upload_cleaner import upload_cleaner
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build the schema now rather than on the first docs page load
+    openapi_document.refresh()
+    broker.start()
+    if activity_writer is not None:
+        activity_writer.start()
+    if activity_archiver is not None:
+        activity_archiver.start()
+    if upload_cleaner is not None:
+        upload_cleaner.start()
+    yield
+    if upload_cleaner is not None:
+        upload_cleaner.stop()
+    if activity_archiver is not None:
+        activity_archiver.stop()
+    if activity_writer is not None:
+        # Drain queued activity entries before the process exits
+        activity_writer.stop()
+    broker.stop()
+
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     description=settings.PROJECT_DESCRIPTION,
     version=settings.VERSION,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    # Served by get_open_api_endpoint below instead of FastAPI's uncached route
+    openapi_url=None,
     docs_url=None,
     redoc_url=None,
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Set all CORS enabled origins
@@ -24,28 +58,28 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER, PREV_CURSOR_HEADER],
     )
 
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+OPENAPI_URL = f"{settings.API_V1_STR}/openapi.json"
+openapi_document = OpenAPIDocument(app)
+
+
 # Custom docs endpoints with authentication
 @app.get("/docs", include_in_schema=False)
 async def custom_swagger_ui_html():
     return get_swagger_ui_html(
-        openapi_url=app.openapi_url,
+        openapi_url=OPENAPI_URL,
         title=f"{app.title} - Swagger UI",
         oauth2_redirect_url=app.swagger_ui_oauth2_redirect_url,
     )
 
-@app.get("/api/v1/openapi.json", include_in_schema=False)
-async def get_open_api_endpoint():
-    return get_openapi(
-        title=app.title,
-        version=app.version,
-        description=app.description,
-        routes=app.routes,
-    )
+@app.get(OPENAPI_URL, include_in_schema=False)
+async def get_open_api_endpoint(request: Request):
+    return openapi_document.response(request)
 
 @app.get("/", include_in_schema=False)
 async def root():
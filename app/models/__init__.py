@@ -1,10 +1,17 @@
-from .user import User
+from .user import DeletedUser, User
 from .project import Project
 from .task import Task
 from .subtask import Subtask
 from .attachment import Attachment
+from .upload import Upload, UploadChunk
 from .comment import Comment
-from .activity import Activity
+from .activity import Activity, ActivityArchive, ActivityArchiveLock
 from .time_log import TimeLog
 from .ticket import Ticket, TicketStatus, TicketPriority
-from .project_member import ProjectMember, ProjectRole
\ No newline at end of file
+from .project_member import ProjectMember, ProjectRole
+from .tombstone import ChangeCounter, Tombstone
+
+# Registers the full-text search DDL with Base.metadata.create_all
+from app.db import full_text  # noqa: F401
+# Stamps synced rows with change sequence numbers on every flush
+from app.db import change_sequence  # noqa: F401
\ No newline at end of file
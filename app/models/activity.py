@@ -1,7 +1,7 @@
 from datetime import datetime
 import enum
 from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy import JSON, Column, Integer, String, Table, Text, DateTime, ForeignKey, Enum
+from sqlalchemy import DDL, JSON, Column, Integer, LargeBinary, String, Table, Text, DateTime, ForeignKey, Enum, Index, event
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.session import Base
@@ -36,4 +36,50 @@ class Activity(Base):
 
     # связи
     task = relationship("Task", back_populates="activities")
-    subtask = relationship("Subtask", back_populates="activities")
\ No newline at end of file
+    subtask = relationship("Subtask", back_populates="activities")
+
+    # лента активности: фильтр по задаче/подзадаче/пользователю, новые сверху
+    __table_args__ = (
+        Index("ix_activities_task_id_created_at", "task_id", created_at.desc(), id.desc()),
+        Index("ix_activities_subtask_id_created_at", "subtask_id", created_at.desc(), id.desc()),
+        Index("ix_activities_user_id_created_at", "user_id", created_at.desc(), id.desc()),
+    )
+
+
+class ActivityArchive(Base):
+    """Activities older than the retention horizon, one compressed chunk per
+    (month, task, subtask); see CRUDActivity.archive."""
+    __tablename__ = "activity_archive"
+
+    id = Column(Integer, primary_key=True, index=True)
+    # месяц записей, "YYYY-MM"
+    period = Column(String(7), nullable=False)
+    task_id = Column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"), nullable=True)
+    subtask_id = Column(Integer, ForeignKey("subtasks.id", ondelete="CASCADE"), nullable=True)
+
+    row_count = Column(Integer, nullable=False)
+    first_at = Column(DateTime(timezone=True), nullable=False)
+    last_at = Column(DateTime(timezone=True), nullable=False)
+    # zlib-сжатый JSON-список записей
+    payload = Column(LargeBinary, nullable=False)
+
+    __table_args__ = (
+        Index("ix_activity_archive_task_id_period", "task_id", "period"),
+        Index("ix_activity_archive_subtask_id_period", "subtask_id", "period"),
+    )
+
+
+class ActivityArchiveLock(Base):
+    """Locked by every archive batch, so concurrent runs take turns; a single row, id 1."""
+    __tablename__ = "activity_archive_lock"
+
+    id = Column(Integer, primary_key=True)
+    locked_at = Column(DateTime(timezone=True), nullable=True)
+
+
+# единственная строка блокировки: при create_all вставляется здесь, в миграциях — в 0012
+event.listen(
+    ActivityArchiveLock.__table__,
+    "after_create",
+    DDL("INSERT INTO activity_archive_lock (id) VALUES (1)"),
+)
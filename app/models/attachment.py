@@ -1,7 +1,7 @@
 from datetime import datetime
 import enum
 from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy import Column, Integer, String, Table, Text, DateTime, ForeignKey, Enum
+from sqlalchemy import BigInteger, Column, Integer, String, Table, Text, DateTime, ForeignKey, Enum, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.session import Base
@@ -13,7 +13,13 @@ class Attachment(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     filename = Column(String(255), nullable=False)
-    file_url = Column(Text, nullable=False)
+    # ссылка на внешний файл; у загруженных файлов пусто, они лежат в storage
+    file_url = Column(Text, nullable=True)
+
+    # загруженный файл: размер в байтах, SHA-256 (ключ в storage) и MIME-тип
+    size = Column(BigInteger, nullable=True)
+    sha256 = Column(String(64), nullable=True)
+    content_type = Column(String(255), nullable=True)
 
     uploaded_by_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     uploaded_by = relationship("User")
@@ -25,4 +31,11 @@ class Attachment(Base):
 
     # связи
     task = relationship("Task", back_populates="attachments")
-    subtask = relationship("Subtask", back_populates="attachments")
\ No newline at end of file
+    subtask = relationship("Subtask", back_populates="attachments")
+
+    # индексы под запросы crud_*: фильтр + id, по которому идёт пагинация
+    __table_args__ = (
+        Index("ix_attachments_task_id_id", "task_id", "id"),
+        Index("ix_attachments_subtask_id_id", "subtask_id", "id"),
+        Index("ix_attachments_sha256", "sha256"),
+    )
\ No newline at end of file
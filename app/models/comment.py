@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Text, DateTime, ForeignKey
+from sqlalchemy import BigInteger, Column, Integer, Text, DateTime, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.session import Base
@@ -19,4 +19,14 @@ class Comment(Base):
     task = relationship("Task", back_populates="comments")
 
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
\ No newline at end of file
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    # номер последнего изменения строки, для /sync (см. app.db.change_sequence)
+    change_seq = Column(BigInteger, nullable=True)
+
+    # индексы под запросы crud_*: фильтр + id, по которому идёт пагинация
+    __table_args__ = (
+        Index("ix_comments_task_id_id", "task_id", "id"),
+        Index("ix_comments_ticket_id_id", "ticket_id", "id"),
+        # выборка /sync: строки, изменённые после номера
+        Index("ix_comments_change_seq", "change_seq"),
+    )
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Integer, String, Text, DateTime, func
+from sqlalchemy import BigInteger, Column, ForeignKey, Integer, String, Text, DateTime, func, Index
 from sqlalchemy.orm import relationship
 from app.db.session import Base
 
@@ -18,5 +18,14 @@ class Project(Base):
 
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    # номер последнего изменения строки, для /sync (см. app.db.change_sequence)
+    change_seq = Column(BigInteger, nullable=True)
 
-    members = relationship("ProjectMember", back_populates="project")
\ No newline at end of file
+    members = relationship("ProjectMember", back_populates="project")
+
+    # индексы под запросы crud_*: фильтр + id, по которому идёт пагинация
+    __table_args__ = (
+        Index("ix_projects_created_by_id_id", "created_by_id", "id"),
+        # выборка /sync: строки, изменённые после номера
+        Index("ix_projects_change_seq", "change_seq"),
+    )
\ No newline at end of file
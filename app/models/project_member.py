@@ -1,6 +1,6 @@
 from datetime import datetime
 import enum
-from sqlalchemy import Column, Integer, Text, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, Text, DateTime, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.session import Base
@@ -41,4 +41,6 @@ class ProjectMember(Base):
 
     __table_args__ = (
         UniqueConstraint("user_id", "project_id", name="uq_project_user"),
+        # uq_project_user начинается с user_id, а участников ищут по проекту
+        Index("ix_project_members_project_id_id", "project_id", "id"),
     )
\ No newline at end of file
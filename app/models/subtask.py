@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Table, Text, DateTime, ForeignKey, Enum
+from sqlalchemy import BigInteger, Column, Integer, String, Table, Text, DateTime, ForeignKey, Enum, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import enum
@@ -12,6 +12,7 @@ subtask_assignees = Table(
     Base.metadata,
     Column("subtask_id", Integer, ForeignKey("subtasks.id", ondelete="CASCADE"), primary_key=True),
     Column("user_id", Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+    Index("ix_subtask_assignees_user_id_subtask_id", "user_id", "subtask_id"),
 )
 
 class Subtask(Base):
@@ -31,13 +32,16 @@ class Subtask(Base):
     # Self-reference (иерархия подзадач)
     parent_id = Column(Integer, ForeignKey("subtasks.id", ondelete="CASCADE"), nullable=True)
     parent = relationship("Subtask", remote_side="Subtask.id", back_populates="children")
-    children = relationship("Subtask", back_populates="parent", cascade="all, delete-orphan")
+    # Грузим сразу, см. Task.assignees; списки и get собирают всё дерево
+    # одним запросом в CRUDSubtask.load_related
+    children = relationship("Subtask", back_populates="parent", cascade="all, delete-orphan", lazy="selectin")
 
-    # исполнители
+    # исполнители (грузим сразу, см. Task.assignees)
     assignees = relationship(
         "User",
         secondary="subtask_assignees",
         back_populates="assigned_subtasks",
+        lazy="selectin",
     )
 
     due_date = Column(DateTime(timezone=True), nullable=True)
@@ -45,7 +49,22 @@ class Subtask(Base):
 
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    # номер последнего изменения строки, для /sync (см. app.db.change_sequence)
+    change_seq = Column(BigInteger, nullable=True)
 
     activities = relationship("Activity", back_populates="subtask", cascade="all, delete-orphan")
     attachments = relationship("Attachment", back_populates="subtask", cascade="all, delete-orphan")
-    time_logs = relationship("TimeLog", back_populates="subtask", cascade="all, delete-orphan")
\ No newline at end of file
+    time_logs = relationship("TimeLog", back_populates="subtask", cascade="all, delete-orphan")
+
+    # индексы под запросы crud_*: фильтр + id, по которому идёт пагинация
+    __table_args__ = (
+        Index("ix_subtasks_task_id_id", "task_id", "id"),
+        # подгрузка children (WHERE parent_id IN ...)
+        Index("ix_subtasks_parent_id", "parent_id"),
+        # выборка /sync: строки, изменённые после номера
+        Index("ix_subtasks_change_seq", "change_seq"),
+    )
+
+    @property
+    def assignee_ids(self) -> list[int]:
+        return [user.id for user in self.assignees]
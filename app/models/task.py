@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Table, Text, DateTime, ForeignKey, Enum
+from sqlalchemy import BigInteger, Column, Integer, String, Table, Text, DateTime, ForeignKey, Enum, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import enum
@@ -25,6 +25,8 @@ task_assignees = Table(
     Base.metadata,
     Column("task_id", Integer, ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True),
     Column("user_id", Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+    # PK начинается с task_id; для "задачи пользователя" нужен обратный порядок
+    Index("ix_task_assignees_user_id_task_id", "user_id", "task_id"),
 )
 
 
@@ -47,10 +49,13 @@ class Task(Base):
 
     created_by = relationship("User", foreign_keys=[created_by_id], back_populates="created_tasks")
 
+    # Грузим сразу: assignee_ids есть в каждом ответе, а AsyncSession
+    # не может делать lazy-load после выхода из обработчика
     assignees = relationship(
         "User",
         secondary=task_assignees,
         back_populates="assigned_tasks",
+        lazy="selectin",
     )
 
     # Таймштампы
@@ -58,6 +63,8 @@ class Task(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     due_date = Column(DateTime(timezone=True), nullable=True)
     completed_at = Column(DateTime(timezone=True), nullable=True)
+    # номер последнего изменения строки, для /sync (см. app.db.change_sequence)
+    change_seq = Column(BigInteger, nullable=True)
 
     comments = relationship("Comment", back_populates="task", cascade="all, delete-orphan")
     subtasks = relationship("Subtask", back_populates="task", cascade="all, delete-orphan")
@@ -66,6 +73,14 @@ class Task(Base):
     attachments = relationship("Attachment", back_populates="task", cascade="all, delete-orphan")
     time_logs = relationship("TimeLog", back_populates="task", cascade="all, delete-orphan")
 
+    # индексы под запросы crud_*: фильтр + id, по которому идёт пагинация
+    __table_args__ = (
+        Index("ix_tasks_project_id_id", "project_id", "id"),
+        Index("ix_tasks_status_id", "status", "id"),
+        # выборка /sync: строки, изменённые после номера
+        Index("ix_tasks_change_seq", "change_seq"),
+    )
+
     @property
     def assignee_ids(self) -> list[int]:
         return [user.id for user in self.assignees]
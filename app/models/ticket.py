@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, Text
+from sqlalchemy import BigInteger, Column, Integer, String, DateTime, ForeignKey, Enum, Text, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import enum
@@ -41,5 +41,16 @@ class Ticket(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     closed_at = Column(DateTime(timezone=True), nullable=True)
-
-    comments = relationship("Comment", back_populates="ticket", cascade="all, delete-orphan")
\ No newline at end of file
+    # номер последнего изменения строки, для /sync (см. app.db.change_sequence)
+    change_seq = Column(BigInteger, nullable=True)
+
+    comments = relationship("Comment", back_populates="ticket", cascade="all, delete-orphan")
+
+    # индексы под запросы crud_*: фильтр + id, по которому идёт пагинация
+    __table_args__ = (
+        Index("ix_tickets_status_id", "status", "id"),
+        Index("ix_tickets_created_by_id_id", "created_by_id", "id"),
+        Index("ix_tickets_assigned_to_id_id", "assigned_to_id", "id"),
+        # выборка /sync: строки, изменённые после номера
+        Index("ix_tickets_change_seq", "change_seq"),
+    )
\ No newline at end of file
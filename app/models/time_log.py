@@ -1,7 +1,7 @@
 from datetime import datetime
 import enum
 from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy import Column, Integer, String, Table, Text, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Table, Text, DateTime, ForeignKey, Enum, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.session import Base
@@ -25,4 +25,10 @@ class TimeLog(Base):
 
     # связи
     task = relationship("Task", back_populates="time_logs")
-    subtask = relationship("Subtask", back_populates="time_logs")
\ No newline at end of file
+    subtask = relationship("Subtask", back_populates="time_logs")
+
+    # индексы под запросы crud_*: фильтр + id, по которому идёт пагинация
+    __table_args__ = (
+        Index("ix_time_logs_task_id_id", "task_id", "id"),
+        Index("ix_time_logs_subtask_id_id", "subtask_id", "id"),
+    )
\ No newline at end of file
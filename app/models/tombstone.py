@@ -0,0 +1,31 @@
+from datetime import datetime
+from sqlalchemy import DDL, BigInteger, Column, DateTime, Integer, String, event
+from app.db.session import Base
+
+
+class ChangeCounter(Base):
+    """The last change sequence number handed out; a single row, id 1."""
+    __tablename__ = "change_counter"
+
+    id = Column(Integer, primary_key=True)
+    value = Column(BigInteger, nullable=False)
+
+
+# единственная строка счётчика: при create_all вставляется здесь, в миграциях — в 0010
+event.listen(
+    ChangeCounter.__table__,
+    "after_create",
+    DDL("INSERT INTO change_counter (id, value) VALUES (1, 0)"),
+)
+
+
+class Tombstone(Base):
+    """A deleted row of a synced table, for /sync to report."""
+    __tablename__ = "tombstones"
+
+    id = Column(Integer, primary_key=True)
+    # имя таблицы удалённой строки: tasks, subtasks, tickets, comments, projects
+    entity = Column(String(32), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    change_seq = Column(BigInteger, nullable=False, index=True)
+    deleted_at = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
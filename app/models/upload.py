@@ -0,0 +1,60 @@
+from datetime import datetime
+from typing import List, Tuple
+from sqlalchemy import BigInteger, Column, Integer, String, DateTime, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from app.db.session import Base
+
+
+class Upload(Base):
+    """A resumable upload in progress; becomes an Attachment once complete."""
+    __tablename__ = "uploads"
+
+    id = Column(Integer, primary_key=True, index=True)
+    filename = Column(String(255), nullable=False)
+    content_type = Column(String(255), nullable=False)
+    # полный размер файла, заявленный при создании
+    size = Column(BigInteger, nullable=False)
+    # ожидаемый SHA-256, если клиент его прислал; сверяется при завершении
+    sha256 = Column(String(64), nullable=True)
+
+    task_id = Column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"), nullable=True)
+    subtask_id = Column(Integer, ForeignKey("subtasks.id", ondelete="CASCADE"), nullable=True)
+
+    created_by_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+
+    created_at = Column(DateTime(timezone=True), default=datetime.utcnow)
+    # продлевается каждым принятым куском; просроченные удаляет upload_cleaner
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+
+    # Грузим сразу: received есть в каждом ответе
+    chunks = relationship("UploadChunk", cascade="all, delete-orphan", lazy="selectin")
+
+    __table_args__ = (
+        Index("ix_uploads_expires_at", "expires_at"),
+    )
+
+    @property
+    def received(self) -> List[Tuple[int, int]]:
+        """Byte ranges ``[start, end)`` received so far, merged and in order."""
+        ranges: List[Tuple[int, int]] = []
+        for chunk in sorted(self.chunks, key=lambda chunk: chunk.offset):
+            end = chunk.offset + chunk.length
+            if ranges and chunk.offset <= ranges[-1][1]:
+                ranges[-1] = (ranges[-1][0], max(ranges[-1][1], end))
+            else:
+                ranges.append((chunk.offset, end))
+        return ranges
+
+
+class UploadChunk(Base):
+    """A byte range of an Upload fully written to its partial file."""
+    __tablename__ = "upload_chunks"
+
+    id = Column(Integer, primary_key=True)
+    upload_id = Column(Integer, ForeignKey("uploads.id", ondelete="CASCADE"), nullable=False)
+    offset = Column(BigInteger, nullable=False)
+    length = Column(BigInteger, nullable=False)
+
+    __table_args__ = (
+        Index("ix_upload_chunks_upload_id", "upload_id"),
+    )
@@ -14,6 +14,8 @@ class User(Base):
     full_name = Column(String, index=True)
     is_active = Column(Boolean, default=True)
     is_superuser = Column(Boolean, default=False)
+    # Увеличивается, когда меняются данные из claims токена; старые токены отзываются
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     avatar_url = Column(String(255), nullable=True)
@@ -32,4 +34,13 @@ class User(Base):
     )
     projects = relationship("Project", back_populates="created_by", cascade="all, delete-orphan")
     comments = relationship("Comment", back_populates="user", cascade="all, delete-orphan")
-    projects_member = relationship("ProjectMember", back_populates="user")
\ No newline at end of file
+    projects_member = relationship("ProjectMember", back_populates="user")
+
+class DeletedUser(Base):
+    """Token version a deleted user's tokens stay revoked below, for every process."""
+    __tablename__ = "deleted_users"
+
+    # без внешнего ключа: строка пользователя уже удалена
+    user_id = Column(Integer, primary_key=True)
+    token_version = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime(timezone=True), server_default=func.now())
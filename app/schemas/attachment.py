@@ -6,13 +6,15 @@ from pydantic import BaseModel
 
 class AttachmentBase(BaseModel):
     filename: str
-    file_url: str
+    # empty for uploaded files, which are kept in the attachment storage
+    file_url: Optional[str] = None
     task_id: Optional[int] = None
     subtask_id: Optional[int] = None
 
 
+# A link to a file hosted elsewhere
 class AttachmentCreate(AttachmentBase):
-    pass
+    file_url: str
 
 
 class AttachmentUpdate(BaseModel):
@@ -24,6 +26,9 @@ class AttachmentRead(AttachmentBase):
     id: int
     uploaded_by_id: int
     uploaded_at: datetime
+    size: Optional[int] = None
+    sha256: Optional[str] = None
+    content_type: Optional[str] = None
 
     class Config:
         orm_mode = True
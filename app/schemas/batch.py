@@ -0,0 +1,53 @@
+from typing import Any, Dict, List, Optional
+import enum
+
+from pydantic import BaseModel, Field
+
+MAX_BATCH_OPERATIONS = 100
+
+
+class BatchEntity(str, enum.Enum):
+    TASK = "task"
+    SUBTASK = "subtask"
+    TICKET = "ticket"
+    COMMENT = "comment"
+
+
+class BatchAction(str, enum.Enum):
+    CREATE = "create"
+    UPDATE = "update"
+    # tasks and subtasks are completed, tickets closed
+    COMPLETE = "complete"
+
+
+class BatchMode(str, enum.Enum):
+    # any failure rolls back the whole batch
+    ATOMIC = "atomic"
+    # failed operations are rolled back on their own, the rest is committed
+    BEST_EFFORT = "best_effort"
+
+
+class BatchOperation(BaseModel):
+    entity: BatchEntity
+    action: BatchAction
+    # target of update and complete
+    id: Optional[int] = None
+    # body of the matching single-item endpoint (TaskCreate, TaskUpdate, ...)
+    data: Dict[str, Any] = {}
+
+
+class BatchRequest(BaseModel):
+    mode: BatchMode = BatchMode.ATOMIC
+    operations: List[BatchOperation] = Field(..., max_length=MAX_BATCH_OPERATIONS)
+
+
+class BatchOperationResult(BaseModel):
+    # status code the single-item endpoint would have answered with
+    status: int
+    data: Optional[Dict[str, Any]] = None
+    detail: Optional[Any] = None
+
+
+class BatchResult(BaseModel):
+    committed: bool
+    results: List[BatchOperationResult]
@@ -0,0 +1,44 @@
+from typing import Annotated, Any, List, Literal, Optional, Union
+
+from pydantic import BaseModel, Field
+
+from app.schemas.subtask import SubtaskBase
+from app.schemas.task import TaskCreate
+from app.schemas.ticket import TicketCreate
+
+
+# One NDJSON line of an import. `ref` names the created row so later lines
+# can point at it (task_ref, parent_ref) before its id is known.
+class TaskImport(TaskCreate):
+    type: Literal["task"]
+    ref: Optional[str] = None
+
+
+class SubtaskImport(SubtaskBase):
+    type: Literal["subtask"]
+    ref: Optional[str] = None
+    assignee_ids: Optional[List[int]] = None
+    # an existing task, or one imported on an earlier line
+    task_id: Optional[int] = None
+    task_ref: Optional[str] = None
+    parent_ref: Optional[str] = None
+
+
+class TicketImport(TicketCreate):
+    type: Literal["ticket"]
+
+
+ImportLine = Annotated[Union[TaskImport, SubtaskImport, TicketImport], Field(discriminator="type")]
+
+
+class ImportRowError(BaseModel):
+    line: int
+    ref: Optional[str] = None
+    detail: Any
+
+
+class ImportResult(BaseModel):
+    tasks: int = 0
+    subtasks: int = 0
+    tickets: int = 0
+    errors: List[ImportRowError] = []
@@ -33,6 +33,11 @@ class Comment(CommentInDBBase):
     pass
 
 
+class CommentSearchResult(Comment):
+    score: float
+    snippet: Optional[str] = None
+
+
 class CommentInDB(CommentInDBBase):
     pass
 
@@ -0,0 +1,13 @@
+import enum
+
+
+class ExportEntity(str, enum.Enum):
+    TASKS = "tasks"
+    TICKETS = "tickets"
+    TIME_LOGS = "time_logs"
+    ACTIVITIES = "activities"
+
+
+class ExportFormat(str, enum.Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
@@ -0,0 +1,24 @@
+from typing import Optional
+import enum
+
+from pydantic import BaseModel
+
+
+class SearchType(str, enum.Enum):
+    TASK = "task"
+    SUBTASK = "subtask"
+    TICKET = "ticket"
+    COMMENT = "comment"
+    ATTACHMENT = "attachment"
+
+
+class SearchHit(BaseModel):
+    type: SearchType
+    id: int
+    score: float
+    # matched text with the hits wrapped in <mark>
+    snippet: Optional[str] = None
+    # task/subtask/ticket title or attachment filename
+    title: Optional[str] = None
+    task_id: Optional[int] = None
+    ticket_id: Optional[int] = None
@@ -0,0 +1,47 @@
+from typing import List, Optional
+from datetime import datetime
+from pydantic import BaseModel
+
+from app.models.task import TaskPriority, TaskStatus
+from app.schemas.comment import Comment
+from app.schemas.project import Project
+from app.schemas.task import Task
+from app.schemas.ticket import Ticket
+
+
+class SyncSubtask(BaseModel):
+    """A subtask as /sync sends it: flat, with task_id instead of its children tree."""
+    id: int
+    task_id: Optional[int]
+    parent_id: Optional[int]
+    title: str
+    description: Optional[str]
+    status: TaskStatus
+    priority: TaskPriority
+    due_date: Optional[datetime]
+    completed_at: Optional[datetime]
+    created_at: datetime
+    updated_at: datetime
+    assignee_ids: List[int] = []
+
+
+class SyncDeleted(BaseModel):
+    """Ids of rows deleted since the token."""
+    tasks: List[int] = []
+    subtasks: List[int] = []
+    tickets: List[int] = []
+    comments: List[int] = []
+    projects: List[int] = []
+
+
+class SyncResult(BaseModel):
+    # pass it as ``since`` on the next call
+    token: str
+    # more changes are waiting: call again right away with the new token
+    has_more: bool
+    tasks: List[Task] = []
+    subtasks: List[SyncSubtask] = []
+    tickets: List[Ticket] = []
+    comments: List[Comment] = []
+    projects: List[Project] = []
+    deleted: SyncDeleted = SyncDeleted()
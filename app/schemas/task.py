@@ -2,6 +2,10 @@ from typing import Optional, List
 from datetime import datetime
 from pydantic import BaseModel
 from app.models.task import TaskPriority, TaskStatus
+from app.schemas.attachment import AttachmentRead
+from app.schemas.comment import Comment
+from app.schemas.subtask import Subtask
+from app.schemas.time_log import TimeLogRead
 
 
 class TaskBase(BaseModel):
@@ -42,6 +46,20 @@ class Task(TaskInDBBase):
     pass
 
 
+# expand= on task lists: the field added to each task -> schema of its items
+TASK_EXPANSIONS = {
+    "subtasks": Subtask,
+    "comments": Comment,
+    "attachments": AttachmentRead,
+    "time_logs": TimeLogRead,
+}
+
+
+class TaskSearchResult(Task):
+    score: float
+    snippet: Optional[str] = None
+
+
 class TaskInDB(TaskInDBBase):
     pass
 
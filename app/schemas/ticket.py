@@ -43,6 +43,12 @@ class Ticket(TicketInDBBase):
     pass
 
 
+# Full-text search hit: rank and the matched text with hits in <mark>
+class TicketSearchResult(Ticket):
+    score: float
+    snippet: Optional[str] = None
+
+
 # Properties stored in DB
 class TicketInDB(TicketInDBBase):
     pass
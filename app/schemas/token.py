@@ -9,4 +9,15 @@ class Token(BaseModel):
 
 class TokenPayload(BaseModel):
     sub: Optional[str] = None
-    exp: Optional[int] = None
\ No newline at end of file
+    exp: Optional[int] = None
+    is_active: Optional[bool] = None
+    is_superuser: Optional[bool] = None
+    ver: Optional[int] = None
+
+
+class TokenUser(BaseModel):
+    """Caller identity taken from verified token claims, without a DB lookup."""
+    id: int
+    is_active: bool
+    is_superuser: bool
+    ver: int
\ No newline at end of file
@@ -0,0 +1,31 @@
+from typing import Optional, List, Tuple
+from datetime import datetime
+from pydantic import BaseModel, Field
+
+
+class UploadCreate(BaseModel):
+    filename: str
+    size: int = Field(..., ge=0)
+    content_type: Optional[str] = None
+    # checked against the received file before it becomes an attachment
+    sha256: Optional[str] = Field(None, pattern="^[0-9a-f]{64}$")
+    task_id: Optional[int] = None
+    subtask_id: Optional[int] = None
+
+
+class UploadRead(BaseModel):
+    id: int
+    filename: str
+    content_type: str
+    size: int
+    sha256: Optional[str] = None
+    task_id: Optional[int] = None
+    subtask_id: Optional[int] = None
+    created_by_id: int
+    created_at: datetime
+    expires_at: datetime
+    # [start, end) byte ranges received so far
+    received: List[Tuple[int, int]]
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,62 @@
+import os
+import tempfile
+from typing import Dict, Generator
+
+import pytest
+
+# Before the app is imported: settings and engines are built at import time
+TMP_DIR = tempfile.mkdtemp()
+os.environ.setdefault("SQLALCHEMY_DATABASE_URI", f"sqlite:///{TMP_DIR}/test.db")
+os.environ.setdefault("ATTACHMENT_STORAGE_DIR", f"{TMP_DIR}/attachments")
+# Idle change streams ping this often, which is when a test stops reading
+os.environ.setdefault("CHANGE_STREAM_HEARTBEAT_SECONDS", "0.5")
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+import app.models  # noqa: E402,F401
+from app.core.config import settings  # noqa: E402
+from app.db.session import Base, SessionLocal, engine  # noqa: E402
+from app.main import app as api  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+
+@pytest.fixture(scope="session", autouse=True)
+def schema() -> Generator[None, None, None]:
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def db() -> Generator[Session, None, None]:
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def user(db: Session) -> User:
+    count = db.query(User).count()
+    user = User(email=f"user{count}@example.com", username=f"user{count}", hashed_password="x")
+    db.add(user)
+    db.commit()
+    return user
+
+
+@pytest.fixture(scope="session")
+def client(schema: None) -> Generator[TestClient, None, None]:
+    with TestClient(api) as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def superuser_headers(client: TestClient) -> Dict[str, str]:
+    prefix = settings.API_V1_STR
+    client.post(f"{prefix}/auth/register", json={
+        "email": "admin@example.com", "username": "admin", "password": "admin", "is_superuser": True,
+    })
+    response = client.post(f"{prefix}/auth/login", data={"username": "admin", "password": "admin"})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
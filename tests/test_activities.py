@@ -0,0 +1,84 @@
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict
+
+import pytest
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crud import crud_activity
+from app.crud.crud_activity import activity
+from app.db.session import SessionLocal
+from app.models.activity import Activity, ActivityArchive, ActivityType
+from app.models.task import Task
+from app.models.user import User
+
+
+def test_archived_entries_stay_readable_from_every_feed(
+    client: TestClient, db: Session, superuser_headers: Dict[str, str],
+) -> None:
+    prefix = settings.API_V1_STR
+    project = client.post(f"{prefix}/projects/", json={"name": "archived"}, headers=superuser_headers).json()
+    task = client.post(f"{prefix}/tasks/", json={"title": "old", "project_id": project["id"]}, headers=superuser_headers).json()
+    subtask = client.post(f"{prefix}/subtasks/", json={"title": "old", "task_id": task["id"]}, headers=superuser_headers).json()
+    activity.archive(db, before=datetime.utcnow() + timedelta(minutes=1))
+
+    def archived(path: str, **params) -> list:
+        response = client.get(f"{prefix}/activities/{path}/archive", params=params, headers=superuser_headers)
+        assert response.status_code == 200, response.text
+        return [(entry["task_id"], entry["subtask_id"]) for entry in response.json()]
+
+    assert (task["id"], None) in archived(f"task/{task['id']}")
+    assert archived(f"subtask/{subtask['id']}") == [(None, subtask["id"])]
+    assert archived(f"project/{project['id']}") == [(None, subtask["id"]), (task["id"], None)]
+    user_id = client.get(f"{prefix}/users/me", headers=superuser_headers).json()["id"]
+    assert (None, subtask["id"]) in archived(f"user/{user_id}")
+    assert archived(f"user/{user_id}", until=(datetime.utcnow() - timedelta(days=1)).isoformat()) == []
+    assert archived(f"project/{project['id']}", action_type="commented") == []
+
+    response = client.get(f"{prefix}/export/activities", params={"project_id": project["id"]}, headers=superuser_headers)
+    exported = [json.loads(line) for line in response.text.splitlines()]
+    assert {(entry["task_id"], entry["subtask_id"]) for entry in exported} == {(task["id"], None), (None, subtask["id"])}
+
+
+def test_concurrent_archive_runs_archive_each_entry_once(
+    db: Session, user: User, monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    task = Task(title="busy", created_by_id=user.id)
+    db.add(task)
+    db.commit()
+    db.add_all(Activity(task_id=task.id, user_id=user.id, action_type=ActivityType.UPDATED) for _ in range(20))
+    db.commit()
+    before = datetime.utcnow() + timedelta(minutes=1)
+
+    # The first run pauses once it has read its batch; the second starts then
+    read = threading.Event()
+    archive_entry = crud_activity._archive_entry
+
+    def slow_archive_entry(row: Activity) -> dict:
+        if not read.is_set():
+            read.set()
+            time.sleep(0.5)
+        return archive_entry(row)
+
+    monkeypatch.setattr(crud_activity, "_archive_entry", slow_archive_entry)
+
+    def run() -> None:
+        session = SessionLocal()
+        try:
+            activity.archive(session, before=before)
+        finally:
+            session.close()
+
+    first = threading.Thread(target=run)
+    first.start()
+    read.wait()
+    run()
+    first.join()
+
+    chunks = db.query(ActivityArchive).filter(ActivityArchive.task_id == task.id).all()
+    assert [chunk.row_count for chunk in chunks] == [20]
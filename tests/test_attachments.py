@@ -0,0 +1,83 @@
+import hashlib
+import os
+from typing import Dict
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.downloads import RangeFileResponse
+from app.core.config import settings
+from app.core.storage import storage
+
+
+def upload(client: TestClient, headers: Dict[str, str], filename: str, content: bytes) -> int:
+    response = client.post(
+        f"{settings.API_V1_STR}/attachments/upload/raw", params={"filename": filename}, content=content, headers=headers,
+    )
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+@pytest.mark.parametrize("filename", ["page.html", "image.svg"])
+def test_scriptable_files_are_never_served_inline(client: TestClient, superuser_headers: Dict[str, str], filename: str) -> None:
+    attachment_id = upload(client, superuser_headers, filename, b"<script>alert(1)</script>")
+    response = client.get(
+        f"{settings.API_V1_STR}/attachments/{attachment_id}/content", params={"inline": True}, headers=superuser_headers,
+    )
+    assert response.status_code == 200
+    assert response.headers["content-disposition"].startswith("attachment;")
+    assert response.headers["x-content-type-options"] == "nosniff"
+    assert response.headers["content-security-policy"] == "sandbox"
+
+
+def test_images_are_served_inline_on_request(client: TestClient, superuser_headers: Dict[str, str]) -> None:
+    attachment_id = upload(client, superuser_headers, "photo.png", b"\x89PNG\r\n\x1a\n")
+    url = f"{settings.API_V1_STR}/attachments/{attachment_id}/content"
+    assert client.get(url, headers=superuser_headers).headers["content-disposition"].startswith("attachment;")
+    response = client.get(url, params={"inline": True}, headers=superuser_headers)
+    assert response.headers["content-disposition"].startswith("inline;")
+    assert response.headers["x-content-type-options"] == "nosniff"
+
+
+@pytest.mark.parametrize("target", ["task_id", "subtask_id"])
+def test_files_for_a_missing_target_are_refused_unread(client: TestClient, superuser_headers: Dict[str, str], target: str) -> None:
+    content = f"for a missing {target}".encode()
+    prefix = settings.API_V1_STR
+    response = client.post(
+        f"{prefix}/attachments/upload/raw", params={"filename": "a.txt", target: 424242}, content=content, headers=superuser_headers,
+    )
+    assert response.status_code == 404
+    response = client.post(
+        f"{prefix}/attachments/upload", params={target: 424242}, files={"file": ("a.txt", content)}, headers=superuser_headers,
+    )
+    assert response.status_code == 404
+    assert not storage.exists(hashlib.sha256(content).hexdigest())
+
+
+def test_multiple_ranges_are_sent_as_multipart_byteranges(client: TestClient, superuser_headers: Dict[str, str]) -> None:
+    attachment_id = upload(client, superuser_headers, "digits.txt", b"0123456789abcdef")
+    response = client.get(
+        f"{settings.API_V1_STR}/attachments/{attachment_id}/content",
+        headers={**superuser_headers, "Range": "bytes=0-3,10-11"},
+    )
+    assert response.status_code == 206
+    media_type, _, boundary = response.headers["content-type"].partition("; boundary=")
+    assert media_type == "multipart/byteranges" and "content-range" not in response.headers
+    assert response.content == (
+        f"--{boundary}\r\nContent-Type: text/plain; charset=utf-8\r\nContent-Range: bytes 0-3/16\r\n\r\n0123\r\n"
+        f"--{boundary}\r\nContent-Type: text/plain; charset=utf-8\r\nContent-Range: bytes 10-11/16\r\n\r\nab\r\n"
+        f"--{boundary}--\r\n"
+    ).encode()
+    assert int(response.headers["content-length"]) == len(response.content)
+
+
+def test_a_file_truncated_after_stat_aborts_the_response(tmp_path) -> None:
+    path = tmp_path / "file"
+    path.write_bytes(b"x" * 100)
+    stat_result = os.stat(path)
+    path.write_bytes(b"x" * 10)
+    api = FastAPI()
+    api.get("/file")(lambda: RangeFileResponse(path, stat_result=stat_result))
+    with TestClient(api) as client, pytest.raises(OSError):
+        client.get("/file", headers={"Range": "bytes=0-4,50-59"})
@@ -0,0 +1,71 @@
+from typing import Dict, List
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import engine
+from app.models.task import Task
+
+
+def create_task(client: TestClient, headers: Dict[str, str], title: str) -> int:
+    response = client.post(f"{settings.API_V1_STR}/tasks/", json={"title": title}, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+def run(client: TestClient, headers: Dict[str, str], mode: str, operations: List[dict]) -> dict:
+    response = client.post(f"{settings.API_V1_STR}/batch/", json={"mode": mode, "operations": operations}, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def operations(task_id: int, title: str) -> List[dict]:
+    # the middle one fails: there is no such task
+    return [
+        {"entity": "task", "action": "update", "id": task_id, "data": {"title": "renamed"}},
+        {"entity": "task", "action": "update", "id": 424242, "data": {"title": "missing"}},
+        {"entity": "task", "action": "create", "data": {"title": title}},
+    ]
+
+
+def test_a_batch_commits_once(client: TestClient, superuser_headers: Dict[str, str]) -> None:
+    task_id = create_task(client, superuser_headers, "once")
+    commits = []
+    listener = lambda connection: commits.append(connection)  # noqa: E731
+    event.listen(engine, "commit", listener)
+    try:
+        result = run(client, superuser_headers, "atomic", [
+            {"entity": "task", "action": "update", "id": task_id, "data": {"title": "renamed"}},
+            {"entity": "task", "action": "complete", "id": task_id},
+            {"entity": "task", "action": "create", "data": {"title": "next"}},
+        ])
+    finally:
+        event.remove(engine, "commit", listener)
+    assert result["committed"]
+    assert [entry["status"] for entry in result["results"]] == [200, 200, 200]
+    # The crud_* commits only released savepoints
+    assert len(commits) == 1
+
+
+def test_an_atomic_batch_rolls_back_the_operations_before_a_failure(
+    client: TestClient, db: Session, superuser_headers: Dict[str, str],
+) -> None:
+    task_id = create_task(client, superuser_headers, "atomic")
+    result = run(client, superuser_headers, "atomic", operations(task_id, "never created"))
+    assert not result["committed"]
+    assert [entry["status"] for entry in result["results"]] == [424, 404, 424]
+    assert db.get(Task, task_id).title == "atomic"
+    assert db.query(Task).filter(Task.title == "never created").count() == 0
+
+
+def test_a_best_effort_batch_keeps_the_operations_that_succeeded(
+    client: TestClient, db: Session, superuser_headers: Dict[str, str],
+) -> None:
+    task_id = create_task(client, superuser_headers, "best effort")
+    result = run(client, superuser_headers, "best_effort", operations(task_id, "created anyway"))
+    assert result["committed"]
+    assert [entry["status"] for entry in result["results"]] == [200, 404, 200]
+    assert db.get(Task, task_id).title == "renamed"
+    assert db.query(Task).filter(Task.title == "created anyway").count() == 1
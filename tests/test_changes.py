@@ -0,0 +1,38 @@
+import json
+from typing import Any, Dict, List
+
+from fastapi.testclient import TestClient
+from starlette.testclient import WebSocketTestSession
+
+from app.core.config import settings
+
+
+def until_ping(websocket: WebSocketTestSession) -> List[Dict[str, Any]]:
+    """The messages received before the next heartbeat."""
+    messages = []
+    while True:
+        message = websocket.receive_json()
+        if message["type"] == "ping":
+            return messages
+        messages.append(message)
+
+
+def test_bulk_import_publishes_created_events(client: TestClient, superuser_headers: Dict[str, str]) -> None:
+    prefix = settings.API_V1_STR
+    project = client.post(f"{prefix}/projects/", json={"name": "imported"}, headers=superuser_headers).json()
+    token = superuser_headers["Authorization"].split(" ", 1)[1]
+    body = "\n".join(json.dumps(line) for line in [
+        {"type": "task", "ref": "t", "title": "imported task", "project_id": project["id"]},
+        {"type": "subtask", "task_ref": "t", "title": "imported subtask"},
+    ])
+    with client.websocket_connect(f"{prefix}/changes/ws?project_id={project['id']}&access_token={token}") as websocket:
+        response = client.post(
+            f"{prefix}/import/", content=body, headers={**superuser_headers, "Content-Type": "application/x-ndjson"},
+        )
+        assert response.status_code == 200, response.text
+        messages = until_ping(websocket)
+
+    created = {(message["entity"], message["action"]) for message in messages}
+    assert {("task", "created"), ("subtask", "created"), ("activity", "created")} <= created
+    task_event = next(message for message in messages if message["entity"] == "task")
+    assert task_event["id"] is not None and task_event["data"]["title"] == "imported task"
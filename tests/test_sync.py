@@ -0,0 +1,104 @@
+from typing import Dict, List
+
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+
+from app.crud.crud_ticket import ticket
+from app.crud.sync import changes_since
+from app.db.change_sequence import write_tombstones
+from app.db.session import SessionLocal
+from app.models.comment import Comment
+from app.models.subtask import Subtask
+from app.models.task import Task
+from app.models.ticket import Ticket
+from app.models.user import User
+
+
+def latest_token(db: Session) -> str:
+    token = "0"
+    while True:
+        result = changes_since(db, since=token)
+        token = result.token
+        if not result.has_more:
+            return token
+
+
+def sync_all(db: Session, since: str) -> Dict[str, List[str]]:
+    """Titles of the tasks and tickets changed since ``since``, following has_more."""
+    seen: Dict[str, List[str]] = {"tasks": [], "tickets": []}
+    token = since
+    while True:
+        result = changes_since(db, since=token, limit=2)
+        seen["tasks"] += [row.title for row in result.tasks]
+        seen["tickets"] += [row.title for row in result.tickets]
+        token = result.token
+        if not result.has_more:
+            return seen
+
+
+def test_commit_between_table_reads_is_not_skipped(db: Session, user: User, monkeypatch) -> None:
+    since = latest_token(db)
+    list_query = ticket.list_query
+
+    def commit_then_list_query(*args, **kwargs):
+        # Runs after the tasks were read and before the tickets are
+        monkeypatch.setattr(ticket, "list_query", list_query)
+        with SessionLocal() as other:
+            other.add(Task(title="late task"))
+            other.flush()
+            other.add(Ticket(title="late ticket", created_by_id=user.id))
+            other.commit()
+        return list_query(*args, **kwargs)
+
+    monkeypatch.setattr(ticket, "list_query", commit_then_list_query)
+    result = changes_since(db, since=since)
+    assert result.tickets == [] and result.tasks == []
+    assert result.token == since
+    assert sync_all(db, result.token) == {"tasks": ["late task"], "tickets": ["late ticket"]}
+
+
+def test_deleting_a_task_buries_its_subtasks_and_comments(db: Session, user: User) -> None:
+    task = Task(title="parent")
+    db.add(task)
+    db.flush()
+    subtask = Subtask(title="child", task_id=task.id)
+    db.add(subtask)
+    db.flush()
+    nested = Subtask(title="grandchild", task_id=task.id, parent_id=subtask.id)
+    comment = Comment(content="note", task_id=task.id, user_id=user.id)
+    db.add_all([nested, comment])
+    db.commit()
+    since = latest_token(db)
+
+    db.delete(task)
+    db.commit()
+    deleted = changes_since(db, since=since).deleted
+    assert deleted.tasks == [task.id]
+    assert sorted(deleted.subtasks) == [subtask.id, nested.id]
+    assert deleted.comments == [comment.id]
+
+
+def test_write_tombstones_follows_on_delete_cascade(db: Session) -> None:
+    task = Task(title="bulk deleted")
+    db.add(task)
+    db.flush()
+    subtask = Subtask(title="child", task_id=task.id)
+    db.add(subtask)
+    db.flush()
+    nested = Subtask(title="grandchild", parent_id=subtask.id)
+    db.add(nested)
+    db.commit()
+    task_id, subtask_ids = task.id, [subtask.id, nested.id]
+    since = latest_token(db)
+
+    # Core DELETEs, which the flush hook never sees; SQLite doesn't cascade
+    # without PRAGMA foreign_keys, so the children are deleted by hand
+    connection = db.connection()
+    write_tombstones(connection, {Task: [task_id]})
+    connection.execute(delete(Subtask).where(Subtask.id.in_(subtask_ids)))
+    connection.execute(delete(Task).where(Task.id == task_id))
+    db.commit()
+
+    deleted = changes_since(db, since=since).deleted
+    assert deleted.tasks == [task_id]
+    assert sorted(deleted.subtasks) == subtask_ids
@@ -0,0 +1,70 @@
+from typing import Dict
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.storage import storage
+from app.crud.crud_attachment import attachment
+from app.db.session import engine
+
+
+def test_upload_to_a_missing_task_is_refused(client: TestClient, superuser_headers: Dict[str, str]) -> None:
+    for field, detail in (("task_id", "Task not found"), ("subtask_id", "Subtask not found")):
+        response = client.post(
+            f"{settings.API_V1_STR}/attachments/uploads/",
+            json={"filename": "notes.txt", "size": 5, field: 999999}, headers=superuser_headers,
+        )
+        assert response.status_code == 404
+        assert response.json()["detail"] == detail
+
+
+def test_a_failed_complete_can_be_retried(
+    client: TestClient, superuser_headers: Dict[str, str], monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    prefix = settings.API_V1_STR
+    response = client.post(
+        f"{prefix}/attachments/uploads/", json={"filename": "notes.txt", "size": 5}, headers=superuser_headers,
+    )
+    url = f"{prefix}/attachments/uploads/{response.json()['id']}"
+    client.put(url, params={"offset": 0}, content=b"hello", headers=superuser_headers)
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("database is gone")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(attachment, "create_with_owner", fail)
+        with pytest.raises(RuntimeError):
+            client.post(f"{url}/complete", headers=superuser_headers)
+
+    response = client.post(f"{url}/complete", headers=superuser_headers)
+    assert response.status_code == 200, response.text
+    content = client.get(f"{prefix}/attachments/{response.json()['id']}/content", headers=superuser_headers)
+    assert content.content == b"hello"
+
+
+def test_no_connection_is_held_during_file_transfers(
+    client: TestClient, superuser_headers: Dict[str, str], monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    checked_out = []
+    write_partial, hash_partial = storage.write_partial, storage.hash_partial
+
+    async def counted_write_partial(*args, **kwargs):
+        checked_out.append(engine.pool.checkedout())
+        return await write_partial(*args, **kwargs)
+
+    async def counted_hash_partial(*args, **kwargs):
+        checked_out.append(engine.pool.checkedout())
+        return await hash_partial(*args, **kwargs)
+
+    monkeypatch.setattr(storage, "write_partial", counted_write_partial)
+    monkeypatch.setattr(storage, "hash_partial", counted_hash_partial)
+    prefix = settings.API_V1_STR
+    response = client.post(
+        f"{prefix}/attachments/uploads/", json={"filename": "notes.txt", "size": 5}, headers=superuser_headers,
+    )
+    url = f"{prefix}/attachments/uploads/{response.json()['id']}"
+    response = client.put(url, params={"offset": 0}, content=b"hello", headers=superuser_headers)
+    assert response.json()["received"] == [[0, 5]]
+    assert client.post(f"{url}/complete", headers=superuser_headers).status_code == 200
+    assert checked_out == [0, 0]
@@ -0,0 +1,68 @@
+from typing import Dict
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.core import security
+from app.core.config import settings
+from app.core.security import TokenRevocationList, get_password_hash
+from app.crud.crud_user import user as crud_user
+from app.models.user import User
+from app.schemas.user import UserCreate
+
+
+def login(client: TestClient, username: str, password: str) -> Dict[str, str]:
+    response = client.post(f"{settings.API_V1_STR}/auth/login", data={"username": username, "password": password})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def test_deleted_users_tokens_are_revoked_in_every_process(
+    client: TestClient, superuser_headers: Dict[str, str], monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    prefix = settings.API_V1_STR
+    response = client.post(f"{prefix}/auth/register", json={
+        "email": "doomed@example.com", "username": "doomed", "password": "secret",
+    })
+    user_id = response.json()["id"]
+    headers = login(client, "doomed", "secret")
+    # Another process: its revocation list has never heard of the delete
+    monkeypatch.setattr(security, "token_revocations", TokenRevocationList(refresh_seconds=0))
+    assert client.get(f"{prefix}/users/me", headers=headers).status_code == 200
+
+    assert client.delete(f"{prefix}/users/{user_id}", headers=superuser_headers).status_code == 200
+    assert client.get(f"{prefix}/users/me", headers=headers).status_code == 401
+
+
+def test_a_reused_user_id_can_log_in(client: TestClient, db: Session) -> None:
+    created = crud_user.create(db, obj_in=UserCreate(email="first@example.com", username="first", password="secret"))
+    user_id = created.id
+    crud_user.delete(db, id=user_id)
+    reused = crud_user.create(db, obj_in=UserCreate(email="second@example.com", username="second", password="secret"))
+    assert reused.id == user_id  # SQLite hands the highest id out again
+    assert reused.token_version == crud_user.get_token_versions(db)[user_id]
+
+    headers = login(client, "second", "secret")
+    assert client.get(f"{settings.API_V1_STR}/users/me", headers=headers).json()["id"] == user_id
+
+
+def test_login_checks_credentials_changed_by_another_process(client: TestClient, db: Session) -> None:
+    prefix = settings.API_V1_STR
+    client.post(f"{prefix}/auth/register", json={"email": "carol@example.com", "username": "carol", "password": "old"})
+    login(client, "carol", "old")  # caches carol
+    # Another process changes the password, leaving this process's cache alone
+    db.execute(update(User).where(User.username == "carol").values(hashed_password=get_password_hash("new")))
+    db.commit()
+    for username in ("carol", "carol@example.com"):
+        response = client.post(f"{prefix}/auth/login", data={"username": username, "password": "old"})
+        assert response.status_code == 401
+        login(client, username, "new")
+
+    db.execute(update(User).where(User.username == "carol").values(is_active=False))
+    db.commit()
+    for username in ("carol", "carol@example.com"):
+        response = client.post(f"{prefix}/auth/login", data={"username": username, "password": "new"})
+        assert response.status_code == 401
+        assert response.json()["detail"] == "Inactive user"